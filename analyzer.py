@@ -12,15 +12,23 @@ All feature computation lives in features.py.
 All strategy logic lives in strategy/back_to_vwap.py.
 """
 
+import atexit
 import csv
 import datetime
+import io
 import logging
 import os
-from typing import Optional, Dict, Any, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 import config
+from strategy import fast_ta
 from strategy import features as F
 from gate_result_logger import GateResult, get_gate_result_logger
 from strategy.htf_confluence import HTFConfluence
@@ -33,6 +41,116 @@ from strategy.back_to_vwap import BackToVWAPShort
 logger = logging.getLogger(__name__)
 
 SIGNAL_LOG_FILE = "logs/signals.csv"
+SIGNAL_LOG_COLUMNS = [
+    "timestamp", "symbol", "ltp", "pattern",
+    "stop_loss", "meta", "setup_high", "tick_size", "atr",
+    "stretch_score", "vol_fade_ratio", "confidence",
+    "pattern_bonus", "oi_direction",
+]
+
+
+class SignalLogger:
+    """
+    Buffered append-only writer for signals.csv.
+
+    Holds a raw O_APPEND file descriptor for the session and serializes rows
+    straight into a bytearray, handing the whole batch to a single os.write()
+    every FLUSH_ROWS rows, once FLUSH_BYTES accumulate, or after
+    FLUSH_INTERVAL_SEC seconds (whichever comes first), and once more at
+    interpreter exit. Thread-safe: check_setup runs concurrently in worker
+    threads.
+
+    Rows are assembled as plain strings through a precompiled ROW_TEMPLATE:
+    text fields have ',' replaced with ';' and line breaks with spaces, so no
+    csv quoting is ever needed. csv.writer is only used for the header.
+    """
+
+    FLUSH_ROWS = 16
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_INTERVAL_SEC = 2.0
+    LINE_END = "\r\n"  # csv.writer default, keeps existing files consistent
+    ROW_TEMPLATE = ",".join(["{}"] * len(SIGNAL_LOG_COLUMNS)) + LINE_END
+
+    def __init__(self, path: str = SIGNAL_LOG_FILE):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._buf = bytearray()
+        self._pending_rows = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(self.path, flags, 0o644)
+        if os.fstat(self._fd).st_size == 0:
+            header = io.StringIO()
+            csv.writer(header).writerow(SIGNAL_LOG_COLUMNS)
+            self._write_all(header.getvalue().encode('utf-8'))
+
+    def _write_all(self, data) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def write(self, row: list) -> None:
+        """Append one SIGNAL_LOG_COLUMNS-shaped row; non-text fields go through str()."""
+        line = self.ROW_TEMPLATE.format(*[
+            v.replace(',', ';').replace('\r', ' ').replace('\n', ' ') if isinstance(v, str) else v
+            for v in row
+        ]).encode('utf-8')
+        with self._lock:
+            if self._fd is None:
+                self._open()
+            self._buf += line
+            self._pending_rows += 1
+            if self._pending_rows >= self.FLUSH_ROWS or len(self._buf) >= self.FLUSH_BYTES:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_INTERVAL_SEC, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buf or self._fd is None:
+            return
+        try:
+            self._write_all(self._buf)
+        finally:
+            self._buf.clear()
+            self._pending_rows = 0
+
+    def flush_and_close(self) -> None:
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+
+
+_signal_logger: Optional[SignalLogger] = None
+_signal_logger_lock = threading.Lock()
+
+
+def get_signal_logger() -> SignalLogger:
+    """Returns (or creates) the process-wide signals.csv writer."""
+    global _signal_logger
+    if _signal_logger is None:
+        with _signal_logger_lock:
+            if _signal_logger is None:
+                _signal_logger = SignalLogger()
+                atexit.register(_signal_logger.flush_and_close)
+    return _signal_logger
 
 
 def log_signal(symbol: str, ltp: float, pattern: str, stop_loss: float,
@@ -42,22 +160,39 @@ def log_signal(symbol: str, ltp: float, pattern: str, stop_loss: float,
                confidence: str = "", pattern_bonus: str = "None",
                oi_direction: str = "unknown"):
     """Persists signal details to a CSV file for EOD analysis."""
-    os.makedirs(os.path.dirname(SIGNAL_LOG_FILE), exist_ok=True)
-    file_exists = os.path.exists(SIGNAL_LOG_FILE)
+    get_signal_logger().write([
+        _now_str(),
+        symbol, ltp, pattern, stop_loss, meta, setup_high, tick_size, atr,
+        stretch_score, vol_fade_ratio, confidence, pattern_bonus, oi_direction
+    ])
+
+
+_today_cache: Tuple[int, str] = (-1, "")
+
+
+def _today_str() -> str:
+    """Today's date as YYYY-MM-DD, re-formatted at most once per minute."""
+    global _today_cache
+    minute = int(time.time() // 60)
+    cached_minute, cached_str = _today_cache
+    if cached_minute != minute:
+        cached_str = datetime.date.today().strftime("%Y-%m-%d")
+        _today_cache = (minute, cached_str)
+    return cached_str
+
 
-    with open(SIGNAL_LOG_FILE, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["timestamp", "symbol", "ltp", "pattern",
-                             "stop_loss", "meta", "setup_high", "tick_size", "atr",
-                             "stretch_score", "vol_fade_ratio", "confidence",
-                             "pattern_bonus", "oi_direction"])
+_now_cache: Tuple[int, str] = (-1, "")
 
-        writer.writerow([
-            datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            symbol, ltp, pattern, stop_loss, meta, setup_high, tick_size, atr,
-            stretch_score, vol_fade_ratio, confidence, pattern_bonus, oi_direction
-        ])
+
+def _now_str() -> str:
+    """Local time as YYYY-MM-DD HH:MM:SS, formatted at most once per second."""
+    global _now_cache
+    sec = int(time.time())
+    cached_sec, cached_str = _now_cache
+    if cached_sec != sec:
+        cached_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        _now_cache = (sec, cached_str)
+    return cached_str
 
 
 class FyersAnalyzer:
@@ -73,6 +208,31 @@ class FyersAnalyzer:
         self.htf_confluence = HTFConfluence(fyers)
         self.profile_analyzer = ProfileAnalyzer()
         self.strategy = BackToVWAPShort()
+        self._prev_close_hints: Dict[str, float] = {}
+        self._prefilter_gates: Dict[str, GateResult] = {}
+
+        # Static config read once rather than on every check_setup
+        self._rvol_gate = config.RVOL_VALIDITY_GATE_ENABLED
+        self._rvol_min = getattr(config, 'RVOL_MIN_CANDLES', 15)
+
+        # Values that only depend on completed candles, reused within a bar.
+        self._prev_bar_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._prev_bar_cache_day = datetime.date.today()
+        self._prev_bar_lock = threading.Lock()
+
+        # Per-thread, per-symbol VWAP output buffers (see _vwap_buffer).
+        self._buf_local = threading.local()
+
+        # (symbol, interval) → today's REST candle rows; see _rest_history_rows.
+        self._history_rows: Dict[Tuple[str, str], np.ndarray] = {}
+        self._history_rows_day = datetime.date.today()
+        self._history_lock = threading.Lock()
+
+        # symbol → (expires_monotonic, depth) — see _get_depth / prefetch_depth.
+        self._depth_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # symbol → (date, upper circuit) from the last depth answer; the
+        # limits are fixed for the day, see _note_circuit_touch.
+        self._circuit_limits: Dict[str, Tuple[datetime.date, float]] = {}
 
     # ──────────────────────────────────────────────────────────────────
     # DATA FETCHING
@@ -82,44 +242,25 @@ class FyersAnalyzer:
         """
         Fetch intraday historical data for a symbol.
         Prefers local candle aggregator (1-minute). Falls back to REST.
+        Frames carry epoch + OHLCV only; nothing on the analysis path reads
+        a datetime column.
         """
         # 1. Try local aggregator first (1-minute only)
         if interval == "1" and getattr(config, 'P82_LOCAL_CANDLES_ENABLED', False) and self.broker:
-            n_bars = max(100, getattr(config, 'RVOL_MIN_CANDLES', 15) + 5)
+            n_bars = max(100, self._rvol_min + 5)
             local_candles = self.broker.get_local_candles(symbol, n=n_bars)
 
-            min_required = getattr(config, 'RVOL_MIN_CANDLES', 15) + 3
+            min_required = self._rvol_min + 3
             if local_candles and len(local_candles) >= min_required:
-                data = []
-                for c in local_candles:
-                    data.append([c.epoch, c.open, c.high, c.low, c.close, c.volume])
-                cols = ["epoch", "open", "high", "low", "close", "volume"]
-                df = pd.DataFrame(data, columns=cols)
-                df['datetime'] = pd.to_datetime(
-                    df['epoch'], unit='s'
-                ).dt.tz_localize('UTC').dt.tz_convert('Asia/Kolkata')
-                return df
+                return F.candles_frame(
+                    [(c.epoch, c.open, c.high, c.low, c.close, c.volume) for c in local_candles]
+                )
 
         # 2. Fallback to REST
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        data = {
-            "symbol": symbol,
-            "resolution": interval,
-            "date_format": "1",
-            "range_from": today,
-            "range_to": today,
-            "cont_flag": "1"
-        }
-
         try:
-            response = self.fyers.history(data=data)
-            if "candles" in response and response["candles"]:
-                cols = ["epoch", "open", "high", "low", "close", "volume"]
-                df = pd.DataFrame(response["candles"], columns=cols)
-                df['datetime'] = pd.to_datetime(
-                    df['epoch'], unit='s'
-                ).dt.tz_localize('UTC').dt.tz_convert('Asia/Kolkata')
-                return df
+            rows = self._rest_history_rows(symbol, interval)
+            if rows is not None:
+                return F.candles_frame(rows)
             else:
                 logger.warning(f"No history data for {symbol}")
                 return None
@@ -127,6 +268,128 @@ class FyersAnalyzer:
             logger.error(f"Error fetching history for {symbol}: {e}")
             return None
 
+    def _rest_history_rows(self, symbol: str, interval: str) -> Optional[np.ndarray]:
+        """
+        Today's [epoch, o, h, l, c, v] rows for *symbol* from REST.
+
+        The first call of the day fetches the whole session; later calls
+        only request bars from the last stored epoch onwards and splice
+        them in (the stored last bar may still have been forming, so it is
+        replaced). Rows are never modified in place — each splice builds a
+        new array — so frames handed out earlier stay valid.
+        """
+        key = (symbol, interval)
+        with self._history_lock:
+            today = datetime.date.today()
+            if today != self._history_rows_day:
+                self._history_rows = {}
+                self._history_rows_day = today
+            cached = self._history_rows.get(key)
+
+        if cached is None:
+            day = _today_str()
+            data = {
+                "symbol": symbol,
+                "resolution": interval,
+                "date_format": "1",
+                "range_from": day,
+                "range_to": day,
+                "cont_flag": "1"
+            }
+        else:
+            data = {
+                "symbol": symbol,
+                "resolution": interval,
+                "date_format": "0",
+                "range_from": str(int(cached[-1, 0])),
+                "range_to": str(int(time.time())),
+                "cont_flag": "1"
+            }
+
+        response = self.fyers.history(data=data)
+        candles = response.get("candles") if isinstance(response, dict) else None
+        if not candles:
+            return cached
+
+        fresh = F.candle_array(candles)
+        # get_history_many runs this on a thread pool: merge into whatever is
+        # stored now, not the rows read before the fetch, so a slower
+        # concurrent fetch cannot overwrite newer bars with stale ones.
+        with self._history_lock:
+            current = self._history_rows.get(key) if self._history_rows_day == today else None
+            if current is None:
+                rows = fresh
+            else:
+                rows = np.concatenate((
+                    current[current[:, 0] < fresh[0, 0]],
+                    fresh,
+                    current[current[:, 0] > fresh[-1, 0]],
+                ))
+            if self._history_rows_day == today:
+                self._history_rows[key] = rows
+        return rows
+
+    def get_history_many(
+        self, symbols: Iterable[str], interval: str = "1"
+    ) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch history for many symbols concurrently.
+        Submits every request up front to a bounded pool and waits once,
+        so a batch costs ~RTT × ceil(N / workers) instead of N × RTT.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        max_workers = min(len(symbols), getattr(config, 'SCANNER_PARALLEL_WORKERS', 3))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = executor.map(lambda s: self.get_history(s, interval), symbols)
+            return dict(zip(symbols, frames))
+
+    def prefetch_depth(self, candidates: List[Dict[str, Any]]) -> int:
+        """
+        Warm the depth cache for this cycle's candidates with concurrent
+        requests, so check_setup finds its depth already cached instead of
+        making one blocking call per symbol. Only symbols that clear the
+        depth-free strategy gates (gain floor, completed-bar VWAP stretch)
+        are fetched — the same ones check_setup would ask for.
+        Returns the number of symbols requested.
+        """
+        symbols = []
+        for cand in candidates:
+            symbol, ltp, df = cand["symbol"], cand["ltp"], cand.get("history_df")
+            if df is None or df.empty:
+                continue
+            if self._rvol_gate and len(df) < self._rvol_min:
+                continue
+            pc = self._quote_prev_close(symbol, ltp)
+            baseline = pc if pc > 0 else float(df['open'].iat[0])
+            if baseline <= 0:
+                continue
+            gain_pct = ((ltp - baseline) / baseline) * 100
+            if not self.strategy.passes_gain_floor(gain_pct):
+                continue
+            # Shares check_setup's memo, so the stretch is computed once per bar
+            vwap_sd = self._memo_prev_bar(
+                symbol, df, 'vwap_sd', lambda: F.EnrichedBars.from_frame(df).vwap_sd
+            )
+            if self.strategy.passes_depth_free_gates(gain_pct, vwap_sd):
+                symbols.append(symbol)
+
+        if not symbols:
+            return 0
+
+        def _fetch(symbol):
+            try:
+                self._fetch_depth(symbol)
+            except Exception as e:
+                logger.debug(f"Depth prefetch failed for {symbol}: {e}")
+
+        max_workers = min(len(symbols), getattr(config, 'SCANNER_PARALLEL_WORKERS', 3))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_fetch, symbols))
+        return len(symbols)
+
     # ──────────────────────────────────────────────────────────────────
     # MAIN ENTRY POINT
     # ──────────────────────────────────────────────────────────────────
@@ -140,18 +403,33 @@ class FyersAnalyzer:
         df_15m: Optional[pd.DataFrame] = None,
         scan_id: int = 0,
         data_tier: str = "UNKNOWN",
+        prefiltered: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """
         Public API — called by main.py trading loop.
-        Signature intentionally unchanged from the original for backward compat.
+        Signature intentionally unchanged from the original for backward compat;
+        prefiltered=True means prefilter() already passed this symbol this cycle.
         """
         grl = get_gate_result_logger()
         gr = GateResult(symbol=symbol, scan_id=scan_id, data_tier=data_tier)
         signal_meta = {}
 
+        # ── Early Drop: local gates before any candle fetch / TA ────
+        # Symbols prefilter() passed keep its gate record instead of running
+        # the local gates (and the signal-manager lookup) a second time.
+        pc = self._quote_prev_close(symbol, ltp)
+        pre_gr = self._prefilter_gates.pop(symbol, None) if prefiltered else None
+        if pre_gr is not None:
+            gr = pre_gr
+        elif not self._run_pre_filters(symbol, ltp, pc, gr):
+            grl.record(gr)
+            return None
+
         # ── Data Fetch ───────────────────────────────────────────────
+        # Read-only from here on: derived series live in pooled arrays, so the
+        # scanner's frame is used as-is instead of being copied.
         if pre_fetched_df is not None:
-            df = pre_fetched_df.copy()
+            df = pre_fetched_df
         else:
             df = self.get_history(symbol)
 
@@ -162,30 +440,62 @@ class FyersAnalyzer:
             return None
 
         # ── G2: Candle count guard ───────────────────────────────────
-        if config.RVOL_VALIDITY_GATE_ENABLED and len(df) < config.RVOL_MIN_CANDLES:
+        if self._rvol_gate and len(df) < self._rvol_min:
             gr.g2_pass = False
             gr.g2_value = float(len(df))
             gr.verdict = "REJECTED"
             gr.first_fail_gate = "G2_RVOL_VALIDITY"
             gr.rejection_reason = (
-                f"Only {len(df)} candles — need {config.RVOL_MIN_CANDLES} for valid RVOL"
+                f"Only {len(df)} candles — need {self._rvol_min} for valid RVOL"
             )
             logger.warning(
                 "SKIP %s — RVOL_VALIDITY_GATE: Only %s candles — need %s",
-                symbol, len(df), config.RVOL_MIN_CANDLES,
+                symbol, len(df), self._rvol_min,
             )
             grl.record(gr)
             return None
         gr.g2_pass = True
 
+        # ── Bars (derived series are computed lazily on first use) ──
+        bars = F.EnrichedBars.from_frame(df, vwap_out=self._vwap_buffer(symbol, len(df)))
+
+        # ── Gain Calculation ─────────────────────────────────────────
+        open_price = bars.open[0]
+        baseline = pc if pc > 0 else open_price
+        gain_pct = ((ltp - baseline) / baseline) * 100
+
+        # Without a quote prev close the pre-filter could not check the gain
+        # floor; enforce it here before any VWAP/ATR work.
+        if not self.strategy.passes_gain_floor(gain_pct):
+            gr.g1_pass = False
+            gr.g1_value = round(gain_pct, 2)
+            self._note_circuit_touch(symbol, ltp, pc)
+            self._reject(gr, "G1_GAIN", f"Gain {gain_pct:.1f}% below strategy floor")
+            grl.record(gr)
+            return None
+
         # ── Enrichment ───────────────────────────────────────────────
-        F.enrich_dataframe(df)
-        prev_df = df.iloc[:-1]
+        vwap_sd = self._memo_prev_bar(symbol, df, 'vwap_sd', lambda: bars.vwap_sd)
 
-        atr = F.compute_atr(df)
-        vwap_sd = F.compute_vwap_sd(prev_df)
-        slope_30m, _ = F.compute_vwap_slope(df.iloc[-30:], window=30)
-        slope_5m, _ = F.compute_vwap_slope(df.iloc[-5:], window=5)
+        # Most symbols fail the stretch floor; evaluate() would reject them
+        # on C0/C1 anyway, so skip ATR/RSI, slopes and the profile for them.
+        if not self.strategy.passes_depth_free_gates(gain_pct, vwap_sd):
+            gr.g5_pass = False
+            # The depth block below is skipped, so keep G3 bookkeeping here
+            self._note_circuit_touch(symbol, ltp, pc)
+            self._reject(gr, "G5_STRATEGY", "BackToVWAPShort conditions not met")
+            grl.record(gr)
+            return None
+
+        close_arr = bars.close
+        vwap_arr = bars.vwap
+        day_high = bars.day_high
+
+        # One fused pass yields ATR (SL sizing) and the RSI series that
+        # evaluate() reads back from bars for C4 divergence
+        atr = bars.atr
+        slope_30m = fast_ta.vwap_slope_bps(vwap_arr, close_arr, 30)
+        slope_5m = fast_ta.vwap_slope_bps(vwap_arr, close_arr, 5)
 
         # Decay trigger: fast slope drops below slow slope
         is_decaying = False
@@ -197,26 +507,6 @@ class FyersAnalyzer:
                 symbol, slope_5m, slope_30m,
             )
 
-        # ── Gain Calculation ─────────────────────────────────────────
-        pc = 0
-        try:
-            if self.broker:
-                snapshot = self.broker.get_quote_cache_snapshot()
-                if symbol in snapshot:
-                    entry = snapshot[symbol]
-                    pc = entry.get('pc', 0)
-                    if pc == 0 and entry.get('ch_oc', 0) != 0:
-                        ltp_val = entry.get('ltp', ltp)
-                        ch_oc = entry.get('ch_oc')
-                        pc = ltp_val / (1 + (ch_oc / 100))
-        except Exception:
-            pass
-
-        day_high = df['high'].max()
-        open_price = df.iloc[0]['open']
-        baseline = pc if pc > 0 else open_price
-        gain_pct = ((ltp - baseline) / baseline) * 100
-
         # ── Profile Pre-calc ─────────────────────────────────────────
         profile = None
         profile_rejection = False
@@ -224,44 +514,42 @@ class FyersAnalyzer:
         try:
             profile = self.profile_analyzer.calculate_market_profile(df, mode='VOLUME')
             if profile:
-                profile_rejection, _ = self.profile_analyzer.check_profile_rejection(df, ltp)
+                profile_rejection, _ = self.profile_analyzer.check_profile_rejection(
+                    df, ltp, profile=profile
+                )
             vol_z = self.market_context.get_volume_z_score(df)
         except Exception as e:
             logger.warning(f"Profile/VolZ pre-calc error for {symbol}: {e}")
 
-        allowed, reason = self.market_context.is_safe_trade_window()
-        gr.g7_pass = allowed
-        gr.g7_value = reason
-        if not allowed:
-            gr.verdict = "REJECTED"
-            gr.first_fail_gate = "G7_REGIME"
-            gr.rejection_reason = reason
-            grl.record(gr)
-            return None
-
         # ── Pre-fetch Depth for Strategy ─────────────────────────────
+        # Depth only feeds the strategy's circuit/spread vetoes. The trading
+        # loop warms the cache via prefetch_depth, so this is normally a
+        # cache hit.
         upper_circuit = 0.0
         lower_circuit = 0.0
         spread_pct = 0.0
         is_circuit_hitter = False
+        # Only the broker call can fail; the circuit checks below are plain
+        # arithmetic on the cached dict and stay outside the handler.
         try:
-            full_depth = self.fyers.depth(data={"symbol": symbol, "ohlcv_flag": "1"})
-            if 'd' in full_depth and symbol in full_depth['d']:
-                depth_data = full_depth['d'][symbol]
-                upper_circuit = depth_data.get('upper_ckt', 0)
-                lower_circuit = depth_data.get('lower_ckt', 0)
-                
-                if upper_circuit > 0 and ltp >= upper_circuit * 0.999:
-                    self.market_context.mark_circuit_touched(symbol)
-                
-                # Spread
+            depth_data = self._get_depth(symbol)
+        except Exception:
+            depth_data = None
+        if depth_data is not None:
+            upper_circuit = depth_data.get('upper_ckt') or 0
+            lower_circuit = depth_data.get('lower_ckt') or 0
+
+            if upper_circuit > 0 and ltp >= upper_circuit * 0.999:
+                self.market_context.mark_circuit_touched(symbol)
+
+            # Spread (book levels may be missing or malformed)
+            try:
                 ask = depth_data['ask'][0]['price'] if depth_data.get('ask') else ltp
                 bid = depth_data['bid'][0]['price'] if depth_data.get('bid') else ltp
                 if ltp > 0:
                     spread_pct = (ask - bid) / ltp
-                    
-        except Exception:
-            pass
+            except (KeyError, IndexError, TypeError):
+                pass
 
         is_circuit_hitter = self.market_context.is_circuit_hitter(symbol)
 
@@ -282,6 +570,7 @@ class FyersAnalyzer:
             lower_circuit=lower_circuit,
             spread_pct=spread_pct,
             is_circuit_hitter=is_circuit_hitter,
+            bars=bars,
         )
 
         if result is None:
@@ -350,7 +639,8 @@ class FyersAnalyzer:
         # ── Finalize ──────────────────────────────────────────────────
         gr.verdict = "ANALYZER_PASS"
         finalized = self._finalize_signal(
-            symbol, ltp, df, pattern_desc, slope_5m, "", signal_meta
+            symbol, ltp, df, pattern_desc, slope_5m, "", signal_meta,
+            bars=bars, day_high=day_high, vwap_sd=vwap_sd,
         )
         if finalized:
             finalized['_gate_result'] = gr
@@ -364,22 +654,266 @@ class FyersAnalyzer:
     # PRIVATE HELPERS (kept)
     # ──────────────────────────────────────────────────────────────────
 
+    QUOTE_BATCH_SIZE = 50
 
+    def prefilter(
+        self, candidates: list, scan_id: int = 0, data_tier: str = "UNKNOWN",
+    ) -> list:
+        """
+        Run the candle-free gates for a whole scan cycle before any history
+        fetch. Prev closes come from one quote-cache snapshot of the candidate
+        symbols; symbols the cache cannot price are quoted over REST in
+        batches of QUOTE_BATCH_SIZE. Rejections go to the gate audit trail;
+        survivors are returned for history fetch + check_setup, which reuses
+        the prev closes gathered here.
+        """
+        symbols = [c["symbol"] for c in candidates]
+        hints: Dict[str, float] = {}
+
+        # A session-wide hard block fails every candidate at G7/G8, before
+        # the gain floor ever reads a prev close: skip the quote round trips
+        # and let the local gates below record the per-symbol rejections.
+        if self._session_hard_blocked():
+            symbols = []
+
+        if self.broker and symbols:
+            try:
+                snapshot = self.broker.get_quote_cache_snapshot(symbols)
+            except Exception:
+                snapshot = {}
+            ltps = {c["symbol"]: c.get("ltp", 0) for c in candidates}
+            for sym, entry in snapshot.items():
+                pc = self._prev_close_from_quote(entry, ltps.get(sym, 0))
+                if pc > 0:
+                    hints[sym] = pc
+
+        missing = [sym for sym in symbols if sym not in hints]
+        for i in range(0, len(missing), self.QUOTE_BATCH_SIZE):
+            batch = missing[i:i + self.QUOTE_BATCH_SIZE]
+            try:
+                response = self.fyers.quotes(data={"symbols": ",".join(batch)})
+                for stock in response.get("d", []) if isinstance(response, dict) else []:
+                    quote_data = stock.get("v")
+                    if not isinstance(quote_data, dict):
+                        continue
+                    pc = quote_data.get("prev_close_price", 0) or 0
+                    if pc > 0:
+                        hints[stock.get("n")] = pc
+            except Exception as e:
+                logger.warning(f"Prefilter quote batch error: {e}")
+
+        self._prev_close_hints = hints
 
+        grl = get_gate_result_logger()
+        survivors = []
+        passed: Dict[str, GateResult] = {}
+        for cand in candidates:
+            symbol = cand["symbol"]
+            gr = GateResult(symbol=symbol, scan_id=scan_id, data_tier=data_tier)
+            if self._run_pre_filters(symbol, cand["ltp"], hints.get(symbol, 0), gr):
+                survivors.append(cand)
+                passed[symbol] = gr
+            else:
+                grl.record(gr)
+        self._prefilter_gates = passed
+        return survivors
+
+    def _session_hard_blocked(self) -> bool:
+        """True when G7 (trade window / regime) or a max-loss pause blocks every symbol."""
+        allowed, _ = self.market_context.is_safe_trade_window()
+        if not allowed:
+            return True
+        sm = self.signal_manager
+        return sm.is_paused() if hasattr(sm, 'is_paused') else False
+
+    @staticmethod
+    def _prev_close_from_quote(entry: dict, ltp: float) -> float:
+        pc = entry.get('pc', 0)
+        if pc == 0 and entry.get('ch_oc', 0) != 0:
+            ltp_val = entry.get('ltp', ltp)
+            ch_oc = entry.get('ch_oc')
+            pc = ltp_val / (1 + (ch_oc / 100))
+        return pc
+
+    def _quote_prev_close(self, symbol: str, ltp: float) -> float:
+        """Previous close from this cycle's prefilter, else the quote cache; 0 when unavailable."""
+        pc = self._prev_close_hints.get(symbol, 0)
+        if pc > 0:
+            return pc
+        try:
+            if self.broker:
+                snapshot = self.broker.get_quote_cache_snapshot([symbol])
+                if symbol in snapshot:
+                    pc = self._prev_close_from_quote(snapshot[symbol], ltp)
+        except Exception:
+            pass
+        return pc
+
+    def _run_pre_filters(self, symbol: str, ltp: float, pc: float, gr: GateResult) -> bool:
+        """
+        Purely local gates, cheapest first: Time/Regime (G7) → circuit
+        blacklist (G3) → signal manager hard blocks (G8) → quote-based gain
+        floor (G1). Fills *gr* on failure and returns False.
+        """
+        allowed, reason = self.market_context.is_safe_trade_window()
+        gr.g7_pass = allowed
+        gr.g7_value = reason
+        if not allowed:
+            return self._reject(gr, "G7_REGIME", reason)
+
+        if self.market_context.is_circuit_hitter(symbol):
+            gr.g3_pass = False
+            return self._reject(gr, "G3_CIRCUIT", "Circuit hitter blacklisted for session")
+
+        sm = self.signal_manager
+        if hasattr(sm, 'is_blocked'):
+            blocked, sm_reason = sm.is_blocked(symbol)
+            if blocked:
+                gr.g8_pass = False
+                return self._reject(gr, "G8_SIGNAL_MANAGER", sm_reason)
+
+        # Without a quote-cache prev close the gain baseline is the first
+        # candle's open, so the floor is enforced later by the strategy.
+        if pc > 0:
+            gain_pct = ((ltp - pc) / pc) * 100
+            gr.g1_value = round(gain_pct, 2)
+            if not self.strategy.passes_gain_floor(gain_pct):
+                gr.g1_pass = False
+                self._note_circuit_touch(symbol, ltp, pc)
+                return self._reject(
+                    gr, "G1_GAIN",
+                    f"Gain {gain_pct:.1f}% < {self.strategy.params.min_gain_pct}%",
+                )
+            gr.g1_pass = True
+
+        return True
+
+    @staticmethod
+    def _reject(gr: GateResult, gate: str, reason: str) -> bool:
+        gr.verdict = "REJECTED"
+        gr.first_fail_gate = gate
+        gr.rejection_reason = reason
+        return False
+
+    VWAP_POOL_BARS = 500  # > one session of 1-minute bars
+
+    def _vwap_buffer(self, symbol: str, n: int) -> np.ndarray:
+        """
+        Length-*n* view of a per-symbol buffer preallocated to VWAP_POOL_BARS,
+        so repeat scans write VWAP in place instead of allocating a new
+        column. Pools are thread-local: check_setup runs on worker threads,
+        and a thread only ever has one check_setup using its buffers.
+        """
+        local = self._buf_local
+        today = datetime.date.today()
+        if getattr(local, 'day', None) != today:
+            local.pool = {}
+            local.day = today
+        buf = local.pool.get(symbol)
+        if buf is None or buf.shape[0] < n:
+            buf = np.empty(max(self.VWAP_POOL_BARS, n))
+            local.pool[symbol] = buf
+        return buf[:n]
+
+    DEPTH_CACHE_TTL_SEC = 2.0  # circuit limits are static; spread is near-live
+
+    def _get_depth(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Market depth for *symbol*, from the prefetch cache when still fresh."""
+        hit = self._depth_cache.get(symbol)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+        return self._fetch_depth(symbol)
+
+    def _fetch_depth(self, symbol: str) -> Optional[Dict[str, Any]]:
+        full_depth = self.fyers.depth(data={"symbol": symbol, "ohlcv_flag": "1"})
+        # An empty answer is cached too, so check_setup does not repeat the
+        # request prefetch_depth just made for the same symbol.
+        depth_data = full_depth.get('d', {}).get(symbol) if isinstance(full_depth, dict) else None
+        self._depth_cache[symbol] = (time.monotonic() + self.DEPTH_CACHE_TTL_SEC, depth_data)
+        if depth_data is not None:
+            self._circuit_limits[symbol] = (
+                datetime.date.today(), depth_data.get('upper_ckt') or 0
+            )
+        return depth_data
+
+    CIRCUIT_MIN_BAND = 0.02  # narrowest NSE price band
+
+    def _note_circuit_touch(self, symbol: str, ltp: float, pc: float) -> None:
+        """
+        G3 bookkeeping for symbols rejected before the depth block: marks an
+        upper-circuit touch the same way check_setup does. Uses the day's
+        upper limit from any earlier depth answer; depth is only requested
+        when that is unknown and the narrowest band is within reach, so a
+        symbol costs at most one depth call per day here.
+        """
+        hit = self._circuit_limits.get(symbol)
+        if hit is not None and hit[0] == datetime.date.today():
+            upper_circuit = hit[1]
+        else:
+            if pc > 0 and ltp < pc * (1 + self.CIRCUIT_MIN_BAND) * 0.999:
+                return
+            try:
+                depth_data = self._get_depth(symbol)
+            except Exception as e:
+                logger.debug(f"Circuit check depth failed for {symbol}: {e}")
+                return
+            if depth_data is None:
+                return
+            upper_circuit = depth_data.get('upper_ckt') or 0
+        if upper_circuit > 0 and ltp >= upper_circuit * 0.999:
+            self.market_context.mark_circuit_touched(symbol)
+
+    PREV_BAR_CACHE_SIZE = 2048
+
+    def _memo_prev_bar(self, symbol: str, df: pd.DataFrame, name: str, compute):
+        """
+        LRU-memoize *compute()* under (symbol, last completed bar epoch, name).
+        Only for values derived from completed candles — repeat scans inside
+        the same minute reuse the result. Cleared on day change.
+        """
+        if 'epoch' not in df.columns or len(df) < 2:
+            return compute()
+
+        key = (symbol, int(df['epoch'].iat[-2]), name)
+        cache = self._prev_bar_cache
+        with self._prev_bar_lock:
+            today = datetime.date.today()
+            if today != self._prev_bar_cache_day:
+                cache.clear()
+                self._prev_bar_cache_day = today
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        value = compute()
+        with self._prev_bar_lock:
+            cache[key] = value
+            if len(cache) > self.PREV_BAR_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
 
     def _finalize_signal(
         self, symbol, ltp, df, pattern_desc, slope, wall_msg, signal_meta: dict = None,
+        bars: Optional[F.EnrichedBars] = None, day_high: Optional[float] = None,
+        vwap_sd: Optional[float] = None,
     ):
         """Calculates SL, builds signal dict, logs to CSV and ML. Pure — no gate checks."""
         if signal_meta is None:
             signal_meta = {}
+        if bars is None:
+            bars = F.EnrichedBars.from_frame(df)
+        if vwap_sd is None:
+            vwap_sd = self._memo_prev_bar(symbol, df, 'vwap_sd', lambda: bars.vwap_sd)
+        o, h, l, c, v = bars.open, bars.high, bars.low, bars.close, bars.volume
+        if day_high is None:
+            day_high = bars.day_high
+        atr = bars.atr
 
         # Calculate Stop Loss (ATR-based)
-        atr = F.compute_atr(df)
         buffer = max(atr * 0.5, 0.25)
 
         # Use absolute high snapshot for SL
-        peak_high = signal_meta.get('snapshot_high', df.iloc[-2]['high'])
+        peak_high = signal_meta.get('snapshot_high', h[-2])
         setup_high = peak_high
         sl_price = setup_high + buffer
 
@@ -400,59 +934,61 @@ class FyersAnalyzer:
         )
 
         # Calculate VWAP for both ML logging and TP targeting
-        vwap = df['vwap'].iloc[-1] if 'vwap' in df.columns else ltp
+        vwap = bars.vwap[-1]
 
         # ML Data Logging
         obs_id = None
         try:
             ml_logger = get_ml_logger()
-            prev_candle = df.iloc[-2]
-
-            body = abs(prev_candle['close'] - prev_candle['open'])
-            total_range = prev_candle['high'] - prev_candle['low']
-            upper_wick = prev_candle['high'] - max(prev_candle['open'], prev_candle['close'])
-            lower_wick = min(prev_candle['open'], prev_candle['close']) - prev_candle['low']
-
-            vwap_dist = ((ltp - vwap) / vwap) * 100 if vwap > 0 else 0
-
-            vol_avg = df['volume'].iloc[-20:].mean() if len(df) > 20 else df['volume'].mean()
-            rvol = prev_candle['volume'] / vol_avg if vol_avg > 0 else 1
-
-            features = {
-                "prev_close": df.iloc[0]['open'],
-                "day_high": df['high'].max(),
-                "day_low": df['low'].min(),
-                "gain_pct": ((ltp - df.iloc[0]['open']) / df.iloc[0]['open']) * 100,
-                "vwap": vwap,
-                "vwap_distance_pct": vwap_dist,
-                "vwap_sd": F.compute_vwap_sd(df.iloc[:-1]),
-                "vwap_slope": slope,
-                "volume_current": prev_candle['volume'],
-                "volume_avg_20": vol_avg,
-                "rvol": rvol,
-                "pattern": pattern_desc.split(" + ")[0],
-                "candle_body_pct": (body / total_range * 100) if total_range > 0 else 0,
-                "upper_wick_pct": (upper_wick / total_range * 100) if total_range > 0 else 0,
-                "lower_wick_pct": (lower_wick / total_range * 100) if total_range > 0 else 0,
-                "stretch_score": signal_meta.get('stretch_score', 0.0),
-                "vol_fade_ratio": signal_meta.get('vol_fade_ratio', 0.0),
-                "confidence": signal_meta.get('confidence', 'MEDIUM'),
-                "pattern_bonus": signal_meta.get('pattern_bonus', 'None'),
-                "num_confirmations": pattern_desc.count(",") + 1 if "+" in pattern_desc else 0,
-                "confirmations": pattern_desc.split(" + ")[1:] if " + " in pattern_desc else [],
-                "nifty_trend": (
-                    self.market_context.get_trend_label()
-                    if hasattr(self.market_context, 'get_trend_label') else "UNKNOWN"
-                ),
-                "atr": atr,
-                "sl_price": sl_price,
-                "tp_price": vwap, # Update TP price in ML logs to reflect VWAP target
-                "direction": getattr(config, "TRADE_DIRECTION", "SHORT"),
-                "leverage": getattr(config, 'INTRADAY_LEVERAGE', 5.0),
-            }
-
-            obs_id = ml_logger.log_observation(symbol, ltp, features)
-            logger.info(f"   [ML] Logged observation: {obs_id}")
+            # Skip the feature dict entirely when nothing would persist it
+            if getattr(ml_logger, 'enabled', True):
+                p_open, p_high, p_low, p_close, p_vol = o[-2], h[-2], l[-2], c[-2], v[-2]
+
+                body = abs(p_close - p_open)
+                total_range = p_high - p_low
+                upper_wick = p_high - max(p_open, p_close)
+                lower_wick = min(p_open, p_close) - p_low
+
+                vwap_dist = ((ltp - vwap) / vwap) * 100 if vwap > 0 else 0
+
+                vol_avg = v[-20:].mean()
+                rvol = p_vol / vol_avg if vol_avg > 0 else 1
+
+                features = {
+                    "prev_close": o[0],
+                    "day_high": day_high,
+                    "day_low": l.min(),
+                    "gain_pct": ((ltp - o[0]) / o[0]) * 100,
+                    "vwap": vwap,
+                    "vwap_distance_pct": vwap_dist,
+                    "vwap_sd": vwap_sd,
+                    "vwap_slope": slope,
+                    "volume_current": p_vol,
+                    "volume_avg_20": vol_avg,
+                    "rvol": rvol,
+                    "pattern": pattern_desc.split(" + ")[0],
+                    "candle_body_pct": (body / total_range * 100) if total_range > 0 else 0,
+                    "upper_wick_pct": (upper_wick / total_range * 100) if total_range > 0 else 0,
+                    "lower_wick_pct": (lower_wick / total_range * 100) if total_range > 0 else 0,
+                    "stretch_score": signal_meta.get('stretch_score', 0.0),
+                    "vol_fade_ratio": signal_meta.get('vol_fade_ratio', 0.0),
+                    "confidence": signal_meta.get('confidence', 'MEDIUM'),
+                    "pattern_bonus": signal_meta.get('pattern_bonus', 'None'),
+                    "num_confirmations": pattern_desc.count(",") + 1 if "+" in pattern_desc else 0,
+                    "confirmations": pattern_desc.split(" + ")[1:] if " + " in pattern_desc else [],
+                    "nifty_trend": (
+                        self.market_context.get_trend_label()
+                        if hasattr(self.market_context, 'get_trend_label') else "UNKNOWN"
+                    ),
+                    "atr": atr,
+                    "sl_price": sl_price,
+                    "tp_price": vwap, # Update TP price in ML logs to reflect VWAP target
+                    "direction": getattr(config, "TRADE_DIRECTION", "SHORT"),
+                    "leverage": getattr(config, 'INTRADAY_LEVERAGE', 5.0),
+                }
+
+                obs_id = ml_logger.log_observation(symbol, ltp, features)
+                logger.info(f"   [ML] Logged observation: {obs_id}")
         except Exception as e:
             logger.warning(f"   [ML] Logging error: {e}")
 
@@ -462,8 +998,8 @@ class FyersAnalyzer:
             'ltp': ltp,
             'pattern': pattern_desc,
             'stop_loss': sl_price,
-            'day_high': df['high'].max(),
-            'signal_low': df.iloc[-2]['low'],
+            'day_high': day_high,
+            'signal_low': l[-2],
             'setup_high': setup_high,
             'signal_high': setup_high,
             'tick_size': signal_meta.get('tick_size', 0.05),
@@ -13,6 +13,8 @@ Key changes from Phase 42.1:
 import asyncio
 import json
 import logging
+import sys
+import threading
 import config
 from datetime import datetime, UTC
 from math import floor
@@ -28,6 +30,12 @@ class CapitalManager:
     NOT the hardcoded base_capital from config.
     """
 
+    # Fixed attribute layout: slot/margin checks run on every signal and exit.
+    __slots__ = (
+        'leverage', '_real_margin', '_initial_margin', '_last_sync',
+        '_position_active', '_active_symbol', '_lock', '_slot_guard',
+    )
+
     def __init__(self, leverage: float = 5.0):
         self.leverage = leverage
         self._real_margin: float = 0.0        # always from Fyers, never hardcoded
@@ -36,16 +44,22 @@ class CapitalManager:
         self._position_active: bool = False
         self._active_symbol: Optional[str] = None
         self._lock = asyncio.Lock()
+        # Guards the slot check-and-set; usable from the loop and from threads.
+        self._slot_guard = threading.Lock()
 
         logger.info(
-            f"💰 Capital Manager initialized | leverage={leverage}x | "
-            f"real_margin=PENDING (call sync() before trading)"
+            "💰 Capital Manager initialized | leverage=%sx | "
+            "real_margin=PENDING (call sync() before trading)", leverage
         )
 
     # ─────────────────────────────────────────────────────────────────────────
     # Properties
     # ─────────────────────────────────────────────────────────────────────────
 
+    @property
+    def real_margin(self) -> float:
+        return self._real_margin
+
     @property
     def buying_power(self) -> float:
         return self._real_margin * self.leverage
@@ -86,22 +100,24 @@ class CapitalManager:
                 self._last_sync = datetime.now(UTC)
 
                 # Capture morning ledger for dynamic goals (5% target)
-                if self._initial_margin == 0.0:
+                captured = self._initial_margin == 0.0
+                if captured:
                     self._initial_margin = margin
-                    logger.info(f"🎯 [INITIAL CAPITAL] Captured morning balance: ₹{self._initial_margin:.2f}")
 
                 logger.info(
-                    f"💰 CAPITAL SYNC | real_margin=₹{self._real_margin:.2f} | "
-                    f"buying_power=₹{self.buying_power:.2f} | "
-                    f"slot={'OCCUPIED → ' + (self._active_symbol or '?') if self._position_active else 'FREE'} | "
-                    f"synced_at={self._last_sync.strftime('%H:%M:%S')}"
+                    "💰 CAPITAL SYNC | real_margin=₹%.2f | buying_power=₹%.2f | "
+                    "slot=%s | synced_at=%s | initial=₹%.2f%s",
+                    self._real_margin, self.buying_power,
+                    'OCCUPIED → ' + (self._active_symbol or '?') if self._position_active else 'FREE',
+                    self._last_sync.strftime('%H:%M:%S'),
+                    self._initial_margin, ' (morning balance captured)' if captured else '',
                 )
                 return self._real_margin
 
             except Exception as e:
                 logger.error(
-                    f"💰 CAPITAL SYNC FAILED: {e} | "
-                    f"keeping last value ₹{self._real_margin:.2f}"
+                    "💰 CAPITAL SYNC FAILED: %s | keeping last value ₹%.2f",
+                    e, self._real_margin,
                 )
                 return self._real_margin
 
@@ -153,7 +169,7 @@ class CapitalManager:
             if key in funds:
                 return float(funds[key] or 0)
 
-        logger.warning(f"Abnormal funds structure detected: {json.dumps(funds)}")
+        logger.warning("Abnormal funds structure detected: %s", json.dumps(funds))
         raise ValueError(f"Cannot parse available margin from Fyers funds.")
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -187,20 +203,21 @@ class CapitalManager:
             cost = qty * ltp
             margin_req = cost / dynamic_leverage
             if margin_req <= safety_cap:
-                utilization = (margin_req / self._real_margin) * 100
                 logger.info(
-                    f"💰 SIZING {symbol} | real_margin=₹{self._real_margin:.2f} "
-                    f"buying_power=₹{true_buying_power:.2f} (Lev: {dynamic_leverage}x) | ltp=₹{ltp:.2f} "
-                    f"raw={raw_qty:.2f} → qty={qty} | cost=₹{cost:.2f} "
-                    f"margin_req=₹{margin_req:.2f} | utilization={utilization:.1f}%"
+                    "💰 SIZING %s | real_margin=₹%.2f buying_power=₹%.2f (Lev: %sx) | "
+                    "ltp=₹%.2f raw=%.2f → qty=%d | cost=₹%.2f margin_req=₹%.2f | "
+                    "utilization=%.1f%%",
+                    symbol, self._real_margin, true_buying_power, dynamic_leverage,
+                    ltp, raw_qty, qty, cost, margin_req,
+                    margin_req / self._real_margin * 100,
                 )
                 return qty, cost, margin_req
             qty -= 1
 
         logger.warning(
-            f"💰 SIZING {symbol} — ZERO QTY | "
-            f"real_margin=₹{self._real_margin:.2f} ltp=₹{ltp:.2f} "
-            f"(stock costs more than available margin)"
+            "💰 SIZING %s — ZERO QTY | real_margin=₹%.2f ltp=₹%.2f "
+            "(stock costs more than available margin)",
+            symbol, self._real_margin, ltp,
         )
         return 0, 0.0, 0.0
 
@@ -208,23 +225,57 @@ class CapitalManager:
     # Slot Management (Single-Position Architecture)
     # ─────────────────────────────────────────────────────────────────────────
 
+    def try_reserve_slot(self, symbol: str) -> bool:
+        """
+        Atomically claim the free slot for *symbol* before its entry order
+        is sent. Returns False (and changes nothing) if the slot is held, so
+        two concurrent entries can never both size off the full margin.
+        The reservation is confirmed by acquire_slot() after the fill, or
+        dropped with release_slot() if the entry fails.
+        """
+        symbol = sys.intern(symbol)
+        with self._slot_guard:
+            if self._position_active:
+                return False
+            self._position_active = True
+            self._active_symbol = symbol
+        logger.info("💰 CAPITAL SLOT RESERVED → %s (entry in flight)", symbol)
+        return True
+
+    def cancel_reservation(self, symbol: str) -> bool:
+        """
+        Drop a try_reserve_slot() reservation for *symbol* that acquire_slot()
+        never confirmed. Synchronous, so it also runs during task cancellation.
+        Returns False (and changes nothing) if the slot is not held for *symbol*.
+        """
+        with self._slot_guard:
+            if not self._position_active or self._active_symbol != symbol:
+                return False
+            self._position_active = False
+            self._active_symbol = None
+        logger.info("💰 CAPITAL SLOT RESERVATION DROPPED ← %s", symbol)
+        return True
+
     async def acquire_slot(self, symbol: str):
         """
         Lock capital slot after confirmed fill.
         Call AFTER broker confirms fill, BEFORE SL placement.
+        Confirms an existing try_reserve_slot() reservation for *symbol*.
         """
+        symbol = sys.intern(symbol)
         async with self._lock:
-            if self._position_active:
-                raise RuntimeError(
-                    f"Slot occupied by {self._active_symbol} — "
-                    f"cannot acquire for {symbol}"
-                )
-            self._position_active = True
-            self._active_symbol = symbol
+            with self._slot_guard:
+                if self._position_active and self._active_symbol != symbol:
+                    raise RuntimeError(
+                        f"Slot occupied by {self._active_symbol} — "
+                        f"cannot acquire for {symbol}"
+                    )
+                self._position_active = True
+                self._active_symbol = symbol
             logger.info(
-                f"💰 CAPITAL SLOT ACQUIRED → {symbol} | "
-                f"margin_committed=₹{self._real_margin:.2f} | "
-                f"all new entries BLOCKED until position closes"
+                "💰 CAPITAL SLOT ACQUIRED → %s | margin_committed=₹%.2f | "
+                "all new entries BLOCKED until position closes",
+                symbol, self._real_margin,
             )
 
     async def release_slot(self, broker=None):
@@ -233,10 +284,11 @@ class CapitalManager:
         Re-syncs Fyers margin if broker is provided.
         """
         async with self._lock:
-            released = self._active_symbol
-            self._position_active = False
-            self._active_symbol = None
-            logger.info(f"💰 CAPITAL SLOT RELEASED ← {released}")
+            with self._slot_guard:
+                released = self._active_symbol
+                self._position_active = False
+                self._active_symbol = None
+            logger.info("💰 CAPITAL SLOT RELEASED ← %s", released)
 
         # Sync outside lock — avoids deadlock, gets fresh margin for next trade
         if broker:
@@ -259,13 +311,15 @@ class CapitalManager:
 
     def get_status(self) -> dict:
         """Legacy-compatible — used by order_manager for buying_power lookup."""
+        active = self._position_active
+        buying_power = self._real_margin * self.leverage
         return {
             'base_capital': self._real_margin,
             'leverage': self.leverage,
-            'total_buying_power': self.buying_power,
-            'available': self.buying_power if self.is_slot_free else 0.0,
-            'in_use': self.buying_power if not self.is_slot_free else 0.0,
-            'positions_count': 1 if self._position_active else 0,
+            'total_buying_power': buying_power,
+            'available': 0.0 if active else buying_power,
+            'in_use': buying_power if active else 0.0,
+            'positions_count': 1 if active else 0,
             'active_symbol': self._active_symbol,
         }
 
@@ -273,4 +327,4 @@ class CapitalManager:
 
     def release(self, symbol: str):
         """DEPRECATED — use release_slot(). Kept so old code doesn't crash."""
-        logger.warning(f"⚠️ capital.release() called [DEPRECATED] for {symbol} — migrate to release_slot()")
+        logger.warning("⚠️ capital.release() called [DEPRECATED] for %s — migrate to release_slot()", symbol)
@@ -60,6 +60,7 @@ DAY_GAIN_PCT_THRESHOLD = 7.5       # Duplicate alias used in legacy paths
 # Operations
 SCANNER_PARALLEL_WORKERS = 10 # Phase 91.3: Increased from 3 to 10 for faster history fetching
 WS_TICK_FRESHNESS_TTL_SECONDS = 180.0
+USE_UVLOOP = True  # Run the bot's event loop on uvloop when installed (not available on Windows)
 
 # ============================================================================
 # STRATEGY: BackToVWAPShort
@@ -110,6 +111,10 @@ ORPHANED_POSITION_LOG_PATH = "logs/orphaned_positions.log"
 # Research variants must never modify live config at runtime.
 P70_ML_DYNAMIC_OVERRIDE_ENABLED = False
 
+# ML observation logging (data/ml). When False the analyzer skips building
+# the per-signal feature dict entirely.
+ML_LOGGING_ENABLED = True
+
 # ============================================================================
 # 8. FEATURE TOGGLES & LEGACY (PHASE 41 - PHASE 44)
 # ============================================================================
@@ -4,8 +4,16 @@ import datetime
 import os
 import json
 import asyncio
+import collections
+import contextlib
+import threading
+import time
 import config
 from typing import Optional, List, Dict, Any
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
 try:
     import psycopg2
     from psycopg2.extras import RealDictCursor
@@ -23,22 +31,250 @@ DB_CONFIG = {
     "password": "password", # Default, should come from env
     "database": "shortcircuit_trading",
     "min_size": 10,
-    "max_size": 50
+    "max_size": 50,
+    # asyncpg prepares every parameterised query once per connection and
+    # caches the statement. Its default 300s lifetime re-parses the trade
+    # log statements whenever trades are more than five minutes apart;
+    # keep them prepared for the connection's lifetime instead.
+    "statement_cache_size": 100,
+    "max_cached_statement_lifetime": 0,
 }
 
+ORDER_ENTRY_SQL = """
+    INSERT INTO orders (
+        symbol, side, order_type, qty, price, state,
+        session_date, created_by, exchange_order_id, leverage
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+    ON CONFLICT (exchange_order_id) DO NOTHING
+"""
+
+POSITION_ENTRY_SQL = """
+    INSERT INTO positions (
+        symbol, qty, entry_price, state, session_date, source, opened_at, leverage
+    ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), $7)
+    ON CONFLICT DO NOTHING
+"""
+
+POSITION_EXIT_SQL = """
+    UPDATE positions
+    SET state = 'CLOSED',
+        closed_at = NOW(),
+        current_price = $1,
+        realized_pnl = $2
+    WHERE symbol = $3 AND state = 'OPEN'
+"""
+
+POSITIONS_STAGING_COLUMNS = ('symbol', 'qty', 'entry_price', 'sl_order_id', 'source', 'session_date')
+
+POSITIONS_STAGING_SQL = """
+    CREATE TEMP TABLE positions_staging (
+        symbol VARCHAR(50), qty INTEGER, entry_price DOUBLE PRECISION,
+        sl_order_id VARCHAR(50), source VARCHAR(50), session_date DATE
+    ) ON COMMIT DROP
+"""
+
+POSITIONS_STAGING_UPDATE_SQL = """
+    UPDATE positions p
+    SET qty = s.qty,
+        entry_price = s.entry_price,
+        sl_order_id = COALESCE(s.sl_order_id, p.sl_order_id),
+        last_reconciled_at = NOW()
+    FROM positions_staging s
+    WHERE p.symbol = s.symbol AND p.state = 'OPEN'
+"""
+
+POSITIONS_STAGING_INSERT_SQL = """
+    INSERT INTO positions (
+        symbol, qty, entry_price, sl_order_id, state, source, session_date, opened_at
+    )
+    SELECT s.symbol, s.qty, s.entry_price, s.sl_order_id, 'OPEN', s.source, s.session_date, NOW()
+    FROM positions_staging s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM positions p WHERE p.symbol = s.symbol AND p.state = 'OPEN'
+    )
+"""
+
+SYSTEM_EVENT_SQL = """
+    INSERT INTO system_events (logged_at, session_date, event_type, details)
+    VALUES ($1, $2, $3, $4::jsonb)
+"""
+SYSTEM_EVENT_ASYNC_COMMIT_SQL = "SET LOCAL synchronous_commit TO OFF"
+
+
+_ORJSON_OPTS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def _dumps_json(obj) -> str:
+    """JSON text for a jsonb parameter; orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode()
+    return json.dumps(obj, default=str)
+
+
+# (expiry as time.time_ns(), date) — refreshed at local midnight
+_session_date_cache = (0, None)
+
+
+def current_session_date() -> datetime.date:
+    """Today's local date, re-read from the clock only after midnight."""
+    global _session_date_cache
+    if time.time_ns() >= _session_date_cache[0]:
+        today = datetime.date.today()
+        next_midnight = datetime.datetime.combine(
+            today + datetime.timedelta(days=1), datetime.time.min
+        )
+        _session_date_cache = (int(next_midnight.timestamp()) * 1_000_000_000, today)
+    return _session_date_cache[1]
+
+
+def _trade_entry_args(data: dict, session_date: datetime.date):
+    """(orders args, positions args) for one log_trade_entry payload."""
+    get = data.get
+    symbol, qty, entry_price = get('symbol'), get('qty'), get('entry_price')
+    leverage = get('leverage', 5.0)
+    order_id = data['exchange_order_id'] if 'exchange_order_id' in data else get('entry_id', 'N/A')
+    order = (
+        symbol, get('direction', 'BUY'), 'MARKET', qty, entry_price, 'FILLED',
+        session_date, 'BOT', order_id, leverage,
+    )
+    position = (symbol, qty, entry_price, 'OPEN', session_date, 'SIGNAL', leverage)
+    return order, position
+
+
+class TradeLogBatcher:
+    """
+    Coalesces trade-entry writes. Entries submitted within MAX_WAIT_SEC of
+    the first one (up to MAX_BATCH) share one transaction with a single
+    executemany per table. submit() returns once its batch has committed,
+    so callers keep the "logged when awaited" guarantee.
+    """
+
+    MAX_BATCH = 64
+    MAX_WAIT_SEC = 0.025
+
+    def __init__(self, get_pool):
+        self._get_pool = get_pool
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, data: dict) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        fut = loop.create_future()
+        self._queue.put_nowait((data, fut))
+        await fut
+
+    async def close(self) -> None:
+        """Commit whatever is queued, then stop the drain task."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        err: BaseException = RuntimeError("Trade entry writer stopped")
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                stop = False
+                deadline = loop.time() + self.MAX_WAIT_SEC
+                while len(batch) < self.MAX_BATCH:
+                    try:
+                        item = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                await self._flush(batch)
+                batch = []
+                if stop:
+                    return
+        except BaseException as e:
+            err = e
+            raise
+        finally:
+            # Whatever ends the drain, no submit() may be left awaiting it
+            self._fail_pending(batch, err)
+
+    def _fail_pending(self, batch, err: BaseException) -> None:
+        """Fail the in-flight batch and everything still queued."""
+        if not isinstance(err, Exception):
+            err = RuntimeError(f"Trade entry writer stopped ({type(err).__name__})")
+        pending = list(batch)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is not None:
+                pending.append(item)
+        for _, fut in pending:
+            if not fut.done():
+                fut.set_exception(err)
+
+    async def _flush(self, batch):
+        try:
+            args = [_trade_entry_args(data, current_session_date()) for data, _ in batch]
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.executemany(ORDER_ENTRY_SQL, [a[0] for a in args])
+                    await conn.executemany(POSITION_ENTRY_SQL, [a[1] for a in args])
+        except Exception as e:
+            if len(batch) > 1:
+                # One bad row must not fail the others: retry each on its own
+                logger.warning(f"Trade entry batch of {len(batch)} failed ({e}) — retrying individually")
+                for item in batch:
+                    await self._flush([item])
+                return
+            fut = batch[0][1]
+            if not fut.done():
+                fut.set_exception(e)
+            return
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_result(None)
+
+
 class DatabaseManager:
     """
     Phase 42.1: HFT-Grade Database Manager using PostgreSQL + asyncpg.
     Implements connection pooling and atomic transactions.
     """
     
-    _instance = None
     _pool = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-        return cls._instance
+    _entry_batcher: Optional[TradeLogBatcher] = None
+    # Connection held out of the pool for fetchval_fast() probes.
+    _probe_conn = None
+    _probe_lock: Optional[asyncio.Lock] = None
+    # log_event() buffer: appended on the loop, drained by _drain_events().
+    EVENT_RING_SIZE = 8192
+    EVENT_BATCH = 256
+    EVENT_FLUSH_SEC = 0.5
+    _event_ring: collections.deque = collections.deque(maxlen=EVENT_RING_SIZE)
+    _event_task: Optional[asyncio.Task] = None
+    _event_wake: Optional[asyncio.Event] = None
+    _event_closing = False
+    # query(): one blocking psycopg2 connection shared by script callers.
+    _sync_conn = None
+    _sync_lock = threading.Lock()
 
     @classmethod
     async def get_pool(cls):
@@ -47,7 +283,6 @@ class DatabaseManager:
         """
         if cls._pool is None:
             try:
-                logger.info("Initializing PostgreSQL Connection Pool...")
                 # Try to get config from env vars first
                 config = DB_CONFIG.copy()
                 config['user'] = os.getenv('DB_USER', config['user'])
@@ -55,7 +290,11 @@ class DatabaseManager:
                 config['host'] = os.getenv('DB_HOST', config['host'])
                 
                 cls._pool = await asyncpg.create_pool(**config)
-                logger.info(f"✅ DB Pool Initialized (Min: {config['min_size']}, Max: {config['max_size']})")
+                logger.info(
+                    "✅ PostgreSQL pool initialized | %s@%s:%s/%s | min=%d max=%d",
+                    config['user'], config['host'], config['port'], config['database'],
+                    config['min_size'], config['max_size'],
+                )
             except Exception as e:
                 logger.critical(f"❌ Failed to initialize DB Pool: {e}")
                 raise
@@ -63,6 +302,27 @@ class DatabaseManager:
 
     @classmethod
     async def close_pool(cls):
+        if cls._entry_batcher is not None:
+            await cls._entry_batcher.close()
+        task, cls._event_task = cls._event_task, None
+        if task is not None and not task.done():
+            # Let the drain finish its current batch and exit on its own;
+            # cancelling it mid-flush would drop the batch it already popped.
+            cls._event_closing = True
+            cls._event_wake.set()
+            try:
+                await task
+            finally:
+                cls._event_closing = False
+        if cls._pool and cls._event_ring:
+            await cls._flush_events()
+        if cls._probe_conn is not None:
+            if cls._pool:
+                await cls._pool.release(cls._probe_conn)
+            cls._probe_conn = None
+        if cls._sync_conn is not None:
+            cls._sync_conn.close()
+            cls._sync_conn = None
         if cls._pool:
             await cls._pool.close()
             cls._pool = None
@@ -71,6 +331,7 @@ class DatabaseManager:
     async def initialize(self):
         """Helper to init pool."""
         await self.get_pool()
+        self._start_event_drain()
 
     async def close(self):
         """Close asyncpg pool for graceful application shutdown."""
@@ -100,14 +361,52 @@ class DatabaseManager:
         async with pool.acquire() as conn:
             return await conn.fetchval(query, *args)
 
+    async def fetchval_fast(self, query: str, *args):
+        """
+        Fetch single value on a dedicated connection, skipping pool.acquire().
+        For read-only probes (SELECT 1, last-sequence checks) only — writes
+        must still go through the pool.
+        """
+        cls = type(self)
+        if cls._probe_lock is None:
+            cls._probe_lock = asyncio.Lock()
+        async with cls._probe_lock:
+            conn = cls._probe_conn
+            if conn is None or conn.is_closed():
+                pool = await self.get_pool()
+                if conn is not None:
+                    await pool.release(conn)
+                conn = cls._probe_conn = await pool.acquire()
+            return await conn.fetchval(query, *args)
+
+    @classmethod
+    def _get_sync_conn(cls):
+        """The shared psycopg2 connection for query(); (re)opened on demand."""
+        if cls._sync_conn is None or cls._sync_conn.closed:
+            cfg = DB_CONFIG.copy()
+            cfg["user"] = os.getenv("DB_USER", cfg["user"])
+            cfg["password"] = os.getenv("DB_PASS", os.getenv("DB_PASSWORD", cfg["password"]))
+            cfg["host"] = os.getenv("DB_HOST", cfg["host"])
+            cfg["port"] = int(os.getenv("DB_PORT", cfg["port"]))
+            cfg["database"] = os.getenv("DB_NAME", cfg["database"])
+            cls._sync_conn = psycopg2.connect(
+                host=cfg["host"],
+                port=cfg["port"],
+                user=cfg["user"],
+                password=cfg["password"],
+                dbname=cfg["database"],
+            )
+        return cls._sync_conn
+
     def query(self, sql: str, params=None) -> List[Dict[str, Any]]:
         """
         Synchronous query interface for standalone/offline scripts.
 
         Implementation contract (Phase 44.5):
-        - Uses a fresh blocking psycopg2 connection per call.
+        - Reuses one blocking psycopg2 connection, opened on first call and
+          reopened if it drops; calls are serialized on a lock.
         - Reuses the same DB env-var credentials as asyncpg config.
-        - No persistent psycopg2 pool (script path only, not hot path).
+        - Each call's transaction is rolled back afterwards (read path).
         - Returns [] when there are no rows.
         """
         if not sql:
@@ -119,34 +418,40 @@ class DatabaseManager:
             )
 
         params = params or ()
-        cfg = DB_CONFIG.copy()
-        cfg["user"] = os.getenv("DB_USER", cfg["user"])
-        cfg["password"] = os.getenv("DB_PASS", os.getenv("DB_PASSWORD", cfg["password"]))
-        cfg["host"] = os.getenv("DB_HOST", cfg["host"])
-        cfg["port"] = int(os.getenv("DB_PORT", cfg["port"]))
-        cfg["database"] = os.getenv("DB_NAME", cfg["database"])
-
-        conn = None
-        try:
-            conn = psycopg2.connect(
-                host=cfg["host"],
-                port=cfg["port"],
-                user=cfg["user"],
-                password=cfg["password"],
-                dbname=cfg["database"],
-            )
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(sql, params)
-                if cursor.description is None:
-                    return []
-                rows = cursor.fetchall() or []
-                return [dict(row) for row in rows]
-        except Exception:
-            logger.exception("Synchronous query() failed")
-            raise
-        finally:
-            if conn is not None:
-                conn.close()
+        cls = type(self)
+        with cls._sync_lock:
+            conn = None
+            try:
+                conn = cls._get_sync_conn()
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(sql, params)
+                    if cursor.description is None:
+                        return []
+                    return [dict(row) for row in cursor]
+            except Exception:
+                logger.exception("Synchronous query() failed")
+                raise
+            finally:
+                if conn is not None and not conn.closed:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        conn.close()
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements as one transaction on one pooled connection,
+        so they share a single commit (one WAL flush instead of one each):
+
+            async with db.transaction() as conn:
+                await conn.execute(...)
+                await conn.execute(...)
+        """
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
 
     # --- HFT Trading Logics ---
 
@@ -156,29 +461,13 @@ class DatabaseManager:
         Uses transaction to ensure consistency.
         Phase 93: ON CONFLICT DO NOTHING for orders to prevent duplicate key errors
         when WS fill recovery re-triggers entry logging.
+        Entries are coalesced by TradeLogBatcher; this returns once the
+        batch holding *data* has committed.
         """
-        pool = await self.get_pool()
-        async with pool.acquire() as conn:
-            async with conn.transaction():
-                # 1. Log Order (upsert-safe)
-                await conn.execute("""
-                    INSERT INTO orders (
-                        symbol, side, order_type, qty, price, state, 
-                        session_date, created_by, exchange_order_id, leverage
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON CONFLICT (exchange_order_id) DO NOTHING
-                """, data.get('symbol'), data.get('direction', 'BUY'), 'MARKET', data.get('qty'), 
-                     data.get('entry_price'), 'FILLED', datetime.date.today(), 'BOT',
-                     data.get('exchange_order_id', data.get('entry_id', 'N/A')), data.get('leverage', 5.0))
-                
-                # 2. Log Position
-                await conn.execute("""
-                    INSERT INTO positions (
-                        symbol, qty, entry_price, state, session_date, source, opened_at, leverage
-                    ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), $7)
-                    ON CONFLICT DO NOTHING
-                """, data.get('symbol'), data.get('qty'), data.get('entry_price'), 
-                     'OPEN', datetime.date.today(), 'SIGNAL', data.get('leverage', 5.0))
+        cls = type(self)
+        if cls._entry_batcher is None:
+            cls._entry_batcher = TradeLogBatcher(cls.get_pool)
+        await cls._entry_batcher.submit(data)
 
     async def log_trade_exit(self, symbol: str, exit_data: dict):
         """
@@ -186,14 +475,28 @@ class DatabaseManager:
         """
         pool = await self.get_pool()
         async with pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE positions 
-                SET state = 'CLOSED', 
-                    closed_at = NOW(), 
-                    current_price = $1,
-                    realized_pnl = $2
-                WHERE symbol = $3 AND state = 'OPEN'
-            """, exit_data.get('exit_price'), exit_data.get('pnl'), symbol)
+            await conn.execute(
+                POSITION_EXIT_SQL, exit_data.get('exit_price'), exit_data.get('pnl'), symbol
+            )
+
+    async def bulk_upsert_positions(self, records: List[tuple]) -> None:
+        """
+        Write many OPEN positions in one round trip: binary COPY into a temp
+        staging table, then update rows that are already OPEN and insert the
+        rest. Used to seed broker-held positions at startup.
+        records: (symbol, qty, entry_price, sl_order_id, source, session_date)
+        """
+        if not records:
+            return
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(POSITIONS_STAGING_SQL)
+                await conn.copy_records_to_table(
+                    'positions_staging', records=records, columns=POSITIONS_STAGING_COLUMNS
+                )
+                await conn.execute(POSITIONS_STAGING_UPDATE_SQL)
+                await conn.execute(POSITIONS_STAGING_INSERT_SQL)
 
     async def get_today_trades(self, session_date: Optional[datetime.date] = None) -> List[Dict[str, Any]]:
         """
@@ -201,7 +504,7 @@ class DatabaseManager:
         Normalized shape: symbol, pnl, status, exit_reason, closed_at.
         """
         if session_date is None:
-            session_date = datetime.date.today()
+            session_date = current_session_date()
 
         rows = await self.fetch(
             """
@@ -246,16 +549,67 @@ class DatabaseManager:
             
     async def log_event(self, event_type: str, details: dict):
         """
-        Log system event or audit entry.
+        Log system event or audit entry to system_events.
+        Only buffers the event; _drain_events() writes it within
+        EVENT_FLUSH_SEC, or as soon as EVENT_BATCH events are waiting.
+        When the ring is full the oldest events are dropped.
+        Requires the system_events table (migrations/v58_system_events.sql).
         """
-        # We might need a generic event table or audit_log
-        # For Phase 42.1, we have reconciliation_log, maybe add 'system_events'? 
-        # Using a simple log output for now if table doesn't exist, strictly following migration.
-        # Migration script has trade_events? No, migration script dropped trade_events.
-        # It has audit_log? No audit_log in the applied v42_1_0_postgresql.sql?
-        # Checking migration script content again...
-        # It has Orders, Positions, Reconciliation Log.
-        # It does NOT have 'audit_log' or 'trade_events' in the PRIMARY script I wrote.
-        # Wait, the PRD listed them but I wrote a simplified migration script for "Emergency Patch".
-        # I should stick to what I created in v42_1_0_postgresql.sql.
-        pass
+        await self.log_events_bulk(event_type, (details,))
+
+    async def log_events_bulk(self, event_type: str, details_list):
+        """Buffer several events of one type with a single timestamp."""
+        cls = type(self)
+        ts = datetime.datetime.now().astimezone()
+        cls._event_ring.extend((ts, event_type, _dumps_json(d)) for d in details_list)
+        cls._start_event_drain()
+        if len(cls._event_ring) >= cls.EVENT_BATCH:
+            cls._event_wake.set()
+
+    async def flush_events(self):
+        """Write every buffered event now (e.g. before a script exits)."""
+        await type(self)._flush_events()
+
+    @classmethod
+    def _start_event_drain(cls):
+        if cls._event_task is None or cls._event_task.done():
+            cls._event_wake = asyncio.Event()
+            cls._event_task = asyncio.get_running_loop().create_task(cls._drain_events())
+
+    @classmethod
+    async def _drain_events(cls):
+        while not cls._event_closing:
+            try:
+                await asyncio.wait_for(cls._event_wake.wait(), cls.EVENT_FLUSH_SEC)
+            except asyncio.TimeoutError:
+                pass
+            cls._event_wake.clear()
+            if cls._event_ring:
+                await cls._flush_events()
+
+    @classmethod
+    async def _flush_events(cls):
+        ring = cls._event_ring
+        while ring:
+            batch = [ring.popleft() for _ in range(min(cls.EVENT_BATCH, len(ring)))]
+            rows = [(ts, ts.date(), event_type, details) for ts, event_type, details in batch]
+            try:
+                pool = await cls.get_pool()
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        # Audit rows only: don't wait on the WAL flush.
+                        await conn.execute(SYSTEM_EVENT_ASYNC_COMMIT_SQL)
+                        await conn.executemany(SYSTEM_EVENT_SQL, rows)
+            except Exception as e:
+                logger.error(f"System event flush failed, dropped {len(rows)} events: {e}")
+
+
+# Global singleton instance
+_db_manager = None
+
+def get_db_manager():
+    """Get the global database manager instance."""
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager()
+    return _db_manager
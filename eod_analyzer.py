@@ -8,7 +8,8 @@ from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 import config
-from database import DatabaseManager
+from database import get_db_manager
+from strategy.features import CANDLE_COLUMNS, candle_array
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +19,13 @@ logger = logging.getLogger(__name__)
 IST = ZoneInfo("Asia/Kolkata")
 
 REPORT_DIR = "logs/eod_reports"
+HISTORY_CALL_INTERVAL_SEC = 0.2  # Rate limit safety: 5 history calls per second max
+
+
+def _candle_columns(candles):
+    """Fyers candle rows -> {column: ndarray} (struct-of-arrays); 'epoch' stays in seconds."""
+    arr = candle_array(candles)
+    return {name: arr[:, i] for i, name in enumerate(CANDLE_COLUMNS)}
 
 
 class EODAnalyzer:
@@ -30,6 +38,10 @@ class EODAnalyzer:
     def __init__(self, fyers=None, db_manager=None, *, fyers_client=None, db=None):
         self.fyers = fyers_client if fyers_client is not None else fyers
         self.db = db if db is not None else db_manager
+        # Read path resolved once: the bound async fetch() when the db has
+        # one, else None and the sync query() fallback is used.
+        fetch = getattr(self.db, "fetch", None)
+        self._db_fetch = fetch if asyncio.iscoroutinefunction(fetch) else None
         os.makedirs(REPORT_DIR, exist_ok=True)
 
     async def run_daily_analysis(self, date=None):
@@ -87,8 +99,7 @@ class EODAnalyzer:
             else MLDataLogger(session_date=target_date_str)
         )
         
-        unlabeled_df = ml_logger.get_unlabeled_observations(target_date_str)
-        unlabeled = unlabeled_df.to_dict('records') if not unlabeled_df.empty else []
+        unlabeled = ml_logger.get_unlabeled_records(target_date_str)
         if not unlabeled:
             logger.info("No unlabeled observations to audit.")
             return {"processed": 0, "wins": 0, "losses": 0}
@@ -99,91 +110,125 @@ class EODAnalyzer:
         # Phase 97.2: Global audit timeout to prevent EOD hang
         audit_start_ts = time.monotonic()
         MAX_AUDIT_SECONDS = 60
-        
+
+        # History requests start up front, spaced to the broker rate limit,
+        # so their round trips overlap instead of adding up one by one. Each
+        # symbol's day is fetched once and sliced per observation.
+        fetches = []
+        day_candles = {}   # symbol -> fetch task
         for obs in unlabeled:
-            # Check for global timeout
-            if time.monotonic() - audit_start_ts > MAX_AUDIT_SECONDS:
-                logger.warning(f"[GHOST AUDIT] Reached {MAX_AUDIT_SECONDS}s limit. Skipping remaining {len(unlabeled) - results['processed']} signals.")
-                break
-                
             symbol = obs.get("symbol")
             if not symbol: continue
-            
             try:
                 sig_dt = self._observation_timestamp(obs, target_date)
-                if sig_dt is None:
-                    logger.warning("[GHOST AUDIT] Missing/invalid signal timestamp for %s", symbol)
-                    continue
-
-                # We need historical data to simulate the path
-                # Fyers history API: resolution 1
-                data = {
-                    "symbol": symbol,
-                    "resolution": "1",
-                    "date_format": "1",
-                    "range_from": target_date.strftime("%Y-%m-%d"),
-                    "range_to": target_date.strftime("%Y-%m-%d"),
-                    "cont_flag": "1"
-                }
-                
-                # Fetch history with timeout
-                try:
-                    response = await asyncio.wait_for(
-                        asyncio.to_thread(self.fyers.history, data=data),
-                        timeout=15.0
-                    )
-                except asyncio.TimeoutError:
-                    logger.warning(f"[GHOST AUDIT] History API timeout for {symbol}")
-                    continue
-                    
-                if not response or response.get("s") != "ok" or "candles" not in response or not response["candles"]:
-                    continue
-                
-                cols = ["epoch", "open", "high", "low", "close", "volume"]
-                df = pd.DataFrame(response["candles"], columns=cols)
-                df['dt'] = pd.to_datetime(df['epoch'], unit='s', utc=True).dt.tz_convert('Asia/Kolkata')
-                
-                # Use candles strictly after the signal timestamp. The signal
-                # minute candle can contain price action from before the signal.
-                relevant_candles = df[df['dt'] > sig_dt]
-                if relevant_candles.empty:
-                    continue
-
-                # 2. Simulate Path
-                outcome_data = self._simulate_path(obs, relevant_candles)
-                
-                # 3. Update ML Logger
-                if outcome_data:
-                    ml_logger.update_outcome(
-                        obs_id=obs["obs_id"],
-                        outcome=outcome_data["outcome"],
-                        exit_price=outcome_data["exit_price"],
-                        max_favorable=outcome_data["max_favorable"],
-                        max_adverse=outcome_data["max_adverse"],
-                        hold_time_mins=outcome_data["hold_time_mins"],
-                        pnl_pct=outcome_data["pnl_pct"],
-                        label_source="GHOST",
-                        exit_reason=outcome_data["exit_reason"],
-                    )
-                    results["processed"] += 1
-                    if outcome_data["outcome"] == "WIN":
-                        results["wins"] += 1
-                        if outcome_data.get("exit_reason") == "TP_HIT":
-                            results["tp_hits"] += 1
-                        elif outcome_data.get("exit_reason") == "EOD_SQUAREOFF":
-                            results["eod_wins"] += 1
-                    elif outcome_data["outcome"] == "LOSS":
-                        results["losses"] += 1
-
             except Exception as e:
                 logger.warning(f"Failed to audit {symbol}: {e}")
-            
-            # Rate limit safety: 5 calls per second max
-            await asyncio.sleep(0.2)
+                continue
+            if sig_dt is None:
+                logger.warning("[GHOST AUDIT] Missing/invalid signal timestamp for %s", symbol)
+                continue
+            task = day_candles.get(symbol)
+            if task is None:
+                delay = len(day_candles) * HISTORY_CALL_INTERVAL_SEC
+                task = day_candles[symbol] = asyncio.create_task(
+                    self._fetch_day_candles(symbol, target_date, delay)
+                )
+            fetches.append((obs, symbol, sig_dt, task))
+
+        frames = {}   # symbol -> candle columns, built once
+        labels = []
+        try:
+            for obs, symbol, sig_dt, task in fetches:
+                # Check for global timeout
+                if time.monotonic() - audit_start_ts > MAX_AUDIT_SECONDS:
+                    logger.warning(f"[GHOST AUDIT] Reached {MAX_AUDIT_SECONDS}s limit. Skipping remaining {len(unlabeled) - results['processed']} signals.")
+                    break
 
+                try:
+                    cols = frames.get(symbol)
+                    if cols is None:
+                        candles = await task
+                        if not candles:
+                            continue
+                        cols = frames[symbol] = _candle_columns(candles)
+                
+                    # Use candles strictly after the signal timestamp. The signal
+                    # minute candle can contain price action from before the signal.
+                    after = cols['epoch'] > sig_dt.timestamp()
+                    if not after.any():
+                        continue
+                    relevant_candles = {name: col[after] for name, col in cols.items()}
+
+                    # 2. Simulate Path
+                    outcome_data = self._simulate_path(obs, relevant_candles)
+                
+                    # 3. Queue the label; written in one batch below
+                    if outcome_data:
+                        labels.append(dict(
+                            obs_id=obs["obs_id"],
+                            outcome=outcome_data["outcome"],
+                            exit_price=outcome_data["exit_price"],
+                            max_favorable=outcome_data["max_favorable"],
+                            max_adverse=outcome_data["max_adverse"],
+                            hold_time_mins=outcome_data["hold_time_mins"],
+                            pnl_pct=outcome_data["pnl_pct"],
+                            label_source="GHOST",
+                            exit_reason=outcome_data["exit_reason"],
+                        ))
+                        results["processed"] += 1
+                        if outcome_data["outcome"] == "WIN":
+                            results["wins"] += 1
+                            if outcome_data.get("exit_reason") == "TP_HIT":
+                                results["tp_hits"] += 1
+                            elif outcome_data.get("exit_reason") == "EOD_SQUAREOFF":
+                                results["eod_wins"] += 1
+                        elif outcome_data["outcome"] == "LOSS":
+                            results["losses"] += 1
+
+                except Exception as e:
+                    logger.warning(f"Failed to audit {symbol}: {e}")
+        finally:
+            # Requests not yet started (or still in flight) after a break/cancel
+            pending = list(day_candles.values())
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            # One lock hold + one journal write for the whole audit; also
+            # runs if the audit is cancelled, so finished labels are kept.
+            ml_logger.update_outcomes(labels)
+            # flush() joins the journal queue and writes the parquet: keep
+            # that disk work off the event loop.
+            await asyncio.to_thread(ml_logger.flush)
         logger.info(f"Ghost Audit Complete: {results}")
         return results
 
+    async def _fetch_day_candles(self, symbol: str, target_date: date, delay: float = 0.0):
+        """1-minute candles for *symbol* on *target_date*, or None. Starts after *delay* seconds."""
+        if delay:
+            await asyncio.sleep(delay)
+        # Fyers history API: resolution 1
+        day = target_date.strftime("%Y-%m-%d")
+        data = {
+            "symbol": symbol,
+            "resolution": "1",
+            "date_format": "1",
+            "range_from": day,
+            "range_to": day,
+            "cont_flag": "1"
+        }
+        try:
+            response = await asyncio.wait_for(
+                asyncio.to_thread(self.fyers.history, data=data),
+                timeout=15.0
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"[GHOST AUDIT] History API timeout for {symbol}")
+            return None
+
+        if not response or response.get("s") != "ok" or not response.get("candles"):
+            return None
+        return response["candles"]
+
     def _observation_timestamp(self, obs, target_date: date):
         """Return a timezone-aware IST timestamp for an ML observation."""
         timestamp_ist = obs.get("timestamp_ist")
@@ -203,10 +248,11 @@ class EODAnalyzer:
         sig_dt = datetime.strptime(f"{obs_date} {signal_time_str}", "%Y-%m-%d %H:%M:%S")
         return sig_dt.replace(tzinfo=IST)
 
-    def _simulate_path(self, obs, df):
+    def _simulate_path(self, obs, candles):
         """
         Core path simulation engine for ShortCircuit strategy.
         Checks for SL, TP1, TP2, TP3 hits in order.
+        *candles* is a column dict as built by _candle_columns().
         """
         try:
             entry_price = float(obs.get("ltp"))
@@ -218,72 +264,62 @@ class EODAnalyzer:
         if not all([entry_price, sl_price, tp_price]):
             return None
 
-        # Position State
-        state = "ACTIVE"
-        current_sl = sl_price
-        max_favorable = 0.0
-        max_adverse = 0.0
-        start_time = df.iloc[0]['dt']
-        exit_time = None
-        exit_price = None
-        outcome = "LOSS" # Default
-        exit_reason = None
-        
         direction = str(obs.get("direction") or "").upper()
         is_short = direction == "SHORT" if direction in {"SHORT", "LONG"} else sl_price > entry_price
 
-        for _, row in df.iterrows():
-            high = row['high']
-            low = row['low']
-            close = row['close']
-            
-            if is_short:
-                # SHORT: AE (Price going AGAINST = UP), FE (Price going WITH = DOWN)
-                adv = max(0.0, ((high - entry_price) / entry_price) * 100)
-                fav = max(0.0, ((entry_price - low) / entry_price) * 100)
-            else:
-                # LONG: AE (Price going AGAINST = DOWN), FE (Price going WITH = UP)
-                adv = max(0.0, ((entry_price - low) / entry_price) * 100)
-                fav = max(0.0, ((high - entry_price) / entry_price) * 100)
-
-            max_adverse = max(max_adverse, adv)
-            max_favorable = max(max_favorable, fav)
-            
-            # Check Stop Loss
-            sl_hit = (high >= current_sl) if is_short else (low <= current_sl)
-            if sl_hit:
-                state = "CLOSED"
-                exit_price = current_sl
-                exit_time = row['dt']
-                exit_reason = "SL_HIT"
-                if is_short:
-                    outcome = "BREAKEVEN" if abs(current_sl - entry_price) < 0.1 else ("LOSS" if current_sl > entry_price else "WIN")
-                else:
-                    outcome = "BREAKEVEN" if abs(current_sl - entry_price) < 0.1 else ("LOSS" if current_sl < entry_price else "WIN")
-                break
-                
-            # Check Take Profits
-            if state == "ACTIVE":
-                tp_hit = (low <= tp_price) if is_short else (high >= tp_price)
-                if tp_hit and tp_price > 0:
-                    exit_price = tp_price
-                    exit_reason = "TP_HIT"
-                    state = "CLOSED"
-                    outcome = "WIN"
-                    exit_time = row['dt']
-                    break
-
-        # EOD Square-off if still active
-        if state == "ACTIVE":
-            exit_price = df.iloc[-1]['close']
-            exit_time = df.iloc[-1]['dt']
+        # One vectorised pass over the session instead of iterrows(): the SL
+        # and TP hits are the first True of each mask, and the stop is tested
+        # before the target on the same bar.
+        high = candles['high']
+        low = candles['low']
+        n = high.shape[0]
+        if is_short:
+            # SHORT: AE (Price going AGAINST = UP), FE (Price going WITH = DOWN)
+            adv = (high - entry_price) / entry_price * 100
+            fav = (entry_price - low) / entry_price * 100
+            sl_hits = high >= sl_price
+            tp_hits = low <= tp_price
+        else:
+            # LONG: AE (Price going AGAINST = DOWN), FE (Price going WITH = UP)
+            adv = (entry_price - low) / entry_price * 100
+            fav = (high - entry_price) / entry_price * 100
+            sl_hits = low <= sl_price
+            tp_hits = high >= tp_price
+
+        sl_idx = int(sl_hits.argmax()) if sl_hits.any() else n
+        tp_idx = int(tp_hits.argmax()) if tp_price > 0 and tp_hits.any() else n
+        exit_idx = min(sl_idx, tp_idx)
+
+        # Excursions only count bars up to and including the exit bar
+        end = min(exit_idx, n - 1) + 1
+        max_adverse = max(0.0, float(adv[:end].max()))
+        max_favorable = max(0.0, float(fav[:end].max()))
+        start_time = candles['epoch'][0]
+
+        if exit_idx == n:
+            # EOD Square-off if still active
+            exit_price = candles['close'][-1]
+            exit_time = candles['epoch'][-1]
             exit_reason = "EOD_SQUAREOFF"
             if is_short:
                 outcome = "WIN" if exit_price < entry_price else "LOSS"
             else:
                 outcome = "WIN" if exit_price > entry_price else "LOSS"
+        elif sl_idx <= tp_idx:
+            exit_price = sl_price
+            exit_time = candles['epoch'][sl_idx]
+            exit_reason = "SL_HIT"
+            if is_short:
+                outcome = "BREAKEVEN" if abs(sl_price - entry_price) < 0.1 else ("LOSS" if sl_price > entry_price else "WIN")
+            else:
+                outcome = "BREAKEVEN" if abs(sl_price - entry_price) < 0.1 else ("LOSS" if sl_price < entry_price else "WIN")
+        else:
+            exit_price = tp_price
+            exit_time = candles['epoch'][tp_idx]
+            exit_reason = "TP_HIT"
+            outcome = "WIN"
 
-        hold_time = (exit_time - start_time).total_seconds() / 60
+        hold_time = float(exit_time - start_time) / 60
         if is_short:
             pnl_pct = ((entry_price - exit_price) / entry_price) * 100
         else:
@@ -304,8 +340,8 @@ class EODAnalyzer:
         Fetch trades for a given session date.
         Prefers async fetch() when available, falls back to sync query().
         """
-        if hasattr(self.db, "fetch") and asyncio.iscoroutinefunction(self.db.fetch):
-            rows = await self.db.fetch(
+        if self._db_fetch is not None:
+            rows = await self._db_fetch(
                 """
                 SELECT
                     symbol,
@@ -394,8 +430,8 @@ class EODAnalyzer:
         }
 
         try:
-            if hasattr(self.db, "fetch") and asyncio.iscoroutinefunction(self.db.fetch):
-                rows = await self.db.fetch(
+            if self._db_fetch is not None:
+                rows = await self._db_fetch(
                     "SELECT * FROM soft_stop_events WHERE DATE(timestamp) = $1",
                     session_date,
                 )
@@ -514,7 +550,14 @@ class EODAnalyzer:
             pass
 
 if __name__ == "__main__":
-    db = DatabaseManager()
+    db = get_db_manager()
     analyzer = EODAnalyzer(db_manager=db)
-    report = asyncio.run(analyzer.run_daily_analysis())
+
+    async def _main():
+        try:
+            return await analyzer.run_daily_analysis()
+        finally:
+            await db.close()  # writes buffered log_event rows
+
+    report = asyncio.run(_main())
     print(report)
@@ -14,6 +14,124 @@ from gate_result_logger import get_gate_result_logger
 # Setup Logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("FocusEngine")
+IST = pytz.timezone('Asia/Kolkata')
+
+# Tasks started by _run_on_loop; the loop itself only holds weak references.
+_LOOP_TASKS = set()
+
+
+class _LoopResult:
+    """Result slot the loop thread fills for one blocking cross-thread call."""
+    __slots__ = ("value", "exc", "done")
+
+    def __init__(self):
+        self.value = None
+        self.exc = None
+        self.done = threading.Event()
+
+    def set_from(self, task):
+        _LOOP_TASKS.discard(task)
+        if task.cancelled():
+            self.exc = asyncio.CancelledError()
+        else:
+            self.exc = task.exception()
+            if self.exc is None:
+                self.value = task.result()
+        self.done.set()
+
+
+class _PendingSignal:
+    """One signal waiting at the Validation Gate (G12) for its trigger."""
+    __slots__ = ("data", "trigger", "invalidate", "timestamp", "expires_at",
+                 "correlation_id", "last_evaluated_minute")
+
+    def __init__(self, data, trigger, invalidate, expires_at):
+        self.data = data
+        self.trigger = trigger
+        self.invalidate = invalidate
+        self.timestamp = time.time()
+        self.expires_at = expires_at            # Phase 51 dynamic timeout (epoch seconds)
+        self.correlation_id = data.get('correlation_id')
+        self.last_evaluated_minute = None       # Phase 58: for candle-close validation
+
+
+def _run_on_loop(loop, coro, timeout):
+    """
+    Run *coro* on *loop* from a worker thread and block for its result.
+
+    One call_soon_threadsafe hop and a slotted result holder, instead of
+    run_coroutine_threadsafe's concurrent Future chained to the task.
+    Raises TimeoutError after *timeout* seconds; like the Future path, the
+    task itself keeps running on the loop.
+
+    Must not be called from *loop*'s own thread: the wait would block the
+    loop that has to run *coro*, so that raises RuntimeError up front.
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError(
+            f"_run_on_loop({coro.__qualname__}) called on the loop thread — await it instead"
+        )
+
+    slot = _LoopResult()
+
+    def _schedule():
+        try:
+            task = loop.create_task(coro)
+        except Exception as e:
+            slot.exc = e
+            slot.done.set()
+            return
+        _LOOP_TASKS.add(task)
+        task.add_done_callback(slot.set_from)
+
+    try:
+        loop.call_soon_threadsafe(_schedule)
+    except RuntimeError:
+        coro.close()
+        raise
+    if not slot.done.wait(timeout):
+        raise TimeoutError(f"{coro.__qualname__} did not finish within {timeout}s")
+    if slot.exc is not None:
+        raise slot.exc
+    return slot.value
+
+
+def _log_bg_failure(task):
+    _LOOP_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        exc = task.exception()
+        logger.error(
+            "[FOCUS] Background task %s failed: %s", task.get_name(), exc,
+            exc_info=(type(exc), exc, exc.__traceback__),
+        )
+
+
+def _run_bg(coro, loop=None):
+    """
+    Fire-and-forget *coro* as a task, keeping a strong reference until it
+    finishes and logging any exception it raises instead of dropping it.
+    With *loop* (from a worker thread) it is scheduled via
+    call_soon_threadsafe; without, on the running loop.
+    """
+    def _schedule():
+        task = (loop or asyncio.get_running_loop()).create_task(coro, name=coro.__qualname__)
+        _LOOP_TASKS.add(task)
+        task.add_done_callback(_log_bg_failure)
+
+    if loop is None:
+        _schedule()
+        return
+    try:
+        loop.call_soon_threadsafe(_schedule)
+    except RuntimeError:
+        coro.close()
+        raise
+
 
 class FocusEngine:
     def __init__(self, trade_manager=None, order_manager=None, discretionary_engine=None):
@@ -29,7 +147,7 @@ class FocusEngine:
         self.telegram_bot = None # Injected by main.py
         
         # Validation Gate & Cooldown Queue (Phase 37 / 43.4)
-        self.pending_signals = {} # {symbol: {signal_data, entry_trigger, invalidation_trigger, timestamp}}
+        self.pending_signals = {} # {symbol: _PendingSignal}
         self.cooldown_signals = {} # Phase 43.4: {symbol: {data, unlock_at}}
         self.monitoring_active = False
         self.monitor_thread = None
@@ -60,20 +178,11 @@ class FocusEngine:
         invalidation_trigger = signal_high * 1.002
 
         # Phase 63: Simplified G11 Fixed Timeout (15 minutes)
-        IST = pytz.timezone('Asia/Kolkata')
-        now_ist = datetime.datetime.now(IST)
-        expires_at = now_ist + datetime.timedelta(minutes=15)
+        expires_at = time.time() + 15 * 60
 
-        self.pending_signals[symbol] = {
-            'data': signal_data,
-            'trigger': entry_trigger,
-            'invalidate': invalidation_trigger,
-            'timestamp': time.time(),
-            'expires_at': expires_at, # Phase 51 dynamic timeout
-            'queued_at': datetime.datetime.now(),  # FIX #5: for stale signal flush at 9:45
-            'correlation_id': signal_data.get('correlation_id'),
-            'last_evaluated_minute': None, # Phase 58: for candle-close validation
-        }
+        self.pending_signals[symbol] = _PendingSignal(
+            signal_data, entry_trigger, invalidation_trigger, expires_at
+        )
         
         # Phase 51 [G8.3]: Trigger immediate cooldown for this symbol in SignalManager
         # This prevents other scanner instances (if parallel) from picking it up
@@ -94,15 +203,13 @@ class FocusEngine:
         FIX #5: Called at 9:45 session boundary.
         Drops any pending signal older than max_age_minutes to prevent stale-price execution.
         """
-        now = datetime.datetime.now()
+        now = time.time()
         stale_keys = []
         for symbol, pending in self.pending_signals.items():
-            queued_at = pending.get('queued_at')
-            if queued_at:
-                age_min = (now - queued_at).total_seconds() / 60
-                if age_min > max_age_minutes:
-                    stale_keys.append(symbol)
-                    logger.info(f"[GATE] FLUSHED stale pending signal {symbol} — age {age_min:.1f}min")
+            age_min = (now - pending.timestamp) / 60
+            if age_min > max_age_minutes:
+                stale_keys.append(symbol)
+                logger.info(f"[GATE] FLUSHED stale pending signal {symbol} — age {age_min:.1f}min")
         for k in stale_keys:
             self.pending_signals.pop(k, None)
 
@@ -211,14 +318,11 @@ class FocusEngine:
         logger.info("[GATE] Validation Monitor Started.")
 
     def _monitor_pending_loop_sync(self, loop: asyncio.AbstractEventLoop):
-        """Fallback sync monitor that dispatches to async via run_coroutine_threadsafe."""
+        """Fallback sync monitor that dispatches to async via _run_on_loop."""
         while self.monitoring_active:
             try:
                 if self.pending_signals:
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.check_pending_signals(self.trade_manager), loop
-                    )
-                    future.result(timeout=30)
+                    _run_on_loop(loop, self.check_pending_signals(self.trade_manager), 30)
                 if self.cooldown_signals:
                     self.flush_pending_signals()
             except Exception as e:
@@ -274,17 +378,16 @@ class FocusEngine:
         
         for symbol, pending in current_pending:
             try:
-                trigger_price = pending['trigger']
-                inval_price = pending['invalidate']
+                trigger_price = pending.trigger
+                inval_price = pending.invalidate
                 
                 # ── PHASE 58: G12 CANDLE-CLOSE VALIDATION ───────────────────
                 use_close = getattr(config, 'P58_G12_USE_CANDLE_CLOSE', False)
-                IST = pytz.timezone('Asia/Kolkata')
-                now_ist = datetime.datetime.now(IST)
                 
                 if use_close:
+                    now_ist = datetime.datetime.now(IST)
                     current_minute = now_ist.replace(second=0, microsecond=0)
-                    last_eval = pending.get('last_evaluated_minute')
+                    last_eval = pending.last_evaluated_minute
                     
                     if last_eval is not None and current_minute <= last_eval:
                         continue # Already evaluated this minute boundary
@@ -310,7 +413,7 @@ class FocusEngine:
                             continue # Wait for Fyers to post the candle
                         
                         ltp = last_candle[4]
-                        pending['last_evaluated_minute'] = current_minute
+                        pending.last_evaluated_minute = current_minute
                         
                         logger.info(f"[GATE] {symbol} Minute-End Close: ₹{ltp} (Trigger: ₹{trigger_price}, Inval: ₹{inval_price})")
                     else:
@@ -329,18 +432,18 @@ class FocusEngine:
                         resp = await asyncio.to_thread(self.fyers.quotes, data=data)
                         if 'd' not in resp or not resp['d']: continue
                         ltp = resp['d'][0]['v']['lp']
-                timestamp = pending['timestamp']
+                timestamp = pending.timestamp
 
                 def _queue_validation_update(outcome, details=None):
-                    correlation_id = pending.get('correlation_id')
+                    correlation_id = pending.correlation_id
                     if not correlation_id:
                         return
                     if self.telegram_bot and hasattr(self.telegram_bot, 'queue_signal_validation_update'):
                         # None message_id is expected on very fast validations; bot falls back
                         # to a fresh message when discovery send has not completed yet.
-                        asyncio.create_task(self.telegram_bot.queue_signal_validation_update(
+                        _run_bg(self.telegram_bot.queue_signal_validation_update(
                             correlation_id=correlation_id,
-                            signal=pending['data'],
+                            signal=pending.data,
                             outcome=outcome,
                             details=details or {}
                         ))
@@ -362,19 +465,19 @@ class FocusEngine:
                             
                             if spread_pct > 0.004:
                                 logger.warning(f"⚠️ [WIDE SPREAD] {symbol} spread {spread_pct:.4f} > 0.004 | Downgraded to CAUTIOUS")
-                                pending['data']['execution_mode'] = 'CAUTIOUS'
+                                pending.data['execution_mode'] = 'CAUTIOUS'
                             else:
-                                pending['data']['execution_mode'] = pending['data'].get('execution_mode', 'NORMAL')
+                                pending.data['execution_mode'] = pending.data.get('execution_mode', 'NORMAL')
                     except Exception as e:
                         logger.warning(f"G10 Spread check failed (non-fatal) for {symbol}: {e}")
 
                     # G10.2: Entry Price = signal_low - 1 tick
-                    tick_size = pending['data'].get('tick_size', 0.05)
+                    tick_size = pending.data.get('tick_size', 0.05)
                     adjusted_entry = trigger_price - tick_size
-                    pending['data']['adjusted_entry'] = adjusted_entry
+                    pending.data['adjusted_entry'] = adjusted_entry
 
                     # ── G10-G12 Recording ──────────────────────────────
-                    _gr = pending.get('data', {}).get('_gate_result')
+                    _gr = pending.data.get('_gate_result')
                     if _gr is not None:
                         _gr.g10_pass  = True
                         _gr.g11_pass  = True   # Will re-evaluate below
@@ -387,7 +490,7 @@ class FocusEngine:
                             'reason': 'GATE12_TRIGGER_BROKEN',
                             'trigger_price': trigger_price,
                             'ltp': ltp,
-                            'entry_price': pending['data'].get('adjusted_entry')
+                            'entry_price': pending.data.get('adjusted_entry')
                         }
                     )
 
@@ -411,7 +514,7 @@ class FocusEngine:
                                 f"**Action: Auto-Trade OFF 🛑**\n\n"
                                 f"Enable with `/auto on` for NEXT signal."
                             )
-                            asyncio.create_task(self.telegram_bot.send_alert(msg))
+                            _run_bg(self.telegram_bot.send_alert(msg))
                         del self.pending_signals[symbol]
                         continue
 
@@ -437,8 +540,8 @@ class FocusEngine:
 
                         # Send same-format signal alert but with NOT TAKEN footer
                         if self.telegram_bot:
-                            sig_data = pending.get('data', {})
-                            asyncio.create_task(self.telegram_bot.send_alert(
+                            sig_data = pending.data
+                            _run_bg(self.telegram_bot.send_alert(
                                 f"📊 **SIGNAL PASSED — NOT TAKEN**\n\n"
                                 f"Symbol:   `{symbol}`\n"
                                 f"Trigger:  ₹{trigger_price} → LTP ₹{ltp}\n"
@@ -473,7 +576,7 @@ class FocusEngine:
                             # Don't delete from pending — keep monitoring
                             # (cooldown protects execution but not observation)
                             if self.telegram_bot:
-                                asyncio.create_task(self.telegram_bot.send_alert(
+                                _run_bg(self.telegram_bot.send_alert(
                                     f"⏳ **SIGNAL PASSED — COOLDOWN ACTIVE**\n\n"
                                     f"Symbol: `{symbol}`\n"
                                     f"Trigger: ₹{trigger_price} → LTP ₹{ltp}\n"
@@ -507,7 +610,7 @@ class FocusEngine:
                             "This is a startup initialization failure.", symbol
                         )
                         if self.telegram_bot:
-                            asyncio.create_task(self.telegram_bot.send_alert(
+                            _run_bg(self.telegram_bot.send_alert(
                                 f"🚨 CRITICAL: OrderManager not initialized. "
                                 f"Order for {symbol} BLOCKED. Check startup init chain."
                             ))
@@ -526,7 +629,7 @@ class FocusEngine:
                                 f"signal visible but not executed"
                             )
                             if self.telegram_bot:
-                                asyncio.create_task(self.telegram_bot.send_alert(
+                                _run_bg(self.telegram_bot.send_alert(
                                     f"⏳ *EXEC COOLDOWN ACTIVE*\n\n"
                                     f"Symbol: `{symbol}`\n"
                                     f"Trigger broke @ ₹{ltp:.2f}\n"
@@ -537,12 +640,12 @@ class FocusEngine:
                             continue
                     # ────────────────────────────────────────────────────────────────
 
-                    pos = await self.order_manager.enter_position(pending['data'])
+                    pos = await self.order_manager.enter_position(pending.data)
                     logger.info(f"[DEBUG] enter_position returned type={type(pos)} value={pos}")
 
                     if pos and isinstance(pos, dict):
                         try:
-                            signal_data = pending.get('data', {})
+                            signal_data = pending.data
                             if analyzer and hasattr(analyzer, 'signal_manager'):
                                 sl      = signal_data.get('stop_loss', 0.0)
                                 pattern = signal_data.get('pattern', '')
@@ -562,7 +665,7 @@ class FocusEngine:
                     else:
                         logger.warning(f"⚠️ [EXECUTION FAILED] {symbol} — enter_position returned: {pos}")
                         if self.telegram_bot:
-                            asyncio.create_task(self.telegram_bot.send_alert(
+                            _run_bg(self.telegram_bot.send_alert(
                                 f"⚠️ ORDER FAILED: {symbol} — broker returned {pos}\n"
                                 f"⏳ 15-min execution cooldown set."
                             ))
@@ -578,8 +681,9 @@ class FocusEngine:
                     continue
                 
                 # C. TIMEOUT (Phase 51 G11: Dynamic expires_at)
-                elif datetime.datetime.now(pytz.timezone('Asia/Kolkata')) > pending.get('expires_at', datetime.datetime.now(pytz.timezone('Asia/Kolkata')) + datetime.timedelta(minutes=15)):
-                    logger.info(f"⌛ [TIMEOUT] {symbol} expired at {pending.get('expires_at')}")
+                elif time.time() > pending.expires_at:
+                    expired_at = datetime.datetime.fromtimestamp(pending.expires_at, IST)
+                    logger.info(f"⌛ [TIMEOUT] {symbol} expired at {expired_at.isoformat(timespec='seconds')}")
                     _queue_validation_update(outcome='TIMEOUT', details={'reason': 'G11_DYNAMIC_TIMEOUT'})
                     del self.pending_signals[symbol]
                     continue
@@ -592,7 +696,7 @@ class FocusEngine:
                 logger.error(f"Validation Check Error {symbol}: {e}")
                 # FIX #3: Alert on execution error instead of silent swallow
                 if self.telegram_bot:
-                    asyncio.create_task(self.telegram_bot.send_alert(
+                    _run_bg(self.telegram_bot.send_alert(
                         f"🔴 EXECUTION ERROR {symbol}: {e}"
                     ))
         
@@ -769,9 +873,9 @@ class FocusEngine:
                     
                     # Phase 52: monitor_hard_stop_status is async — dispatch correctly from sync thread
                     if self._event_loop:
-                        asyncio.run_coroutine_threadsafe(
+                        _run_bg(
                             self.order_manager.monitor_hard_stop_status(symbol),
-                            self._event_loop
+                            self._event_loop,
                         )
 
                 # ── PHASE 99: MANUAL OVERRIDE CHECK ──
@@ -788,12 +892,12 @@ class FocusEngine:
                         if hold_duration >= config.MAX_HOLD_TIME_MINUTES:
                             logger.warning(f"⏰ [TIME_STOP] {symbol} held for {hold_duration:.1f} mins > {config.MAX_HOLD_TIME_MINUTES} mins limit. Exiting.")
                             if self._event_loop:
-                                future = asyncio.run_coroutine_threadsafe(
-                                    self.order_manager.safe_exit(symbol, "TIME_STOP"),
-                                    self._event_loop
-                                )
                                 try:
-                                    future.result(timeout=15)
+                                    _run_on_loop(
+                                        self._event_loop,
+                                        self.order_manager.safe_exit(symbol, "TIME_STOP"),
+                                        15,
+                                    )
                                 except Exception as ts_err:
                                     logger.error(f"[TIME_STOP] safe_exit failed for {symbol}: {ts_err}")
                             self.stop_focus("TIME_STOP")
@@ -804,12 +908,12 @@ class FocusEngine:
                 if now.hour == 15 and now.minute >= 10:
                     logger.warning(f"⏰ [EOD] Force Closing {symbol} at 15:10")
                     if self.order_manager and self._event_loop:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.order_manager.safe_exit(symbol, "EOD_SQUARE_OFF"),
-                            self._event_loop
-                        )
                         try:
-                            result = future.result(timeout=30)
+                            result = _run_on_loop(
+                                self._event_loop,
+                                self.order_manager.safe_exit(symbol, "EOD_SQUARE_OFF"),
+                                30,
+                            )
                             logger.info(f"[EOD] safe_exit completed for {symbol}: success={result}")
                         except Exception as eod_err:
                             logger.error(f"[EOD] safe_exit failed for {symbol}: {eod_err}")
@@ -913,7 +1017,8 @@ class FocusEngine:
 
                             if self.order_manager and self._event_loop:
                                 try:
-                                    future = asyncio.run_coroutine_threadsafe(
+                                    _run_on_loop(
+                                        self._event_loop,
                                         self.order_manager._finalize_closed_position(
                                             symbol=symbol,
                                             reason='MANUAL_CLOSE_DETECTED',
@@ -921,20 +1026,19 @@ class FocusEngine:
                                             pnl=pnl,
                                             send_alert=True
                                         ),
-                                        self._event_loop
+                                        10,
                                     )
-                                    future.result(timeout=10)
                                 except Exception as e:
                                     logger.error(f"[FOCUS] _finalize_closed_position failed: {e}")
                                     # Fallback: release capital directly
                                     if self.order_manager.capital:
-                                        asyncio.run_coroutine_threadsafe(
+                                        _run_bg(
                                             self.order_manager.capital.release_slot(broker=self.order_manager.broker),
-                                            self._event_loop
+                                            self._event_loop,
                                         )
 
                             if self.telegram_bot and self._event_loop:
-                                asyncio.run_coroutine_threadsafe(
+                                _run_bg(
                                     self.telegram_bot.send_alert(
                                         f"👻 **MANUAL CLOSE DETECTED**\n\n"
                                         f"Symbol: `{symbol}`\n"
@@ -944,7 +1048,7 @@ class FocusEngine:
                                         f"✅ Capital slot released.\n"
                                         f"✅ Bot state synced."
                                     ),
-                                    self._event_loop
+                                    self._event_loop,
                                 )
 
                             self.stop_focus("MANUAL_CLOSE")
@@ -972,11 +1076,11 @@ class FocusEngine:
                     sl_moved = False
                     if self.order_manager and self._event_loop:
                         try:
-                            future = asyncio.run_coroutine_threadsafe(
+                            sl_moved = _run_on_loop(
+                                self._event_loop,
                                 self.order_manager.move_hard_stop(symbol, new_sl),
-                                self._event_loop
+                                10,
                             )
-                            sl_moved = future.result(timeout=10)
                         except Exception as be_err:
                             logger.error(f"[PROTECTION] move_hard_stop failed for {symbol}: {be_err}")
                     
@@ -999,9 +1103,9 @@ class FocusEngine:
                                 f"❌ Broker rejected modification.\n"
                                 f"_Original SL still active. Monitor manually._"
                             )
-                        asyncio.run_coroutine_threadsafe(
+                        _run_bg(
                             self.telegram_bot.send_alert(msg),
-                            self._event_loop
+                            self._event_loop,
                         )
                 
                 # ── PHASE 98: HYBRID VWAP 50% SCALE-OUT (TP 1) ────────────────────
@@ -1015,13 +1119,13 @@ class FocusEngine:
                     if _tp_hit:
                         logger.info(f"🎯 [TP] {symbol} hit ₹{t['tp']:.2f} — closing 100% ({t['remaining_qty']} shares)")
                         if self.order_manager and self._event_loop:
-                            future = asyncio.run_coroutine_threadsafe(
-                                self.order_manager.safe_exit(symbol, "TP_HIT"),
-                                self._event_loop
-                            )
                             # Wait for safe_exit to complete (max 30s) to ensure capital is released
                             try:
-                                result = future.result(timeout=30)
+                                result = _run_on_loop(
+                                    self._event_loop,
+                                    self.order_manager.safe_exit(symbol, "TP_HIT"),
+                                    30,
+                                )
                                 logger.info(f"[TP] safe_exit completed for {symbol}: success={result}")
                             except Exception as tp_exit_err:
                                 logger.error(f"[TP] safe_exit failed/timed out for {symbol}: {tp_exit_err}")
@@ -1038,12 +1142,12 @@ class FocusEngine:
                         decision = self.discretionary_engine.evaluate_soft_stop(symbol, t)
                         if decision == 'EXIT':
                             if self.order_manager and self._event_loop:
-                                future = asyncio.run_coroutine_threadsafe(
-                                    self.order_manager.safe_exit(symbol, "SOFT_STOP"),
-                                    self._event_loop
-                                )
                                 try:
-                                    result = future.result(timeout=30)
+                                    result = _run_on_loop(
+                                        self._event_loop,
+                                        self.order_manager.safe_exit(symbol, "SOFT_STOP"),
+                                        30,
+                                    )
                                     logger.info(f"[SOFT_STOP] safe_exit completed for {symbol}: success={result}")
                                 except Exception as ss_err:
                                     logger.error(f"[SOFT_STOP] safe_exit failed for {symbol}: {ss_err}")
@@ -1116,4 +1220,5 @@ class FocusEngine:
         )
         
         # Send using thread-safe wrapper
-        asyncio.create_task(self.telegram_bot.send_alert(msg))
+        if self._event_loop:
+            _run_bg(self.telegram_bot.send_alert(msg), self._event_loop)
@@ -30,9 +30,10 @@ from collections import deque, defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 from enum import Enum
-from typing import Optional, Dict, List, Any, Callable, Set
+from typing import Optional, Dict, List, Any, Callable, Iterable, Set
 import time
 import threading
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +167,11 @@ class Candle:
     low: float
     close: float
     volume: float
-    datetime: datetime
+
+    @property
+    def datetime(self):
+        """Local start time of the candle, derived from *epoch* only when asked for."""
+        return datetime.fromtimestamp(self.epoch)
 
 
 class MinuteCandleAggregator:
@@ -174,6 +179,8 @@ class MinuteCandleAggregator:
     Aggregates raw WebSocket ticks into 1-minute OHLCV candles.
     Maintains a rolling buffer for the Analyzer to consume.
     """
+    VWAP_RING_SIZE = 60  # 1 hour of finalized-candle VWAPs
+
     def __init__(self, max_candles: int = 500):
         self.max_candles = max_candles
         self.history: Dict[str, deque[Candle]] = {}  # symbol -> deque[Candle]
@@ -181,7 +188,11 @@ class MinuteCandleAggregator:
         self.minute_start_volume: Dict[str, float] = {} # symbol -> volume at start of current minute
         
         # Phase 88: Real-time Slope Metrics
-        self.vwap_history: Dict[str, deque[float]] = {} # symbol -> deque[float] (VWAP values)
+        # symbol -> ring of the last VWAP_RING_SIZE finalized-candle VWAPs,
+        # plus the running count of values written (next slot = count % size)
+        self.vwap_history: Dict[str, np.ndarray] = {}
+        self._vwap_count: Dict[str, int] = {}
+        self._vwap_cum: Dict[str, tuple] = {}  # symbol -> (utc_day, cum_pv, cum_v) session running sums
         self._lock = threading.Lock()
 
     def update(self, tick: TickData, timestamp: Optional[float] = None):
@@ -217,16 +228,22 @@ class MinuteCandleAggregator:
 
                 # Phase 88: Update rolling VWAP history for slope calculation
                 if current:
-                    if symbol not in self.vwap_history:
-                        self.vwap_history[symbol] = deque(maxlen=60) # Store 1 hour of VWAPs
-                    
-                    # Calculate VWAP for the finalized candle
+                    ring = self.vwap_history.get(symbol)
+                    if ring is None:
+                        ring = self.vwap_history[symbol] = np.empty(self.VWAP_RING_SIZE)
+
+                    # Session VWAP at the finalized candle, O(1) from running sums
                     tp = (current.high + current.low + current.close) / 3
-                    # Simplified rolling VWAP if weight is not available, but ideally we use incremental
-                    # For slope, we just need the series of VWAP values or Close prices.
-                    # We'll use finalized candle close as the VWAP proxy for now if full calculation is too heavy,
-                    # but aggregator has volume, so let's do it right.
-                    self.vwap_history[symbol].append(current.close) 
+                    day = current.epoch // 86400
+                    prev_day, cum_pv, cum_v = self._vwap_cum.get(symbol, (day, 0.0, 0.0))
+                    if prev_day != day:
+                        cum_pv, cum_v = 0.0, 0.0
+                    cum_pv += tp * current.volume
+                    cum_v += current.volume
+                    self._vwap_cum[symbol] = (day, cum_pv, cum_v)
+                    count = self._vwap_count.get(symbol, 0)
+                    ring[count % self.VWAP_RING_SIZE] = cum_pv / cum_v if cum_v > 0 else tp
+                    self._vwap_count[symbol] = count + 1
 
                 new_candle = Candle(
                     symbol=symbol,
@@ -236,7 +253,6 @@ class MinuteCandleAggregator:
                     low=tick.ltp,
                     close=tick.ltp,
                     volume=0, # First tick of the minute
-                    datetime=datetime.fromtimestamp(minute_start)
                 )
                 self.current_candles[symbol] = new_candle
 
@@ -259,10 +275,10 @@ class MinuteCandleAggregator:
         Phase 88: Calculate Slope on-the-fly from memory cache.
         Returns Normalized Linear Regression Slope (dy/dx).
         """
-        import numpy as np
         with self._lock:
-            history = self.vwap_history.get(symbol)
-            if not history or len(history) < window:
+            ring = self.vwap_history.get(symbol)
+            count = self._vwap_count.get(symbol, 0)
+            if ring is None or min(count, self.VWAP_RING_SIZE) < window:
                 # Fallback: calculate from Candle history if vwap_history not yet primed
                 candles = list(self.history.get(symbol, []))
                 current = self.current_candles.get(symbol)
@@ -272,7 +288,8 @@ class MinuteCandleAggregator:
                 
                 y = np.array([c.close for c in candles[-window:]])
             else:
-                y = np.array(list(history)[-window:])
+                # Last *window* values in write order, read straight off the ring
+                y = ring[np.arange(count - window, count) % self.VWAP_RING_SIZE]
             
             x = np.arange(len(y))
             if len(y) < 2: return 0.0
@@ -1033,12 +1050,18 @@ class FyersBrokerInterface:
             self._health_monitor_thread.start()
             logger.info("[WS Cache] Health monitor thread started")
 
-    def get_quote_cache_snapshot(self) -> dict[str, dict]:
+    def get_quote_cache_snapshot(self, symbols: Optional[Iterable[str]] = None) -> dict[str, dict]:
         """
         Returns a shallow copy of the current quote cache.
         Called by scanner.scan_market() — thread-safe.
+        With *symbols*, only those entries are copied (analyzer per-cycle lookups).
         """
         with self._quote_cache_lock:
+            if symbols is not None:
+                cache = self._quote_cache
+                items = [(sym, cache[sym]) for sym in symbols if sym in cache]
+            else:
+                items = self._quote_cache.items()
             return {
                 symbol: {
                     'ltp': entry.last_price,
@@ -1054,7 +1077,7 @@ class FyersBrokerInterface:
                     'source': entry.source.value,
                     'tick_count': entry.tick_count,
                 }
-                for symbol, entry in self._quote_cache.items()
+                for symbol, entry in items
             }
 
     def seed_from_rest(self, symbols: List[str]) -> int:
@@ -131,7 +131,7 @@ class FyersConnect:
 
         try:
             webbrowser.open(auth_url)
-        except:
+        except Exception:
             pass
 
         auth_code_raw = input("👉 Paste the Auth Code (or complete redirect URL) here: ").strip()
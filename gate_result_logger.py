@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import asyncio
 import asyncpg
+import concurrent.futures
 import datetime
 import logging
 import os
@@ -92,8 +93,15 @@ class GateResultLogger:
         # Periodic flush state
         self._flushed_count: int = 0        # Records already inserted into DB
         self._unsaved_count: int = 0        # Records since last flush trigger
-        self._flush_lock = threading.Lock() # Prevents concurrent flushes
         self._db_dsn: Optional[str] = None  # Set once by main.py after DB init
+        # All DB flushes run one at a time on a dedicated loop thread over one
+        # long-lived connection, so the prepared INSERT is reused across flushes.
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_loop_lock = threading.Lock()
+        self._flush_future: Optional[concurrent.futures.Future] = None
+        self._flush_conn: Optional[asyncpg.Connection] = None
+        # Serialises _flush_batch on the flush loop; created there on first use.
+        self._flush_lock: Optional[asyncio.Lock] = None
 
         # Suppression state: key -> (last_logged_ts, count_since_last_log)
         # key = (symbol, first_fail_gate, reason_category)
@@ -164,21 +172,22 @@ class GateResultLogger:
 
         if self._unsaved_count >= 100 and self._db_dsn:
             self._unsaved_count = 0
-            t = threading.Thread(
-                target=self._periodic_flush_sync,
-                daemon=True,
-                name="GateResultPeriodicFlush",
-            )
-            t.start()
-
-    def _periodic_flush_sync(self) -> None:
-        """Runs in a background thread. Creates its own event loop."""
-        if not self._flush_lock.acquire(blocking=False):
-            return   # Another flush already running — skip this cycle
-        try:
-            asyncio.run(self._flush_batch())
-        finally:
-            self._flush_lock.release()
+            if self._flush_future is None or self._flush_future.done():
+                self._flush_future = self._submit_flush()
+            # else: a flush is already running — it or the next trigger picks these up
+
+    def _submit_flush(self) -> concurrent.futures.Future:
+        """Schedule _flush_batch() on the flush loop thread (started on first use)."""
+        with self._flush_loop_lock:
+            if self._flush_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    daemon=True,
+                    name="GateResultPeriodicFlush",
+                ).start()
+                self._flush_loop = loop
+        return asyncio.run_coroutine_threadsafe(self._flush_batch(), self._flush_loop)
 
     def _emit_log(self, gr: GateResult, force: bool = False) -> None:
         """Emit the structured log line for this gate result."""
@@ -260,20 +269,26 @@ class GateResultLogger:
         os.makedirs("logs", exist_ok=True)
         path = f"logs/rejections_{session_date.strftime('%Y%m%d')}.log"
 
-        # Aggregate stats
-        total_scans   = max((r.scan_id for r in self._records), default=0)
+        # Aggregate stats and per-symbol breakdown in one pass
+        total_scans   = 0
         total_evals   = len(self._records)
-        signals_fired = sum(1 for r in self._records if r.verdict == "SIGNAL_FIRED")
-
-        # Per symbol breakdown
+        signals_fired = 0
         by_symbol: Dict[str, Dict[str, int]] = {}
+        sym_totals: Dict[str, int] = {}
         tier_counts: Dict[str, int] = {}
         for r in self._records:
+            if r.scan_id > total_scans:
+                total_scans = r.scan_id
+            if r.verdict == "SIGNAL_FIRED":
+                signals_fired += 1
+
             sym = r.symbol
-            if sym not in by_symbol:
-                by_symbol[sym] = {}
+            gates = by_symbol.get(sym)
+            if gates is None:
+                gates = by_symbol[sym] = {}
             gate = r.first_fail_gate or r.verdict
-            by_symbol[sym][gate] = by_symbol[sym].get(gate, 0) + 1
+            gates[gate] = gates.get(gate, 0) + 1
+            sym_totals[sym] = sym_totals.get(sym, 0) + 1
 
             tier = r.data_tier or "UNKNOWN"
             tier_counts[tier] = tier_counts.get(tier, 0) + 1
@@ -292,8 +307,8 @@ class GateResultLogger:
         ]
 
         # Sort symbols by total evaluation count desc
-        for sym, gates in sorted(by_symbol.items(), key=lambda x: sum(x[1].values()), reverse=True):
-            total_sym = sum(gates.values())
+        for sym, gates in sorted(by_symbol.items(), key=lambda x: sym_totals[x[0]], reverse=True):
+            total_sym = sym_totals[sym]
             lines.append(f"{sym.replace('NSE:', '').replace('-EQ', '')} (seen {total_sym} times)")
             for gate, count in sorted(gates.items(), key=lambda x: x[1], reverse=True):
                 pct = count / total_sym * 100
@@ -311,7 +326,7 @@ class GateResultLogger:
             )
         for sym, gates in by_symbol.items():
             for gate, count in gates.items():
-                if count == sum(gates.values()) and count >= 5:
+                if count == sym_totals[sym] and count >= 5:
                     lines.append(
                         f"  ⚠️  {gate} failed 100% of the time for {sym.replace('NSE:', '').replace('-EQ', '')}"
                     )
@@ -445,45 +460,55 @@ class GateResultLogger:
             logger.debug("[GateResultLogger] No DSN set — flush skipped.")
             return 0
 
-        pending = self._records[self._flushed_count:]
-        if not pending:
-            return 0
+        # Coroutines on one loop still interleave at every await: without the
+        # lock two flushes would read the same cursor, insert the same rows
+        # and share (or close) the same connection.
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            pending = self._records[self._flushed_count:]
+            if not pending:
+                return 0
 
-        raw_rows  = self.buildrows(pending)
-        safe_rows = [self._sanitize_row(r) for r in raw_rows]   # PRD-3: sanitize before insert
+            raw_rows  = self.buildrows(pending)
+            safe_rows = [self._sanitize_row(r) for r in raw_rows]   # PRD-3: sanitize before insert
 
-        conn = None
-        try:
-            conn = await asyncpg.connect(self._db_dsn)
-            await conn.executemany(self._INSERT_SQL, safe_rows)
-            self._flushed_count += len(safe_rows)
-            logger.info(
-                f"[GateResultLogger] GATE FLUSH: {len(safe_rows)} records saved "
-                f"(session total: {self._flushed_count})"
-            )
-            return len(safe_rows)
-
-        except Exception as e:
-            logger.error(
-                f"[GateResultLogger] GATE FLUSH ERROR: {e} — "
-                f"writing {len(safe_rows)} records to JSON fallback"
-            )
-            # PRD-3: Never lose data — write to JSONL fallback file
-            await self._flush_to_json_fallback(pending)
-            # We DON'T increment _flushed_count because reimport script will handle these,
-            # but usually we'd want to skip them for subsequent flushes in-memory.
-            # However, logic in _flush_batch is [self._flushed_count:]. 
-            # If we don't increment, we'll try to re-flush them to DB later.
-            # Better to increment and let JSON fallback be the primary record.
-            self._flushed_count += len(safe_rows)
-            return 0
+            try:
+                conn = self._flush_conn
+                if conn is None or conn.is_closed():
+                    conn = self._flush_conn = await asyncpg.connect(self._db_dsn)
+                await conn.executemany(self._INSERT_SQL, safe_rows)
+                self._flushed_count += len(safe_rows)
+                logger.info(
+                    f"[GateResultLogger] GATE FLUSH: {len(safe_rows)} records saved "
+                    f"(session total: {self._flushed_count})"
+                )
+                return len(safe_rows)
 
-        finally:
-            if conn:
-                try:
-                    await conn.close()
-                except Exception:
-                    pass
+            except Exception as e:
+                logger.error(
+                    f"[GateResultLogger] GATE FLUSH ERROR: {e} — "
+                    f"writing {len(safe_rows)} records to JSON fallback"
+                )
+                # PRD-3: Never lose data — write to JSONL fallback file
+                await self._flush_to_json_fallback(pending)
+                # We DON'T increment _flushed_count because reimport script will handle these,
+                # but usually we'd want to skip them for subsequent flushes in-memory.
+                # However, logic in _flush_batch is [self._flushed_count:]. 
+                # If we don't increment, we'll try to re-flush them to DB later.
+                # Better to increment and let JSON fallback be the primary record.
+                self._flushed_count += len(safe_rows)
+                await self._drop_flush_conn()
+                return 0
+
+    async def _drop_flush_conn(self) -> None:
+        """Discard the flush connection after an error; the next flush reconnects."""
+        conn, self._flush_conn = self._flush_conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
 
     async def _flush_to_json_fallback(self, records: list) -> None:
         """
@@ -534,9 +559,20 @@ class GateResultLogger:
         """
         EOD flush — inserts whatever periodic flush missed.
         db_manager is accepted for backward-compat but not used;
-        _flush_batch() opens its own connection via DSN.
+        the flush runs on the flush loop's own DSN connection. It first waits
+        for any periodic flush still in progress, and _flush_batch holds a
+        lock, so the two never insert the same rows.
         """
-        flushed = await self._flush_batch()
+        if not self._db_dsn:
+            flushed = await self._flush_batch()   # logs and skips
+        else:
+            running = self._flush_future
+            if running is not None and not running.done():
+                try:
+                    await asyncio.wrap_future(running)
+                except Exception as e:
+                    logger.warning(f"[GateResultLogger] Periodic flush failed before EOD flush: {e}")
+            flushed = await asyncio.wrap_future(self._submit_flush())
         if flushed == 0 and self._flushed_count == 0:
             logger.info("[GateResultLogger] No gate results to flush.")
         else:
@@ -564,14 +600,17 @@ def _to_num(val) -> Optional[float]:
 # ================================================================
 
 _gate_result_logger: Optional[GateResultLogger] = None
+_gate_result_logger_lock = threading.Lock()
 
 
 def get_gate_result_logger() -> GateResultLogger:
     """Returns (or creates) the session-scoped singleton."""
     global _gate_result_logger
     if _gate_result_logger is None:
-        _gate_result_logger = GateResultLogger()
-        logger.info("[GateResultLogger] Singleton created for this session.")
+        with _gate_result_logger_lock:
+            if _gate_result_logger is None:
+                _gate_result_logger = GateResultLogger()
+                logger.info("[GateResultLogger] Singleton created for this session.")
     return _gate_result_logger
 
 
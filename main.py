@@ -13,19 +13,28 @@ import time
 from typing import Any, Callable, Optional
 
 import config
+import pandas as pd
 import pytz
 
-from analyzer import FyersAnalyzer
+try:
+    import uvloop
+except ImportError:  # optional: stock asyncio loop is used instead
+    uvloop = None
+
+from analyzer import FyersAnalyzer, get_signal_logger
+from ml_logger import get_ml_logger
 from capital_manager import CapitalManager
-from database import DatabaseManager
+from database import DB_CONFIG, DatabaseManager, get_db_manager
 from eod_analyzer import EODAnalyzer
 from eod_scheduler import eod_scheduler
 from eod_watchdog import eod_watchdog
 from focus_engine import FocusEngine
 from fyers_broker_interface import FyersBrokerInterface
 from fyers_connect import FyersConnect
+from gate_result_logger import get_gate_result_logger
 from market_session import MarketSession
 from market_utils import is_market_hours
+from order_manager import OrderManager
 from reconciliation import ReconciliationEngine
 from scanner import FyersScanner
 from startup_recovery import StartupRecovery
@@ -70,6 +79,14 @@ def _configure_logging() -> None:
     )
     
 
+def _configure_pandas() -> None:
+    # Copy-on-Write lets the scan path share pre-fetched candle frames
+    # without defensive copies: a column write only copies that block.
+    # pandas >= 3.0 always runs CoW and deprecates the option.
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
 def _install_signal_handlers(loop: asyncio.AbstractEventLoop, shutdown_event: asyncio.Event):
     def _handler(signum: Optional[int] = None, frame: Optional[Any] = None):
         logger.warning("[SUPERVISOR] Shutdown signal received: %s", signum)
@@ -185,18 +202,14 @@ async def _initialize_runtime() -> RuntimeContext:
     mh = morning_context["high"] if morning_context else None
     ml = morning_context["low"] if morning_context else None
 
-    db_manager = DatabaseManager()
-    await db_manager.initialize()
+    db_manager = get_db_manager()
 
     # PRD-008: Enable periodic gate result flush — set DSN once after DB pool is ready
-    from gate_result_logger import get_gate_result_logger
-    from database import DB_CONFIG as _db_cfg
-    import os as _os
     _db_dsn = (
-        f"postgresql://{_os.getenv('DB_USER', _db_cfg['user'])}"
-        f":{_os.getenv('DB_PASS', _os.getenv('DB_PASSWORD', _db_cfg['password']))}"
-        f"@{_os.getenv('DB_HOST', _db_cfg['host'])}"
-        f":{_db_cfg['port']}/{_db_cfg['database']}"
+        f"postgresql://{os.getenv('DB_USER', DB_CONFIG['user'])}"
+        f":{os.getenv('DB_PASS', os.getenv('DB_PASSWORD', DB_CONFIG['password']))}"
+        f"@{os.getenv('DB_HOST', DB_CONFIG['host'])}"
+        f":{DB_CONFIG['port']}/{DB_CONFIG['database']}"
     )
     get_gate_result_logger().set_dsn(_db_dsn)
 
@@ -206,7 +219,11 @@ async def _initialize_runtime() -> RuntimeContext:
         db_manager=db_manager,
         emergency_logger=None,
     )
-    await broker.initialize()
+    # Pool creation and the broker REST/WebSocket handshake are independent
+    # (the broker only holds the db_manager reference), so overlap them.
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(db_manager.initialize())
+        tg.create_task(broker.initialize())
     # PRD-3: Wire Telegram bot to broker for WS cache alerts
     broker.set_telegram(bot)
 
@@ -304,7 +321,6 @@ async def _initialize_runtime() -> RuntimeContext:
             logger.warning(f"[STARTUP GATE] Could not send Telegram alert: {_e}")
 
     # ── P0 FIX: Construct OrderManager with live broker ──────────────
-    from order_manager import OrderManager
     order_manager = OrderManager(
         broker=broker,
         telegram_bot=bot,
@@ -346,6 +362,7 @@ async def _initialize_runtime() -> RuntimeContext:
         order_manager=order_manager,
         capital_manager=capital_manager,
         telegram=bot,
+        db_manager=db_manager,
     )
     await startup_recovery.scan_orphaned_trades()
 
@@ -367,24 +384,45 @@ async def _initialize_runtime() -> RuntimeContext:
     )
 
 
+async def _send_session_start_messages(ctx: RuntimeContext, auto_activated: bool):
+    """
+    Session-open Telegram messages. The bot starts in a sibling task and
+    sends before it is up are dropped, so wait for it here rather than in
+    the trading loop; if it never comes up, wait_ready has logged why.
+    """
+    if not await ctx.bot.wait_ready(30.0):
+        return
+    try:
+        if auto_activated:
+            await ctx.bot.send_message(
+                "✅ *Auto Mode activated* — market is open, scanning live",
+                parse_mode="Markdown",
+            )
+        await ctx.bot._send_morning_briefing(
+            ws_cache=ctx.broker,
+            market_ctx=ctx.analyzer.market_context if ctx.analyzer else None,
+            startup_validation_passed=True,
+        )
+    except Exception as e:
+        logger.error(f"[TELEGRAM] Session start messages failed: {e}")
+
+
 async def _trading_loop(shutdown_event: asyncio.Event, ctx: RuntimeContext):
+    auto_activated = False
     if getattr(ctx.bot, '_auto_on_queued', False):
         ctx.bot._auto_mode = True
         ctx.bot._auto_on_queued = False
+        auto_activated = True
         logger.info("[AUTO] Queued Auto ON activated — market ready")
         # FIX #5: Flush stale pending signals from pre-market
         if hasattr(ctx, 'focus_engine') and ctx.focus_engine:
             ctx.focus_engine.flush_stale_pending_signals(max_age_minutes=20)
             logger.info("[SESSION] Stale pending signals flushed at session open")
-        await ctx.bot.send_message(
-            "✅ *Auto Mode activated* — market is open, scanning live",
-            parse_mode="Markdown",
-        )
 
-    await ctx.bot._send_morning_briefing(
-        ws_cache=ctx.broker,
-        market_ctx=ctx.analyzer.market_context if ctx.analyzer else None,
-        startup_validation_passed=True,
+    # Scanning does not wait for Telegram to come up. The reference keeps
+    # the task alive for as long as the loop runs.
+    announce_task = asyncio.create_task(
+        _send_session_start_messages(ctx, auto_activated), name="session_start_messages"
     )
 
     logger.info("[TRADING] Trading loop started.")
@@ -452,6 +490,31 @@ async def _trading_loop(shutdown_event: asyncio.Event, ctx: RuntimeContext):
                 "candidate_names": [c["symbol"] for c in candidates] if candidates else []
             }
             
+            # Drop candidates failing the candle-free gates in one pass (one quote
+            # snapshot for the whole cycle) before any history fetch or analysis.
+            if candidates:
+                candidates = await asyncio.to_thread(
+                    ctx.analyzer.prefilter, candidates, _scan_id, _data_tier
+                )
+
+            # Batch-fetch history for candidates the scanner could not pre-fetch
+            # (quality check fail-open) instead of one blocking call per check_setup.
+            missing_history = [
+                c["symbol"] for c in (candidates or []) if c.get("history_df") is None
+            ]
+            if missing_history:
+                fetched = await asyncio.to_thread(
+                    ctx.analyzer.get_history_many, missing_history
+                )
+                for cand in candidates:
+                    if cand.get("history_df") is None:
+                        cand["history_df"] = fetched.get(cand["symbol"])
+
+            # Depth for the candidates that can reach the strategy's circuit /
+            # spread vetoes, fetched concurrently into the analyzer's cache.
+            if candidates:
+                await asyncio.to_thread(ctx.analyzer.prefetch_depth, candidates)
+
             # Phase 89.6: Parallelized Analysis
             async def run_analysis(cand):
                 signal = await asyncio.to_thread(
@@ -463,6 +526,7 @@ async def _trading_loop(shutdown_event: asyncio.Event, ctx: RuntimeContext):
                     cand.get("history_df_15m"),
                     _scan_id,
                     _data_tier,
+                    prefiltered=True,
                 )
                 # Phase 93: Inject the scanner's tick_size into the signal
                 # The symbol master has the correct exchange tick (0.01/0.05/0.10).
@@ -561,6 +625,17 @@ async def _cleanup_runtime(ctx: Optional[RuntimeContext]):
         except Exception as e:
             logger.error(f"[CLEANUP] FocusEngine stop failed: {e}")
 
+    # signals.csv is buffered; the os._exit fallback in main() skips atexit.
+    try:
+        get_signal_logger().flush_and_close()
+    except Exception as e:
+        logger.error(f"[CLEANUP] Signal log flush failed: {e}")
+
+    try:
+        get_ml_logger().flush()
+    except Exception as e:
+        logger.error(f"[CLEANUP] ML checkpoint failed: {e}")
+
     # 1. RecEngine — 10s max
     try:
         await asyncio.wait_for(ctx.reconciliation_engine.stop(), timeout=10.0)
@@ -676,6 +751,7 @@ async def _run_startup_validation(ctx: RuntimeContext) -> None:
 
 async def main() -> int:
     _configure_logging()
+    _configure_pandas()
 
     shutdown_event = asyncio.Event()
     loop = asyncio.get_running_loop()
@@ -737,7 +813,6 @@ async def main() -> int:
 
             # PRD-008: Gate result EOD flush
             try:
-                from gate_result_logger import get_gate_result_logger
                 grl = get_gate_result_logger()
                 summary_path = grl.write_eod_summary()
                 flushed = await grl.flush_to_db(ctx.db_manager)
@@ -838,5 +913,15 @@ async def main() -> int:
         return exit_code
 
 
+def _run(coro) -> int:
+    # uvloop cuts per-callback dispatch cost for the WS/DB/order I/O that all
+    # runs on this one loop. Cross-thread run_coroutine_threadsafe /
+    # call_soon_threadsafe dispatch works the same on it.
+    if uvloop is not None and getattr(config, "USE_UVLOOP", False):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(_run(main()))
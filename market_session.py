@@ -277,7 +277,7 @@ class MarketSession:
         try:
             if self.telegram and MARKET_SESSION_CONFIG.get('telegram_state_transitions'):
                 asyncio.create_task(self.telegram.send_alert(msg))
-        except:
+        except Exception:
             pass
         
     def _send_formatted_msg(self, msg, tag):
@@ -0,0 +1,19 @@
+-- Phase 58: System Event Audit Trail
+-- Backs DatabaseManager.log_event(). Apply this BEFORE deploying that code:
+-- without the table every event flush fails and the buffered events are lost.
+-- Apply: psql -h $DB_HOST -U $DB_USER -d $DB_NAME -f migrations/v58_system_events.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS system_events (
+    id              BIGSERIAL PRIMARY KEY,
+    logged_at       TIMESTAMPTZ NOT NULL,
+    session_date    DATE NOT NULL,
+    event_type      VARCHAR(100) NOT NULL,
+    details         JSONB
+);
+
+CREATE INDEX IF NOT EXISTS idx_system_events_session ON system_events(session_date);
+CREATE INDEX IF NOT EXISTS idx_system_events_type ON system_events(event_type);
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- Phase 59: Lookup Indexes for the Session-Date Queries
+-- Apply: psql -h $DB_HOST -U $DB_USER -d $DB_NAME -f migrations/v59_lookup_indexes.sql
+
+BEGIN;
+
+-- get_today_trades() / EOD analysis: WHERE session_date = $1 [AND state = 'CLOSED']
+CREATE INDEX IF NOT EXISTS idx_positions_session_state ON positions(session_date, state);
+
+-- exchange_order_id is declared UNIQUE, which already builds a unique index
+-- (used by ON CONFLICT (exchange_order_id)). The plain index duplicated it
+-- and was maintained on every order insert for nothing.
+DROP INDEX IF EXISTS idx_orders_exchange_id;
+
+COMMIT;
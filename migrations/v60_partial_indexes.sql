@@ -0,0 +1,29 @@
+-- Phase 60: Partial Indexes for the Closed-Trade and Open-Position Reads
+-- Apply after v59: psql -h $DB_HOST -U $DB_USER -d $DB_NAME -f migrations/v60_partial_indexes.sql
+
+BEGIN;
+
+-- get_today_trades(): WHERE session_date = $1 AND state = 'CLOSED'
+--                     ORDER BY COALESCE(closed_at, opened_at)
+-- Only closed rows are indexed, already in the order the query returns them,
+-- so the EOD read is a short ordered range scan with no sort step.
+CREATE INDEX IF NOT EXISTS idx_positions_closed_session
+    ON positions(session_date, (COALESCE(closed_at, opened_at)))
+    WHERE state = 'CLOSED';
+
+-- Reconciliation poll: SELECT symbol, qty FROM positions WHERE state = 'OPEN'
+-- Covering the selected columns lets it run as an index-only scan. This
+-- replaces idx_positions_open, which indexed only the constant state value.
+CREATE INDEX IF NOT EXISTS idx_positions_open_cover
+    ON positions(symbol) INCLUDE (qty)
+    WHERE state = 'OPEN';
+
+DROP INDEX IF EXISTS idx_positions_open;
+
+-- idx_positions_closed_session serves the CLOSED read that v59's
+-- (session_date, state) index was added for. The remaining session_date-only
+-- read (EOD ghost audit) touches one day of a single-slot book, so the
+-- composite index is not worth its cost on every position write.
+DROP INDEX IF EXISTS idx_positions_session_state;
+
+COMMIT;
@@ -18,7 +18,10 @@ Usage:
 """
 
 import os
+import csv
+import atexit
 import json
+import queue
 import uuid
 import logging
 import datetime
@@ -27,6 +30,13 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from zoneinfo import ZoneInfo
 import pandas as pd
+import config
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # optional: files are read back through pandas instead
+    pa = None
 
 logger = logging.getLogger("MLDataLogger")
 IST = ZoneInfo("Asia/Kolkata")
@@ -104,15 +114,41 @@ FEATURE_COLUMNS = [
     "exit_reason",      # SL_HIT/TP_HIT/EOD_SQUAREOFF/etc.
 ]
 
+# Free-text columns; everything else in the CSV backup is numeric/bool.
+# Read as str so IDs like "12345678" or "1e345678" aren't parsed as numbers.
+CSV_TEXT_COLUMNS = (
+    "obs_id", "schema_version", "date", "time", "timestamp_ist", "symbol",
+    "pattern", "confidence", "pattern_bonus", "confirmations", "nifty_trend",
+    "sector", "time_bucket", "direction", "outcome", "label_source", "exit_reason",
+)
+
+# Basic sector keywords, checked in order — first match wins
+SECTOR_KEYWORDS = (
+    ("BANKING", ("BANK", "FIN", "HDFC", "ICICI", "KOTAK")),
+    ("METAL", ("STEEL", "TATA", "JSW", "JINDAL")),
+    ("PHARMA", ("PHARMA", "SUN", "CIPLA", "DR")),
+    ("IT", ("TECH", "INFY", "TCS", "WIPRO")),
+    ("ENERGY", ("OIL", "RELIANCE", "ONGC", "BPCL")),
+)
+
 class MLDataLogger:
     """
     Production-grade ML data logger.
     Logs observations at signal time, updates outcomes at EOD.
     """
+
+    # Parquet is checkpointed at most this often; the CSV journal is the
+    # per-row durable copy in between.
+    CHECKPOINT_INTERVAL_SEC = 60.0
+    # Journal rows are handed to a writer thread; it writes up to this many
+    # per batch. Producers only block if JOURNAL_QUEUE_SIZE rows are waiting.
+    JOURNAL_BATCH = 256
+    JOURNAL_QUEUE_SIZE = 10000
     
     def __init__(self, data_dir: str = "data/ml", session_date: Optional[str] = None):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.enabled = getattr(config, 'ML_LOGGING_ENABLED', True)
         
         # Daily file path
         self.today = session_date or datetime.datetime.now(IST).date().isoformat()
@@ -121,7 +157,21 @@ class MLDataLogger:
         
         # In-memory buffer for atomic writes
         self._buffer: list = []
+        self._index: Dict[str, dict] = {}   # obs_id -> record in _buffer
         self._lock = threading.Lock()
+        self._sector_cache: Dict[str, str] = {}
+        self._date_ordinal = 0
+        self._date_str = ""
+
+        # CSV backup is an append-only journal: one row per new observation
+        # and one per outcome update. Readers keep the last row per obs_id.
+        # Only the journal writer thread touches the file.
+        self._csv_fh = None
+        self._csv_writer: Optional[csv.DictWriter] = None
+        self._csv_fields: frozenset = frozenset()
+        self._journal_q: queue.Queue = queue.Queue(maxsize=self.JOURNAL_QUEUE_SIZE)
+        self._journal_thread: Optional[threading.Thread] = None
+        self._checkpoint_timer: Optional[threading.Timer] = None
         
         # Load existing data if any
         self._load_existing()
@@ -129,18 +179,62 @@ class MLDataLogger:
         logger.info(f"[ML] Data logger initialized. File: {self.daily_file}")
     
     def _load_existing(self):
-        """Load existing observations for today if file exists."""
-        if self.daily_file.exists():
-            try:
-                df = pd.read_parquet(self.daily_file)
-                self._buffer = [self._normalize_record(r) for r in df.to_dict('records')]
-                logger.info(f"[ML] Loaded {len(self._buffer)} existing observations")
-            except Exception as e:
-                logger.error(f"[ML] Error loading existing data: {e}")
-                # Try backup
-                if self.backup_file.exists():
-                    df = pd.read_csv(self.backup_file)
-                    self._buffer = [self._normalize_record(r) for r in df.to_dict('records')]
+        """
+        Load existing observations for today if any were written. The CSV
+        journal is per-row and so at least as current as the parquet
+        checkpoint; the parquet is the fallback.
+        """
+        try:
+            if self.backup_file.exists():
+                self._set_buffer(self._read_backup())
+            elif self.daily_file.exists():
+                self._set_buffer(self._read_checkpoint())
+            else:
+                return
+            logger.info(f"[ML] Loaded {len(self._buffer)} existing observations")
+        except Exception as e:
+            logger.error(f"[ML] Error loading existing data: {e}")
+            # Try the parquet checkpoint
+            if self.daily_file.exists():
+                self._set_buffer(self._read_checkpoint())
+
+    def _read_checkpoint(self) -> list:
+        """Parquet checkpoint -> records."""
+        if pa is not None:
+            return pa_parquet.read_table(self.daily_file).to_pylist()
+        return self._records(pd.read_parquet(self.daily_file))
+
+    def _read_backup(self) -> list:
+        """
+        CSV journal -> records, keeping the last row per obs_id. With pyarrow
+        the file is parsed straight into Python rows (nulls as None) without
+        building a DataFrame.
+        """
+        if pa is not None:
+            options = pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in CSV_TEXT_COLUMNS},
+                strings_can_be_null=True,
+            )
+            rows = pa_csv.read_csv(self.backup_file, convert_options=options).to_pylist()
+        else:
+            rows = self._records(pd.read_csv(
+                self.backup_file, dtype={col: str for col in CSV_TEXT_COLUMNS}
+            ))
+        latest = {}
+        for row in rows:
+            latest[row["obs_id"]] = row
+        return list(latest.values())
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> list:
+        """DataFrame -> list of dicts with missing values as None."""
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    def _set_buffer(self, records: list):
+        self._buffer = [self._normalize_record(r) for r in records]
+        self._index = {}
+        for r in self._buffer:
+            self._index.setdefault(r["obs_id"], r)   # first match wins, as before
 
     def _normalize_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Backfill new schema fields without rewriting old files on read."""
@@ -157,9 +251,111 @@ class MLDataLogger:
         ordered = FEATURE_COLUMNS + [c for c in df.columns if c not in FEATURE_COLUMNS]
         return df[ordered]
     
+    def _append_log(self, records: list):
+        """
+        Queue rows for the CSV journal; the disk write happens on the
+        journal writer thread. Caller holds self._lock (keeps row order).
+        """
+        if not records:
+            return
+        if self._journal_thread is None:
+            self._journal_thread = threading.Thread(
+                target=self._journal_loop, daemon=True, name="MLJournalWriter"
+            )
+            self._journal_thread.start()
+        for record in records:
+            row = dict(record)   # snapshot: outcome updates mutate the buffered dict
+            try:
+                self._journal_q.put_nowait(row)
+            except queue.Full:
+                logger.warning("[ML] Journal queue full; waiting for the writer")
+                self._journal_q.put(row)
+
+    def _journal_loop(self):
+        q = self._journal_q
+        while True:
+            rows = [q.get()]
+            while len(rows) < self.JOURNAL_BATCH:
+                try:
+                    rows.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_journal(rows)
+            for _ in rows:
+                q.task_done()
+
+    def _write_journal(self, rows: list):
+        """Append *rows* to the CSV journal in one write (writer thread only)."""
+        try:
+            if self._csv_writer is None:
+                fieldnames = None
+                if self.backup_file.exists() and self.backup_file.stat().st_size:
+                    with open(self.backup_file, newline='') as fh:
+                        fieldnames = next(csv.reader(fh), None)
+                new_file = not fieldnames
+                if new_file:
+                    fieldnames = FEATURE_COLUMNS + [k for k in rows[0] if k not in FEATURE_COLUMNS]
+                self._open_journal(fieldnames, write_header=new_file)
+            known = self._csv_fields
+            extra = list(dict.fromkeys(k for row in rows if not row.keys() <= known
+                                       for k in row if k not in known))
+            if extra:
+                self._widen_journal(extra)
+            self._csv_writer.writerows(rows)
+            self._csv_fh.flush()
+        except Exception as e:
+            logger.error(f"[ML] CSV backup error: {e}")
+
+    def _open_journal(self, fieldnames: list, write_header: bool):
+        self._csv_fh = open(self.backup_file, 'a', newline='')
+        self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=fieldnames, extrasaction='ignore')
+        self._csv_fields = frozenset(fieldnames)
+        if write_header:
+            self._csv_writer.writeheader()
+
+    def _widen_journal(self, extra: list):
+        """
+        Rewrite the journal under a header that also carries *extra*. A file
+        started by an older feature set would otherwise have the new columns
+        dropped by extrasaction='ignore'. Old rows get blanks for them.
+        """
+        fieldnames = list(self._csv_writer.fieldnames) + extra
+        logger.warning(
+            f"[ML] Journal {self.backup_file.name} lacks columns {extra}; "
+            f"rewriting it with the wider header"
+        )
+        self._csv_fh.close()
+        self._csv_writer = None
+        tmp = self.backup_file.with_name(self.backup_file.name + '.tmp')
+        with open(self.backup_file, newline='') as src, open(tmp, 'w', newline='') as dst:
+            writer = csv.DictWriter(dst, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(csv.DictReader(src))
+        os.replace(tmp, self.backup_file)
+        self._open_journal(fieldnames, write_header=False)
+
+    def _schedule_save(self):
+        """Arm a one-shot parquet checkpoint unless one is already pending."""
+        with self._lock:
+            if self._checkpoint_timer is None:
+                timer = threading.Timer(self.CHECKPOINT_INTERVAL_SEC, self._save)
+                timer.daemon = True
+                self._checkpoint_timer = timer
+                timer.start()
+
+    def flush(self):
+        """Drain the CSV journal and write the parquet checkpoint now (session close / EOD)."""
+        self._journal_q.join()
+        with self._lock:
+            timer, self._checkpoint_timer = self._checkpoint_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._save()
+
     def _save(self):
-        """Atomic save to parquet + CSV backup."""
+        """Atomic save to parquet (CSV backup is journaled per row)."""
         with self._lock:
+            self._checkpoint_timer = None
             if not self._buffer:
                 return
             
@@ -171,9 +367,6 @@ class MLDataLogger:
                 df.to_parquet(temp_file, index=False)
                 temp_file.replace(self.daily_file)
                 
-                # CSV backup
-                df.to_csv(self.backup_file, index=False)
-                
             except Exception as e:
                 logger.error(f"[ML] Save error: {e}")
     
@@ -182,11 +375,14 @@ class MLDataLogger:
         symbol: str,
         ltp: float,
         features: Dict[str, Any]
-    ) -> str:
+    ) -> Optional[str]:
         """
         Log a new observation when a signal is detected.
-        Returns observation ID for later outcome update.
+        Returns observation ID for later outcome update, or None when ML
+        logging is disabled.
         """
+        if not self.enabled:
+            return None
         obs_id = str(uuid.uuid4())[:8]  # Short unique ID
         now = datetime.datetime.now(IST)
         
@@ -203,8 +399,8 @@ class MLDataLogger:
             # Identifiers
             "obs_id": obs_id,
             "schema_version": SCHEMA_VERSION,
-            "date": now.strftime("%Y-%m-%d"),
-            "time": now.strftime("%H:%M:%S"),
+            "date": self._date_string(now),
+            "time": f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}",
             "timestamp_ist": now.isoformat(timespec="seconds"),
             "symbol": symbol,
             
@@ -267,8 +463,10 @@ class MLDataLogger:
         
         with self._lock:
             self._buffer.append(observation)
+            self._index.setdefault(obs_id, observation)
+            self._append_log([observation])
         
-        self._save()
+        self._schedule_save()
         logger.info(f"[ML] Logged observation {obs_id} for {symbol}")
         
         return obs_id
@@ -289,72 +487,126 @@ class MLDataLogger:
         Update the outcome for an observation (called at EOD or trade close).
         """
         with self._lock:
-            for obs in self._buffer:
-                if obs["obs_id"] == obs_id:
-                    self._normalize_record(obs)
-                    entry = obs["ltp"]
-                    if pnl_pct is None:
-                        # Fallback for old calls without pnl_pct passed
-                        pnl_pct = ((entry - exit_price) / entry) * 100 if entry > 0 else 0
-                    
-                    obs["outcome"] = outcome
-                    obs["exit_price"] = exit_price
-                    obs["max_favorable"] = max_favorable
-                    obs["max_adverse"] = max_adverse
-                    obs["pnl_pct"] = pnl_pct
-                    obs["hold_time_mins"] = hold_time_mins
-                    obs["label_source"] = label_source
-                    obs["exit_reason"] = exit_reason
-                    
-                    logger.info(f"[ML] Updated outcome for {obs_id}: {outcome} ({pnl_pct:.2f}%)")
-                    found = True
-                    break
-            else:
-                found = False
-        
-        self._save()
+            obs = self._index.get(obs_id)
+            found = obs is not None
+            if found:
+                pnl_pct = self._apply_outcome(
+                    obs, outcome, exit_price, max_favorable, max_adverse,
+                    hold_time_mins, pnl_pct, label_source, exit_reason,
+                )
+                self._append_log([obs])
+
+                logger.info(f"[ML] Updated outcome for {obs_id}: {outcome} ({pnl_pct:.2f}%)")
+
+        self._schedule_save()
         if not found:
             logger.warning(f"[ML] Outcome update skipped; obs_id not found: {obs_id}")
         return found
+
+    def update_outcomes(self, updates: list) -> int:
+        """
+        Label many observations at once (EOD ghost audit): one lock hold and
+        one journal write. Each item holds update_outcome() keyword
+        arguments, obs_id included. Returns how many obs_ids were found.
+        """
+        labelled = []
+        missing = []
+        with self._lock:
+            for update in updates:
+                kwargs = dict(update)
+                obs_id = kwargs.pop("obs_id")
+                obs = self._index.get(obs_id)
+                if obs is None:
+                    missing.append(obs_id)
+                    continue
+                self._apply_outcome(obs, **kwargs)
+                labelled.append(obs)
+            self._append_log(labelled)
+
+        if labelled:
+            self._schedule_save()
+            logger.info(f"[ML] Updated outcomes for {len(labelled)} observations")
+        if missing:
+            logger.warning(f"[ML] Outcome update skipped; obs_ids not found: {missing}")
+        return len(labelled)
+
+    def _apply_outcome(
+        self,
+        obs: Dict[str, Any],
+        outcome: str,
+        exit_price: float,
+        max_favorable: float = 0,
+        max_adverse: float = 0,
+        hold_time_mins: int = 0,
+        pnl_pct: Optional[float] = None,
+        label_source: str = "LIVE",
+        exit_reason: Optional[str] = None
+    ) -> float:
+        """Write the label fields onto *obs*; returns pnl_pct. Caller holds self._lock."""
+        self._normalize_record(obs)
+        entry = obs["ltp"]
+        if pnl_pct is None:
+            # Fallback for old calls without pnl_pct passed
+            pnl_pct = ((entry - exit_price) / entry) * 100 if entry > 0 else 0
+
+        obs["outcome"] = outcome
+        obs["exit_price"] = exit_price
+        obs["max_favorable"] = max_favorable
+        obs["max_adverse"] = max_adverse
+        obs["pnl_pct"] = pnl_pct
+        obs["hold_time_mins"] = hold_time_mins
+        obs["label_source"] = label_source
+        obs["exit_reason"] = exit_reason
+        return pnl_pct
     
+    def _date_string(self, now: datetime.datetime) -> str:
+        """YYYY-MM-DD for *now*, formatted once per calendar day."""
+        ordinal = now.toordinal()
+        if ordinal != self._date_ordinal:
+            self._date_str = now.strftime("%Y-%m-%d")
+            self._date_ordinal = ordinal
+        return self._date_str
+
     def _extract_sector(self, symbol: str) -> str:
         """Extract sector from symbol (simplified)."""
         # Could be enhanced with a sector mapping file
-        symbol_clean = symbol.replace("NSE:", "").replace("-EQ", "")
-        
-        # Basic sector keywords
-        if any(x in symbol_clean for x in ["BANK", "FIN", "HDFC", "ICICI", "KOTAK"]):
-            return "BANKING"
-        elif any(x in symbol_clean for x in ["STEEL", "TATA", "JSW", "JINDAL"]):
-            return "METAL"
-        elif any(x in symbol_clean for x in ["PHARMA", "SUN", "CIPLA", "DR"]):
-            return "PHARMA"
-        elif any(x in symbol_clean for x in ["TECH", "INFY", "TCS", "WIPRO"]):
-            return "IT"
-        elif any(x in symbol_clean for x in ["OIL", "RELIANCE", "ONGC", "BPCL"]):
-            return "ENERGY"
-        else:
-            return "OTHER"
+        sector = self._sector_cache.get(symbol)
+        if sector is None:
+            symbol_clean = symbol.replace("NSE:", "").replace("-EQ", "")
+            sector = next(
+                (name for name, keywords in SECTOR_KEYWORDS
+                 if any(x in symbol_clean for x in keywords)),
+                "OTHER",
+            )
+            self._sector_cache[symbol] = sector
+        return sector
     
     
-    def get_unlabeled_observations(self, session_date: Optional[str] = None) -> pd.DataFrame:
-        """Get observations that haven't been labeled yet."""
+    def get_unlabeled_records(self, session_date: Optional[str] = None) -> list:
+        """Copies of the observations that haven't been labeled yet."""
         with self._lock:
-            unlabeled = [
+            return [
                 self._normalize_record(dict(obs))
                 for obs in self._buffer
                 if obs["outcome"] is None and (session_date is None or obs.get("date") == session_date)
             ]
-            return pd.DataFrame(unlabeled)
+
+    def get_unlabeled_observations(self, session_date: Optional[str] = None) -> pd.DataFrame:
+        """Get observations that haven't been labeled yet."""
+        return pd.DataFrame(self.get_unlabeled_records(session_date))
     
 
 
 # Singleton instance
 _ml_logger: Optional[MLDataLogger] = None
+_ml_logger_lock = threading.Lock()
 
 def get_ml_logger() -> MLDataLogger:
     """Get singleton ML logger instance."""
     global _ml_logger
     if _ml_logger is None:
-        _ml_logger = MLDataLogger()
+        with _ml_logger_lock:
+            if _ml_logger is None:
+                _ml_logger = MLDataLogger()
+                atexit.register(_ml_logger.flush)
     return _ml_logger
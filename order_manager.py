@@ -458,9 +458,7 @@ class OrderManager:
             # DB Pool Warmup
             if self.db:
                 try:
-                    pool = await self.db.get_pool()
-                    async with pool.acquire() as conn:
-                        await conn.fetchval("SELECT 1")
+                    await self.db.fetchval_fast("SELECT 1")
                     logger.info("DB Pool warmed up.")
                 except Exception as e:
                     logger.warning(f"DB Pool warmup failed: {e}")
@@ -589,6 +587,17 @@ class OrderManager:
                 self._set_exec_cooldown(symbol, reason='ZERO_QTY', seconds=300)
                 return None
 
+            # ── Slot Reservation ──────────────────────────────────────────
+            # Claim the single capital slot before any order goes out; a
+            # concurrent entry for another symbol sees it held and backs off.
+            if self.capital and not self.capital.try_reserve_slot(symbol):
+                logger.warning(
+                    f"🚫 [ENTRY] {symbol}: capital slot held by "
+                    f"{self.capital.active_symbol} — entry skipped"
+                )
+                return None
+            slot_confirmed = False
+
             # Phase 94: Read direction from config runtime switch
             signal_type = config.TRADE_DIRECTION
             side = 'SELL' if signal_type == 'SHORT' else 'BUY'
@@ -672,6 +681,8 @@ class OrderManager:
                     if not filled:
                         # FIX 4: Set 20-min cooldown on genuine fill timeout
                         self._set_exec_cooldown(symbol, reason='FILL_TIMEOUT', seconds=1200)
+                        if self.capital:
+                            await self.capital.release_slot()
                         if self.telegram and hasattr(self.telegram, 'send_alert'):
                             await self.telegram.send_alert(
                                 f"❌ *ENTRY FILL TIMEOUT*\n\n"
@@ -684,8 +695,10 @@ class OrderManager:
 
                 # ── FIX 2: Acquire Capital Slot AFTER confirmed fill ───────
                 # (This was completely missing before — capital was NEVER consumed)
+                # Confirms the reservation taken before the entry order.
                 if self.capital:
                     await self.capital.acquire_slot(symbol)
+                slot_confirmed = True
 
                 # ── FIX 4: ATR-Based SL ───────────────────────────────────
                 stop_price = self.compute_stop_loss(ltp, signal)
@@ -784,11 +797,11 @@ class OrderManager:
                         # Non-fatal to execution, but important
                         logger.error(f"❌ [ENTRY-DB] Failed to log entry for {symbol}: {db_err}")
 
-                cap_status = self.capital.get_slot_status() if self.capital else {}
+                real_margin = self.capital.real_margin if self.capital else 0.0
                 logger.info(
                     f"✅ [ENTRY COMPLETE] {symbol} {signal_type} ×{qty} @ ₹{ltp:.2f} | "
                     f"SL=₹{stop_price:.2f} | "
-                    f"real_margin_used=₹{cap_status.get('real_margin', 0):.2f}"
+                    f"real_margin_used=₹{real_margin:.2f}"
                 )
                 return pos_state
 
@@ -800,7 +813,8 @@ class OrderManager:
                 self._set_exec_cooldown(symbol, reason=f'BROKER_EXCEPTION: {error_msg[:50]}')
 
                 # CRITICAL: Release capital if slot was acquired before this exception
-                # (slot is acquired after fill, before SL — so SL exceptions reach here with slot held)
+                # (slot is reserved before the entry order — so any failure from there
+                # on reaches here with slot held)
                 if self.capital and not self.capital.is_slot_free:
                     try:
                         logger.warning(
@@ -828,6 +842,12 @@ class OrderManager:
                     await self.telegram.send_alert(failure_msg)
                 return None
 
+            finally:
+                # Cancellation skips the except branch above: a reservation
+                # acquire_slot() never confirmed must not outlive this call.
+                if self.capital and not slot_confirmed:
+                    self.capital.cancel_reservation(symbol)
+
     # ─────────────────────────────────────────────────────────────────────────
     # EXIT
     # ─────────────────────────────────────────────────────────────────────────
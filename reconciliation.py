@@ -9,6 +9,22 @@ from fyers_broker_interface import FyersBrokerInterface
 logger = logging.getLogger(__name__)
 FORCE_REST_SYNC_INTERVAL = 300  # 5 minutes
 
+# reconciliation_log count columns: long names (new schema), then short (old schema)
+RECON_LOG_COUNT_COLUMNS = (
+    ('internal_position_count', 'broker_position_count'),
+    ('internal_pos_count',      'broker_pos_count'),
+)
+RECON_LOG_INSERT_SQL = {
+    cols: f"""
+        INSERT INTO reconciliation_log (
+            timestamp, {cols[0]}, {cols[1]},
+            orphaned_positions, phantom_positions, quantity_mismatches,
+            status, session_date, check_duration_ms
+        ) VALUES (NOW(), $1, $2, $3, $4, $5, $6, $7, 0)
+    """
+    for cols in RECON_LOG_COUNT_COLUMNS
+}
+
 
 class ReconciliationEngine:
     """
@@ -44,6 +60,7 @@ class ReconciliationEngine:
         self._recently_closed:   dict = {}  # Phase 98.1: symbol → close_timestamp (grace period)
         self._recently_modified: dict = {}  # symbol → timestamp (grace period for entry/partial exit)
         self._orphan_grace_secs: float = 30.0  # Ignore orphans for 30s after internal close
+        self._recon_log_cols:    tuple = RECON_LOG_COUNT_COLUMNS[0]  # last schema that accepted an insert
         # ─────────────────────────────────────────────────────────────
 
     # ── Called by TradeManager when trade opens or closes ─────────────
@@ -576,47 +593,43 @@ class ReconciliationEngine:
             )
     
         # ── DB log (defensive — tries both column name conventions) ────────
-        async def _try_insert(int_col: str, brk_col: str) -> bool:
+        # The schema that worked last time is tried first.
+        args = (
+            len(db_pos), len(broker_pos),
+            json.dumps(orphans), json.dumps(phantoms), json.dumps(mismatched),
+            'DIVERGENCE_DETECTED', date.today()
+        )
+
+        async def _try_insert(cols: tuple) -> bool:
             try:
-                await self.db.execute(f"""
-                    INSERT INTO reconciliation_log (
-                        timestamp, {int_col}, {brk_col},
-                        orphaned_positions, phantom_positions, quantity_mismatches,
-                        status, session_date, check_duration_ms
-                    ) VALUES (NOW(), $1, $2, $3, $4, $5, $6, $7, 0)
-                """,
-                    len(db_pos), len(broker_pos),
-                    json.dumps(orphans), json.dumps(phantoms), json.dumps(mismatched),
-                    'DIVERGENCE_DETECTED', date.today()
-                )
+                await self.db.execute(RECON_LOG_INSERT_SQL[cols], *args)
+                self._recon_log_cols = cols
                 return True
             except Exception:
                 return False
 
+        def _candidates():
+            yield self._recon_log_cols
+            yield from (c for c in RECON_LOG_COUNT_COLUMNS if c != self._recon_log_cols)
+
         inserted = False
-        # Try long names first (new schema), then short names (old schema)
-        for int_col, brk_col in [
-            ('internal_position_count', 'broker_position_count'),
-            ('internal_pos_count',      'broker_pos_count'),
-        ]:
-            inserted = await _try_insert(int_col, brk_col)
+        for cols in _candidates():
+            inserted = await _try_insert(cols)
             if inserted:
                 break
 
         if not inserted:
             # Auto-migrate: add missing JSON columns and retry
             try:
-                for col in ['orphaned_positions', 'phantom_positions', 'quantity_mismatches']:
-                    await self.db.execute(f"""
-                        ALTER TABLE reconciliation_log
-                        ADD COLUMN IF NOT EXISTS {col} TEXT DEFAULT '[]'
-                    """)
+                async with self.db.transaction() as conn:
+                    for col in ['orphaned_positions', 'phantom_positions', 'quantity_mismatches']:
+                        await conn.execute(f"""
+                            ALTER TABLE reconciliation_log
+                            ADD COLUMN IF NOT EXISTS {col} TEXT DEFAULT '[]'
+                        """)
                 logger.info("[RECONCILE] Auto-migrated reconciliation_log JSON columns. Retrying...")
-                for int_col, brk_col in [
-                    ('internal_position_count', 'broker_position_count'),
-                    ('internal_pos_count',      'broker_pos_count'),
-                ]:
-                    inserted = await _try_insert(int_col, brk_col)
+                for cols in _candidates():
+                    inserted = await _try_insert(cols)
                     if inserted:
                         break
                 if not inserted:
@@ -740,8 +753,8 @@ class ReconciliationEngine:
                 except Exception as e:
                     logger.error(f"❌ [RECOVERY] Critical failure clearing slot for {sym}: {e}")
                     # Emergency direct reset as final fallback
-                    self.capital.is_slot_free = True
-                    self.capital.active_symbol = None
+                    self.capital._position_active = False
+                    self.capital._active_symbol = None
 
             # Step 3: CRITICAL — mark DB dirty so next cycle re-fetches fresh positions.
             # Without this, _get_db_positions_cached() keeps returning stale cache
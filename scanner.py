@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 import logging
+import threading
 from fyers_connect import FyersConnect
 import time
 import config
+from strategy.features import candle_array, candles_frame
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,11 @@ class FyersScanner:
         # Zero-volume symbols are handled by quality_reject_counts blacklist.
         # Both NSE:AKASH-EQ and NSE:AAKASH-EQ are separate listed entities.
         self.quality_reject_counts = {} # Phase 42.4: Track 0-volume rejects
+        # 15m HTF prefetch cache: symbol -> (epoch minute, df_15m). A symbol
+        # re-checked within the same minute reuses the frame instead of
+        # another 5-day REST call.
+        self._htf_cache = {}
+        self._htf_cache_lock = threading.Lock()
 
     def fetch_nse_symbols(self):
         """
@@ -53,7 +61,7 @@ class FyersScanner:
                     try:
                         tick = float(row.get(4, 0.05)) # Col 4 is often MinTick
                         if tick == 0: tick = 0.05
-                    except:
+                    except (TypeError, ValueError):
                         tick = 0.05
                         
                     candidates[symbol] = tick
@@ -170,14 +178,9 @@ class FyersScanner:
             
             if len(candles) >= min_candles:
                 total = len(candles)
-                zero_vol = 0
-                
-                for c in candles:
-                    v = c[5]  # volume
-                    
-                    if v == 0:
-                        zero_vol += 1
-                        
+                # One typed array for both quality checks and the returned frame
+                arr = candle_array(candles)
+                zero_vol = np.count_nonzero(arr[:, 5] == 0)  # volume
                 zero_vol_ratio = zero_vol / total
                 
                 # Threshold 1: If > 50% have zero volume, it's illiquid/choppy
@@ -190,18 +193,11 @@ class FyersScanner:
                 # Threshold 2 (Phase 91.3): Candle Body Ratio (Filters choppy/wick-heavy charts)
                 # Calculates avg(body/range) over the last 10 candles to ensure 'clean' movement.
                 try:
-                    recent_candles = candles[-10:]
-                    ratios = []
-                    for c in recent_candles:
-                        o, h, l, cl = c[1], c[2], c[3], c[4]
-                        candle_range = h - l
-                        body = abs(cl - o)
-                        if candle_range > 0:
-                            ratios.append(body / candle_range)
-                        else:
-                            ratios.append(0)
-                    
-                    avg_body_ratio = sum(ratios) / len(ratios) if ratios else 0
+                    recent = arr[-10:]
+                    candle_range = recent[:, 2] - recent[:, 3]
+                    body = np.abs(recent[:, 4] - recent[:, 1])
+                    ratios = np.divide(body, candle_range, out=np.zeros_like(body), where=candle_range > 0)
+                    avg_body_ratio = float(ratios.mean()) if ratios.size else 0
                     min_ratio = getattr(config, 'CANDLE_BODY_RATIO_MIN', 0.25)
                     
                     if avg_body_ratio < min_ratio:
@@ -213,13 +209,16 @@ class FyersScanner:
                     logger.warning(f"Error calculating body ratio for {symbol} (non-fatal): {e}")
                     
                 # Return Success AND the Dataframe (Reuse Strategy)
-                cols = ["epoch", "open", "high", "low", "close", "volume"]
-                df = pd.DataFrame(candles, columns=cols)
-                df['datetime'] = pd.to_datetime(df['epoch'], unit='s').dt.tz_localize('UTC').dt.tz_convert('Asia/Kolkata')
+                df = candles_frame(arr)
                 
                 # Phase 51: Pre-fetch 15m candles for G9 trend exhaustion
                 # Phase 98.3: Add timeout protection — slow 15m fetch was causing 90s scan timeout
                 df_15m = None
+                minute = int(time.time() // 60)
+                with self._htf_cache_lock:
+                    hit = self._htf_cache.get(symbol)
+                if hit is not None and hit[0] == minute:
+                    return True, df, hit[1]
                 try:
                     from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
                     today_str     = today.strftime("%Y-%m-%d")
@@ -234,8 +233,13 @@ class FyersScanner:
                         try:
                             resp_15m = _f.result(timeout=8)  # Hard 8s cap on 15m fetch
                             if resp_15m.get('s') == 'ok' and resp_15m.get('candles'):
-                                df_15m = pd.DataFrame(resp_15m['candles'], columns=cols)
-                                df_15m['datetime'] = pd.to_datetime(df_15m['epoch'], unit='s').dt.tz_localize('UTC').dt.tz_convert('Asia/Kolkata')
+                                df_15m = candles_frame(resp_15m['candles'])
+                                with self._htf_cache_lock:
+                                    # Evict last minute's entries on each miss
+                                    # so the cache stays one scan wide.
+                                    for k in [k for k, (m, _) in self._htf_cache.items() if m != minute]:
+                                        del self._htf_cache[k]
+                                    self._htf_cache[symbol] = (minute, df_15m)
                         except FutureTimeout:
                             logger.debug(f"15m fetch timed out for {symbol} — skipping HTF (G9 will fail-open)")
                 except Exception as e:
@@ -29,7 +29,7 @@ class SignalManager:
         # PnL tracking for auto-pause (Phase 69)
         self.daily_pnl = 0.0
         self.max_session_loss = getattr(config, 'MAX_SESSION_LOSS_INR', 500.0)
-        self.is_paused = False
+        self._paused = False
         self.daily_target_inr: float = 0.0  # Dynamic target calculated at startup
         
         # Stats
@@ -46,7 +46,7 @@ class SignalManager:
             self.signals_today = []
             self.last_signal_time = {}
             self.daily_pnl = 0.0
-            self.is_paused = False
+            self._paused = False
             self.current_date = today
             self.stats = defaultdict(int)
     
@@ -66,31 +66,10 @@ class SignalManager:
         """
         with self._lock:
             self._reset_if_new_day()
-            now = datetime.now()
 
-            # Check 0: Execution failure cooldown (Hard block on broker errors)
-            cd = self._exec_cooldowns.get(symbol)
-            if cd:
-                now_ts = datetime.now()
-                if now_ts < cd['blocked_until']:
-                    remaining = int((cd['blocked_until'] - now_ts).total_seconds())
-                    self.stats['blocked_exec_cooldown'] = self.stats.get('blocked_exec_cooldown', 0) + 1
-                    return False, f"Exec cooldown: {symbol} blocked {remaining}s ({cd['reason']})"
-                else:
-                    del self._exec_cooldowns[symbol]  # expired
-
-            # Check 2: Paused due to max session loss
-            if self.is_paused:
-                self.stats['blocked_paused'] += 1
-                return False, f"Trading paused: Max session loss reached (₹{self.daily_pnl:.2f})"
-
-            # Check 3: Per-symbol cooldown (Discovery only)
-            if not is_execution and symbol in self.last_signal_time:
-                unlock_at = self.last_signal_time[symbol]
-                if now < unlock_at:
-                    remaining = (unlock_at - now).total_seconds() / 60
-                    self.stats['blocked_cooldown'] += 1
-                    return False, f"Cooldown: {symbol} blocked for {remaining:.1f}m"
+            blocked_reason = self._blocked_reason_locked(symbol, is_execution)
+            if blocked_reason:
+                return False, blocked_reason
 
             # ── Daily Target Gate ─────────────────────────────────────────────
             # Once daily profit ≥ target, only EXTREME / MAX_CONVICTION allowed.
@@ -119,6 +98,58 @@ class SignalManager:
 
             return True, "OK"
     
+    def is_blocked(self, symbol):
+        """
+        Confidence-independent subset of can_signal() (exec cooldown, session
+        pause, per-symbol cooldown). Cheap enough to run before any candle
+        fetch, so the analyzer can drop blocked symbols up front.
+
+        A pure read: the block stats count real signal attempts (can_signal),
+        not every scan cycle that looks a blocked symbol up.
+
+        Returns:
+            tuple: (blocked, reason)
+        """
+        with self._lock:
+            self._reset_if_new_day()
+            blocked_reason = self._blocked_reason_locked(symbol, is_execution=False, count=False)
+            return bool(blocked_reason), blocked_reason or "OK"
+
+    def _blocked_reason_locked(self, symbol, is_execution, count=True):
+        """
+        Hard blocks shared by can_signal/is_blocked. Caller holds self._lock.
+        With count=False nothing is mutated (no stats, no cooldown expiry).
+        """
+        now = datetime.now()
+
+        # Check 0: Execution failure cooldown (Hard block on broker errors)
+        cd = self._exec_cooldowns.get(symbol)
+        if cd:
+            if now < cd['blocked_until']:
+                remaining = int((cd['blocked_until'] - now).total_seconds())
+                if count:
+                    self.stats['blocked_exec_cooldown'] = self.stats.get('blocked_exec_cooldown', 0) + 1
+                return f"Exec cooldown: {symbol} blocked {remaining}s ({cd['reason']})"
+            elif count:
+                del self._exec_cooldowns[symbol]  # expired
+
+        # Check 2: Paused due to max session loss
+        if self._paused:
+            if count:
+                self.stats['blocked_paused'] += 1
+            return f"Trading paused: Max session loss reached (₹{self.daily_pnl:.2f})"
+
+        # Check 3: Per-symbol cooldown (Discovery only)
+        if not is_execution and symbol in self.last_signal_time:
+            unlock_at = self.last_signal_time[symbol]
+            if now < unlock_at:
+                remaining = (unlock_at - now).total_seconds() / 60
+                if count:
+                    self.stats['blocked_cooldown'] += 1
+                return f"Cooldown: {symbol} blocked for {remaining:.1f}m"
+
+        return None
+
     def record_signal(self, symbol, entry_price, stop_loss, pattern):
         """
         Record a new signal being sent.
@@ -173,44 +204,57 @@ class SignalManager:
             symbol: Stock symbol
             pnl: Realized PnL from the trade
         """
-        self.daily_pnl += pnl
-        is_win = pnl > 0
-        
-        if is_win:
-            self.stats['wins'] += 1
-            logger.info(f"WIN recorded for {symbol} (₹{pnl:.2f}). Session PnL: ₹{self.daily_pnl:.2f}")
-        else:
-            self.stats['losses'] += 1
-            logger.warning(f"LOSS recorded for {symbol} (₹{pnl:.2f}). Session PnL: ₹{self.daily_pnl:.2f}")
-            
-            if self.daily_pnl <= -self.max_session_loss:
-                self.is_paused = True
-                logger.critical(f"🚨 TRADING PAUSED: Max session loss limit breached. Session PnL: ₹{self.daily_pnl:.2f}")
+        # Same lock as can_signal/is_blocked, which read these from the
+        # analysis worker threads
+        with self._lock:
+            self.daily_pnl += pnl
+            is_win = pnl > 0
+
+            if is_win:
+                self.stats['wins'] += 1
+                logger.info(f"WIN recorded for {symbol} (₹{pnl:.2f}). Session PnL: ₹{self.daily_pnl:.2f}")
+            else:
+                self.stats['losses'] += 1
+                logger.warning(f"LOSS recorded for {symbol} (₹{pnl:.2f}). Session PnL: ₹{self.daily_pnl:.2f}")
+
+                if self.daily_pnl <= -self.max_session_loss:
+                    self._paused = True
+                    logger.critical(f"🚨 TRADING PAUSED: Max session loss limit breached. Session PnL: ₹{self.daily_pnl:.2f}")
     
 
+    def is_paused(self) -> bool:
+        """True while the max-loss circuit breaker holds; rolls over at day start."""
+        with self._lock:
+            self._reset_if_new_day()
+            return self._paused
+
     def get_status(self):
         """Get current status for operator commands and logging."""
-        self._reset_if_new_day()
-        return {
-            'date': self.current_date,
-            'signals_sent': len(self.signals_today),
-            'signals_remaining': 'Unlimited',
-            'daily_pnl': self.daily_pnl,
-            'is_paused': self.is_paused,
-            'symbols_on_cooldown': list(self.last_signal_time.keys()),
-            'stats': dict(self.stats)
-        }
+        with self._lock:
+            self._reset_if_new_day()
+            return {
+                'date': self.current_date,
+                'signals_sent': len(self.signals_today),
+                'signals_remaining': 'Unlimited',
+                'daily_pnl': self.daily_pnl,
+                'is_paused': self._paused,
+                'symbols_on_cooldown': list(self.last_signal_time.keys()),
+                'stats': dict(self.stats)
+            }
     
 
 
 # Global singleton instance
 _signal_manager = None
+_signal_manager_lock = threading.Lock()
 
 def get_signal_manager():
     """Get the global signal manager instance."""
     global _signal_manager
     if _signal_manager is None:
-        _signal_manager = SignalManager(
-            cooldown_minutes=45
-        )
+        with _signal_manager_lock:
+            if _signal_manager is None:
+                _signal_manager = SignalManager(
+                    cooldown_minutes=45
+                )
     return _signal_manager
@@ -11,11 +11,13 @@ logger = logging.getLogger(__name__)
 
 class StartupRecovery:
 
-    def __init__(self, fyers_client, order_manager=None, capital_manager=None, telegram=None):
+    def __init__(self, fyers_client, order_manager=None, capital_manager=None, telegram=None,
+                 db_manager=None):
         self.fyers          = fyers_client
         self.order_manager  = order_manager    # NEW
         self.capital        = capital_manager  # NEW
         self.telegram       = telegram         # NEW
+        self.db             = db_manager
         logger.info("[RECOVERY] StartupRecovery initialized (Phase 44.6 — adoption enabled).")
 
     async def scan_orphaned_trades(self):
@@ -44,6 +46,7 @@ class StartupRecovery:
             logger.critical(
                 f"⚠️ [RECOVERY] Found {len(open_positions)} OPEN POSITION(S) at startup!"
             )
+            adopted = []
             for p in open_positions:
                 sym     = p['symbol']
                 qty     = p['netQty']
@@ -55,7 +58,7 @@ class StartupRecovery:
                 if self.order_manager and self.capital:
                     try:
                         # Since we're now async, directly await the adoption
-                        await self._adopt_orphan_async(sym, qty, side, avg)
+                        adopted.append(await self._adopt_orphan_async(sym, qty, side, avg))
                     except Exception as e:
                         logger.error(f"[RECOVERY] Failed to schedule adoption for {sym}: {e}")
                 else:
@@ -70,6 +73,15 @@ class StartupRecovery:
                             f"Cannot auto-adopt — managers not wired."
                         ))
 
+            # Seed every adopted position into the DB in one COPY so the
+            # reconciler sees them as tracked rather than as orphans.
+            if adopted and self.db:
+                try:
+                    await self.db.bulk_upsert_positions(adopted)
+                    logger.info(f"[RECOVERY] {len(adopted)} adopted position(s) written to DB.")
+                except Exception as e:
+                    logger.error(f"[RECOVERY] DB seed of adopted positions failed: {e}")
+
         except asyncio.TimeoutError:
             logger.error("❌ [RECOVERY] Fyers 'positions' API timed out after 15s. Skipping recovery.")
         except Exception as e:
@@ -77,8 +89,11 @@ class StartupRecovery:
 
     async def _adopt_orphan_async(
         self, symbol: str, net_qty: int, side: str, avg_price: float
-    ):
-        """Async adoption logic — places emergency SL, registers position, locks capital."""
+    ) -> tuple:
+        """
+        Async adoption logic — places emergency SL, registers position, locks capital.
+        Returns the position's DatabaseManager.bulk_upsert_positions() record.
+        """
         qty      = abs(net_qty)
         sl_pct   = 0.01
         sl_price = round(avg_price * (1 + sl_pct), 2) if side == 'SHORT' \
@@ -152,3 +167,7 @@ class StartupRecovery:
             f"[RECOVERY] ✅ Orphan adopted: {symbol} {side} ×{qty} "
             f"sl_id={sl_id} sl=₹{sl_price:.2f}"
         )
+        return (
+            symbol, qty, avg_price, str(sl_id) if sl_id else None,
+            'ORPHAN_RECOVERY', datetime.now().date(),
+        )
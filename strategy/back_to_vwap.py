@@ -17,6 +17,7 @@ Target: mean reversion toward VWAP.
 """
 
 import logging
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
 import pandas as pd
@@ -26,6 +27,42 @@ from strategy import features as F
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class StrategyParams:
+    """Gate thresholds, read from config once instead of per evaluation."""
+
+    min_gain_pct: float = 7.5
+    vwap_sd_floor: float = 4.5
+    vwap_sd_high: float = 5.0
+    vwap_sd_extreme: float = 6.0
+    require_failed_auction: bool = True
+    rsi_divergence_window: int = 25
+    vol_fade_lookback: int = 15
+    vol_fade_max_ratio: float = 0.65
+    momentum_decay_ratio: float = 0.85
+
+    @classmethod
+    def from_config(cls, module=cfg) -> "StrategyParams":
+        d = cls()
+        return cls(
+            min_gain_pct=getattr(module, 'SCANNER_GAIN_MIN_PCT', d.min_gain_pct),
+            vwap_sd_floor=getattr(module, 'STRATEGY_VWAP_SD_FLOOR', d.vwap_sd_floor),
+            vwap_sd_high=getattr(module, 'STRATEGY_VWAP_SD_HIGH', d.vwap_sd_high),
+            vwap_sd_extreme=getattr(module, 'STRATEGY_VWAP_SD_EXTREME', d.vwap_sd_extreme),
+            require_failed_auction=getattr(
+                module, 'STRATEGY_REQUIRE_FAILED_AUCTION', d.require_failed_auction
+            ),
+            rsi_divergence_window=getattr(
+                module, 'STRATEGY_RSI_DIVERGENCE_WINDOW', d.rsi_divergence_window
+            ),
+            vol_fade_lookback=getattr(module, 'STRATEGY_VOL_FADE_LOOKBACK', d.vol_fade_lookback),
+            vol_fade_max_ratio=getattr(module, 'STRATEGY_VOL_FADE_MAX_RATIO', d.vol_fade_max_ratio),
+            momentum_decay_ratio=getattr(
+                module, 'STRATEGY_MOMENTUM_DECAY_RATIO', d.momentum_decay_ratio
+            ),
+        )
+
+
 class BackToVWAPShort:
     """
     Single strategy implementation for the ShortCircuit bot.
@@ -37,10 +74,27 @@ class BackToVWAPShort:
     - Multi-edge detector (deleted)
     """
 
+    def __init__(self, params: Optional[StrategyParams] = None):
+        self.params = params if params is not None else StrategyParams.from_config()
+
     # ──────────────────────────────────────────────────────────────────
     # PUBLIC API
     # ──────────────────────────────────────────────────────────────────
 
+    def passes_gain_floor(self, gain_pct: float) -> bool:
+        """C0 gain floor — evaluate() rejects whenever this is False."""
+        return gain_pct >= self.params.min_gain_pct
+
+    def passes_depth_free_gates(self, gain_pct: float, vwap_sd: float) -> bool:
+        """
+        True unless evaluate() is certain to reject on the C0 gain floor or
+        the C1 VWAP-stretch floor. Neither needs order-book data, so callers
+        can skip the depth request when this returns False.
+        """
+        if not self.passes_gain_floor(gain_pct):
+            return False
+        return vwap_sd >= self.params.vwap_sd_floor
+
     def evaluate(
         self,
         symbol: str,
@@ -58,6 +112,7 @@ class BackToVWAPShort:
         lower_circuit: float = 0.0,
         spread_pct: float = 0.0,
         is_circuit_hitter: bool = False,
+        bars: Optional[F.EnrichedBars] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Evaluate whether all 6 BackToVWAPShort conditions hold.
@@ -65,11 +120,17 @@ class BackToVWAPShort:
         Returns a signal_meta dict on pass, None on reject.
         All gate audit info is logged via structured logging for
         correlation by GateResultLogger upstream.
+
+        *bars* is the EnrichedBars view of *df* built by the caller; every
+        condition reads its arrays (and cached RSI / day high) instead of
+        going back to the frame.
         """
-        candles = df.to_dict('records')
+        if bars is None:
+            bars = F.EnrichedBars.from_frame(df)
+        p = self.params
 
         # ── Pre-Filter: Gain, Circuit, and Spread ─────────────────────
-        min_gain = getattr(cfg, 'SCANNER_GAIN_MIN_PCT', 7.5)
+        min_gain = p.min_gain_pct
         if gain_pct < min_gain:
             logger.debug("  [C0] %s REJECT: Gain %.1f%% < %.1f%%", symbol, gain_pct, min_gain)
             return None
@@ -91,7 +152,7 @@ class BackToVWAPShort:
             return None
 
         # ── Condition 1: VWAP Stretch ────────────────────────────────
-        sd_floor = getattr(cfg, 'STRATEGY_VWAP_SD_FLOOR', 4.5)
+        sd_floor = p.vwap_sd_floor
         if vwap_sd < sd_floor:
             logger.debug(
                 "  [C1] %s REJECT: VWAP SD %.2f < floor %.1f",
@@ -114,7 +175,7 @@ class BackToVWAPShort:
             logger.debug("  [C2] %s REJECT: VAH not computed", symbol)
             return None
 
-        curr_close = df.iloc[-1]['close']
+        curr_close = bars.close[-1]
         # Allow price below VAH ONLY if we have a confirmed profile rejection
         # (Look Above & Fail / value-back-in).
         if curr_close <= vah and not profile_rejection:
@@ -125,9 +186,9 @@ class BackToVWAPShort:
             return None
 
         # ── Condition 3: Failed auction behavior ─────────────────────
-        require_auction = getattr(cfg, 'STRATEGY_REQUIRE_FAILED_AUCTION', True)
+        require_auction = p.require_failed_auction
         has_auction_fail = self._check_auction_failure(
-            df, candles, profile, vah, profile_rejection
+            bars, vah, profile_rejection
         )
 
         if require_auction and not has_auction_fail:
@@ -136,9 +197,9 @@ class BackToVWAPShort:
 
         # ── Condition 4: Divergence (RSI or price lower-high) ────────
         rsi_div = F.compute_rsi_divergence(
-            df, window=getattr(cfg, 'STRATEGY_RSI_DIVERGENCE_WINDOW', 25)
+            bars, window=p.rsi_divergence_window,
         )
-        price_lower_high = F.is_narrowing_highs(df, n=3)
+        price_lower_high = F.is_narrowing_highs(bars, n=3)
 
         if not rsi_div and not price_lower_high:
             logger.debug(
@@ -149,10 +210,10 @@ class BackToVWAPShort:
 
         # ── Condition 5: Volume fading ───────────────────────────────
         # PRD: No adaptive relaxation. No Spear bypass. Gate must pass on its own.
-        lookback = getattr(cfg, 'STRATEGY_VOL_FADE_LOOKBACK', 15)
-        max_ratio = getattr(cfg, 'STRATEGY_VOL_FADE_MAX_RATIO', 0.65)
+        lookback = p.vol_fade_lookback
+        max_ratio = p.vol_fade_max_ratio
 
-        vol_fade = F.compute_volume_fade_ratio(candles, lookback=lookback)
+        vol_fade = F.compute_volume_fade_ratio(bars.volume, lookback=lookback)
 
         if vol_fade > max_ratio:
             logger.debug(
@@ -164,7 +225,7 @@ class BackToVWAPShort:
         # ── Condition 6: Momentum decay ──────────────────────────────
         # PRD: True price-velocity decay only. Fast slope must genuinely
         # fall behind slow slope. No trivial flat-slope OR clause.
-        decay_ratio = getattr(cfg, 'STRATEGY_MOMENTUM_DECAY_RATIO', 0.85)
+        decay_ratio = p.momentum_decay_ratio
         momentum_decaying = slope_fast < (slope_slow * decay_ratio)
 
         if not momentum_decaying:
@@ -183,12 +244,12 @@ class BackToVWAPShort:
 
         # Pattern detection for enrichment
         vah_for_pattern = vah if isinstance(vah, (int, float)) else None
-        pattern, vol_z = F.detect_pattern(df, vah=vah_for_pattern)
+        pattern, vol_z = F.detect_pattern(bars, vah=vah_for_pattern)
         if pattern == "NORMAL":
             pattern = "EXHAUSTION_FADE"
 
         stretch_score = F.compute_stretch_score(
-            gain_pct, getattr(cfg, 'SCANNER_GAIN_MIN_PCT', 7.5)
+            gain_pct, p.min_gain_pct
         )
 
         logger.info(
@@ -202,7 +263,7 @@ class BackToVWAPShort:
             'pattern_bonus': pattern,
             'stretch_score': stretch_score,
             'vol_fade_ratio': vol_fade,
-            'snapshot_high': df['high'].max(),
+            'snapshot_high': bars.day_high,
         }
 
     # ──────────────────────────────────────────────────────────────────
@@ -211,9 +272,7 @@ class BackToVWAPShort:
 
     @staticmethod
     def _check_auction_failure(
-        df: pd.DataFrame,
-        candles: list,
-        profile: dict,
+        bars: F.EnrichedBars,
         vah: float,
         profile_rejection: bool,
     ) -> bool:
@@ -231,9 +290,9 @@ class BackToVWAPShort:
             return True
 
         # VAH Rejection: probed above VAH in last 3 candles, closed back inside
-        if vah and vah > 0 and len(df) >= 3:
-            poked_above = df['high'].iloc[-3:].max() > (vah * 1.0005)
-            closed_back = df.iloc[-1]['close'] < (vah * 0.9995)
+        if vah and vah > 0 and len(bars) >= 3:
+            poked_above = bars.high[-3:].max() > (vah * 1.0005)
+            closed_back = bars.close[-1] < (vah * 0.9995)
             if poked_above and closed_back:
                 return True
 
@@ -242,8 +301,8 @@ class BackToVWAPShort:
     # _check_spear_of_exhaustion: DELETED per PRD.
     # "No live gate can be skipped because another feature looks strong."
 
-    @staticmethod
     def _compute_confidence(
+        self,
         vwap_sd: float,
         vol_fade: float,
         profile_rejection: bool,
@@ -258,18 +317,18 @@ class BackToVWAPShort:
         HIGH:    SD ≥ high threshold OR 4+ confluences
         MEDIUM:  everything else (already passed all 6 hard gates)
         """
-        sd_extreme = getattr(cfg, 'STRATEGY_VWAP_SD_EXTREME', 6.0)
-        sd_high = getattr(cfg, 'STRATEGY_VWAP_SD_HIGH', 5.0)
-
-        # Count confluences
-        confluence = sum([
-            profile_rejection,
-            rsi_div,
-            price_lower_high,
-            auction_fail,
-            vol_fade < 0.30,
-            vwap_sd > sd_high,
-        ])
+        sd_extreme = self.params.vwap_sd_extreme
+        sd_high = self.params.vwap_sd_high
+
+        # Count confluences (bools add as 0/1; no per-call list)
+        confluence = (
+            bool(profile_rejection)
+            + bool(rsi_div)
+            + bool(price_lower_high)
+            + bool(auction_fail)
+            + (vol_fade < 0.30)
+            + (vwap_sd > sd_high)
+        )
 
         if vwap_sd >= sd_extreme and confluence >= 5:
             return "EXTREME"
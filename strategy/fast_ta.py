@@ -0,0 +1,275 @@
+"""
+fast_ta.py — Array kernels for the per-symbol hot path.
+
+Every function takes contiguous float64 NumPy arrays and returns plain
+floats / ndarrays. When numba is installed the kernels are JIT-compiled
+single-pass loops; otherwise an equivalent vectorized NumPy path is used.
+Numerics match the pandas implementations in features.py.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    njit = None
+    HAS_NUMBA = False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pure NumPy implementations (always available)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _compute_vwap_np(h, l, c, v, out):
+    np.add(h, l, out=out)
+    out += c
+    out *= v
+    out /= 3.0
+    np.cumsum(out, out=out)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out /= np.cumsum(v)
+    return out
+
+
+def _vwap_sd_np(close, vwap, window):
+    n = close.shape[0]
+    if n < window:
+        return 0.0
+    diffs = close[n - window:] - vwap[n - window:]
+    diffs = diffs[~np.isnan(diffs)]
+    if diffs.shape[0] < 2:
+        return 0.0
+    std_dev = diffs.std(ddof=1)
+    if std_dev == 0:
+        return 0.0
+    return float((close[-1] - vwap[-1]) / std_dev)
+
+
+def _linreg_slope_np(y):
+    n = y.shape[0]
+    if n < 2:
+        return 0.0
+    x = np.arange(n, dtype=np.float64)
+    x -= x.mean()
+    return float(np.dot(x, y - y.mean()) / np.dot(x, x))
+
+
+def _session_features_np(h, l, c, v, out, sd_window):
+    _compute_vwap_np(h, l, c, v, out)
+    n = c.shape[0]
+    sd = _vwap_sd_np(c[:n - 1], out[:n - 1], sd_window) if n > 1 else 0.0
+    return h.max(), sd
+
+
+def _atr_rsi_np(h, l, c, period):
+    n = c.shape[0]
+    if n < period:
+        return np.nan, np.full(n, np.nan)
+    prev = np.empty(n)
+    prev[0] = np.nan
+    prev[1:] = c[:-1]
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+    delta = np.zeros(n)
+    delta[1:] = c[1:] - c[:-1]
+
+    windows = np.lib.stride_tricks.sliding_window_view
+    gain = np.full(n, np.nan)
+    loss = np.full(n, np.nan)
+    gain[period - 1:] = windows(np.where(delta > 0, delta, 0.0), period).mean(axis=1)
+    loss[period - 1:] = windows(np.where(delta < 0, -delta, 0.0), period).mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + gain / loss))
+    return float(tr[n - period:].mean()), rsi
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Numba kernels (single sequential pass, no temporaries)
+# ─────────────────────────────────────────────────────────────────────────────
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _compute_vwap_nb(h, l, c, v, out):
+        n = h.shape[0]
+        cum_pv = 0.0
+        cum_v = 0.0
+        for i in range(n):
+            cum_pv += (h[i] + l[i] + c[i]) / 3.0 * v[i]
+            cum_v += v[i]
+            out[i] = cum_pv / cum_v if cum_v != 0.0 else np.nan
+        return out
+
+    @njit(cache=True)
+    def _vwap_sd_nb(close, vwap, window):
+        n = close.shape[0]
+        if n < window:
+            return 0.0
+        s = 0.0
+        cnt = 0
+        for i in range(n - window, n):
+            d = close[i] - vwap[i]
+            if not np.isnan(d):
+                s += d
+                cnt += 1
+        if cnt < 2:
+            return 0.0
+        mean = s / cnt
+        ss = 0.0
+        for i in range(n - window, n):
+            d = close[i] - vwap[i]
+            if not np.isnan(d):
+                ss += (d - mean) * (d - mean)
+        std_dev = np.sqrt(ss / (cnt - 1))
+        if std_dev == 0.0:
+            return 0.0
+        return (close[n - 1] - vwap[n - 1]) / std_dev
+
+    @njit(cache=True)
+    def _linreg_slope_nb(y):
+        n = y.shape[0]
+        if n < 2:
+            return 0.0
+        x_mean = (n - 1) / 2.0
+        y_mean = 0.0
+        for i in range(n):
+            y_mean += y[i]
+        y_mean /= n
+        num = 0.0
+        den = 0.0
+        for i in range(n):
+            dx = i - x_mean
+            num += dx * (y[i] - y_mean)
+            den += dx * dx
+        return num / den
+
+    @njit(cache=True)
+    def _session_features_nb(h, l, c, v, out, sd_window):
+        n = h.shape[0]
+        cum_pv = 0.0
+        cum_v = 0.0
+        day_high = -np.inf
+        for i in range(n):
+            cum_pv += (h[i] + l[i] + c[i]) / 3.0 * v[i]
+            cum_v += v[i]
+            out[i] = cum_pv / cum_v if cum_v != 0.0 else np.nan
+            if h[i] > day_high:
+                day_high = h[i]
+        sd = _vwap_sd_nb(c[:n - 1], out[:n - 1], sd_window) if n > 1 else 0.0
+        return day_high, sd
+
+    @njit(cache=True)
+    def _atr_rsi_nb(h, l, c, period):
+        n = c.shape[0]
+        rsi = np.full(n, np.nan)
+        if n < period:
+            return np.nan, rsi
+        tr = np.empty(n)
+        up = np.empty(n)
+        dn = np.empty(n)
+        for i in range(n):
+            rng = h[i] - l[i]
+            if i == 0:
+                tr[i] = rng
+                up[i] = 0.0
+                dn[i] = 0.0
+            else:
+                tr[i] = max(rng, abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+                d = c[i] - c[i - 1]
+                up[i] = d if d > 0 else 0.0
+                dn[i] = -d if d < 0 else 0.0
+            if i >= period - 1:
+                g = 0.0
+                ls = 0.0
+                for j in range(i - period + 1, i + 1):
+                    g += up[j]
+                    ls += dn[j]
+                if ls > 0.0:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + g / ls)
+                elif g > 0.0:
+                    rsi[i] = 100.0
+        atr = 0.0
+        for j in range(n - period, n):
+            atr += tr[j]
+        return atr / period, rsi
+
+    _compute_vwap_impl = _compute_vwap_nb
+    _vwap_sd_impl = _vwap_sd_nb
+    _linreg_slope_impl = _linreg_slope_nb
+    _atr_rsi_impl = _atr_rsi_nb
+    _session_features_impl = _session_features_nb
+else:
+    _compute_vwap_impl = _compute_vwap_np
+    _vwap_sd_impl = _vwap_sd_np
+    _linreg_slope_impl = _linreg_slope_np
+    _atr_rsi_impl = _atr_rsi_np
+    _session_features_impl = _session_features_np
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+def compute_vwap(
+    h: np.ndarray, l: np.ndarray, c: np.ndarray, v: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Cumulative session VWAP of typical price. Writes into *out* (length of
+    the inputs) when given, so callers can reuse a preallocated buffer.
+    """
+    if out is None:
+        out = np.empty(h.shape[0])
+    return _compute_vwap_impl(h, l, c, v, out)
+
+
+def session_features(
+    h: np.ndarray, l: np.ndarray, c: np.ndarray, v: np.ndarray,
+    out: Optional[np.ndarray] = None, sd_window: int = 20,
+):
+    """
+    One pass over the session's bars returning (vwap, day_high, vwap_sd),
+    where vwap_sd is the stretch of the last *completed* bar (live bar
+    excluded), i.e. vwap_sd(c[:-1], vwap[:-1], sd_window).
+    """
+    if out is None:
+        out = np.empty(h.shape[0])
+    day_high, sd = _session_features_impl(h, l, c, v, out, sd_window)
+    return out, float(day_high), float(sd)
+
+
+def vwap_sd(close: np.ndarray, vwap: np.ndarray, window: int = 20) -> float:
+    """Distance of the last close from VWAP in σ of (close - VWAP) over *window* bars."""
+    return float(_vwap_sd_impl(close, vwap, window))
+
+
+def linreg_slope(y: np.ndarray) -> float:
+    """Least-squares slope of *y* against bar index (same as np.polyfit deg=1)."""
+    return float(_linreg_slope_impl(y))
+
+
+def vwap_slope_bps(vwap: np.ndarray, close: np.ndarray, window: int) -> float:
+    """
+    VWAP slope over the last *window* bars in bps of the last close per bar.
+    Returns 0.0 when fewer than *window* bars are available.
+    """
+    n = vwap.shape[0]
+    if n < window or window < 2:
+        return 0.0
+    slope = linreg_slope(vwap[n - window:])
+    return (slope / close[-1]) * 10000
+
+
+def atr_rsi(h: np.ndarray, l: np.ndarray, c: np.ndarray, period: int = 14):
+    """
+    Fused pass over OHLC returning (atr, rsi_series).
+
+    atr is the last value of the simple rolling mean of True Range and
+    rsi_series the per-bar RSI from *period*-bar mean gain/loss — the same
+    definitions as features.compute_atr / compute_rsi_divergence. Both are
+    NaN until *period* bars exist.
+    """
+    atr, rsi = _atr_rsi_impl(h, l, c, period)
+    return float(atr), rsi
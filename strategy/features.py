@@ -5,9 +5,38 @@ All functions are pure: data in, value out. No broker calls, no side effects.
 Extracted from god_mode_logic.py and analyzer.py during the BackToVWAPShort collapse.
 """
 
+from functools import cached_property
+from typing import Tuple, Optional, Union
+
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional
+
+from strategy import fast_ta
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CANDLES
+# ─────────────────────────────────────────────────────────────────────────────
+
+CANDLE_COLUMNS = ("epoch", "open", "high", "low", "close", "volume")
+
+
+def candle_array(rows) -> np.ndarray:
+    """Fyers [epoch, o, h, l, c, v] rows -> (n, 6) float64 array, one typed conversion."""
+    return np.asarray(rows, dtype=np.float64).reshape(-1, len(CANDLE_COLUMNS))
+
+
+def candles_frame(rows) -> pd.DataFrame:
+    """
+    Build the OHLCV frame from [epoch, o, h, l, c, v] rows in one typed
+    conversion: int64 epoch plus a single float64 block for prices/volume,
+    instead of letting pandas infer dtypes row by row. No datetime column:
+    the analysis path only reads epoch and OHLCV.
+    """
+    arr = candle_array(rows)
+    df = pd.DataFrame(arr[:, 1:], columns=list(CANDLE_COLUMNS[1:]))
+    df.insert(0, "epoch", arr[:, 0].astype(np.int64))
+    return df
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -22,15 +51,11 @@ def compute_vwap_sd(df: pd.DataFrame, window: int = 20) -> float:
     if 'vwap' not in df.columns or len(df) < window:
         return 0.0
 
-    recent = df.iloc[-window:]
-    diffs = recent['close'] - recent['vwap']
-    std_dev = diffs.std()
-
-    if std_dev == 0:
-        return 0.0
-
-    current_diff = df.iloc[-1]['close'] - df.iloc[-1]['vwap']
-    return current_diff / std_dev
+    return fast_ta.vwap_sd(
+        df['close'].to_numpy(dtype=np.float64),
+        df['vwap'].to_numpy(dtype=np.float64),
+        window,
+    )
 
 
 def compute_vwap_slope(df: pd.DataFrame, window: int = 30) -> Tuple[float, str]:
@@ -42,31 +67,96 @@ def compute_vwap_slope(df: pd.DataFrame, window: int = 30) -> Tuple[float, str]:
     if df.empty or len(df) < window:
         return 0.0, "INSUFFICIENT_DATA"
 
+    if window < 2:
+        return 0.0, "INSUFFICIENT_DATA"
+
+    close = df['close'].to_numpy(dtype=np.float64)
     if 'vwap' not in df.columns:
-        v = df['volume'].values
-        tp = (df['high'] + df['low'] + df['close']) / 3
-        vwap = (tp * v).cumsum() / v.cumsum()
+        vwap = compute_vwap(df)
     else:
-        vwap = df['vwap']
-
-    y = vwap.iloc[-window:].values
-    x = np.arange(len(y))
-
-    if len(y) < 2:
-        return 0.0, "INSUFFICIENT_DATA"
+        vwap = df['vwap'].to_numpy(dtype=np.float64)
 
-    slope, _ = np.polyfit(x, y, 1)
-    pct_slope = (slope / df['close'].iloc[-1]) * 10000
+    pct_slope = fast_ta.vwap_slope_bps(vwap, close, window)
 
     status = "FLAT" if abs(pct_slope) < 5 else "TRENDING"
     return pct_slope, status
 
 
-def enrich_dataframe(df: pd.DataFrame) -> None:
-    """Calculates VWAP in-place on the dataframe."""
-    v = df['volume'].values
-    tp = (df['high'] + df['low'] + df['close']) / 3
-    df['vwap'] = (tp * v).cumsum() / v.cumsum()
+class EnrichedBars:
+    """
+    Float64 column views of an OHLCV frame whose derived series are virtual:
+    each is computed on first access and cached. A scan that rejects before
+    reading ``vwap`` never computes it.
+    """
+
+    def __init__(self, open_, high, low, close, volume, vwap_out: Optional[np.ndarray] = None):
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._vwap_out = vwap_out
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, vwap_out: Optional[np.ndarray] = None) -> "EnrichedBars":
+        cols = [df[c].to_numpy(dtype=np.float64) for c in ('open', 'high', 'low', 'close', 'volume')]
+        return cls(*cols, vwap_out=vwap_out)
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
+
+    @cached_property
+    def _session(self):
+        # VWAP, day high and completed-bar stretch share one fused pass
+        return fast_ta.session_features(
+            self.high, self.low, self.close, self.volume, out=self._vwap_out, sd_window=20,
+        )
+
+    @property
+    def vwap(self) -> np.ndarray:
+        return self._session[0]
+
+    @property
+    def day_high(self) -> float:
+        return self._session[1]
+
+    @property
+    def vwap_sd(self) -> float:
+        """VWAP stretch of the last completed bar (live bar excluded)."""
+        return self._session[2]
+
+    @cached_property
+    def _atr_rsi(self):
+        return fast_ta.atr_rsi(self.high, self.low, self.close, 14)
+
+    @property
+    def atr(self) -> float:
+        return self._atr_rsi[0]
+
+    @property
+    def rsi(self) -> np.ndarray:
+        return self._atr_rsi[1]
+
+
+BarsLike = Union[pd.DataFrame, EnrichedBars]
+
+
+def _as_bars(df: BarsLike) -> EnrichedBars:
+    return df if isinstance(df, EnrichedBars) else EnrichedBars.from_frame(df)
+
+
+def compute_vwap(df: pd.DataFrame) -> np.ndarray:
+    """
+    Session VWAP of *df* as a float64 array. *df* is not modified; callers
+    that need a column use ``df.assign(vwap=compute_vwap(df))``, which adds
+    one block instead of copying the frame.
+    """
+    return fast_ta.compute_vwap(
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64),
+        df['volume'].to_numpy(dtype=np.float64),
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -75,7 +165,9 @@ def enrich_dataframe(df: pd.DataFrame) -> None:
 
 
 
-def compute_rsi_divergence(df: pd.DataFrame, window: int = 25) -> bool:
+def compute_rsi_divergence(
+    df: BarsLike, window: int = 25, rsi: Optional[np.ndarray] = None,
+) -> bool:
     """
     Swing-based bearish RSI divergence.
 
@@ -88,20 +180,21 @@ def compute_rsi_divergence(df: pd.DataFrame, window: int = 25) -> bool:
     This replaces the old endpoint-comparison approach per PRD doctrine:
     "divergence is a relationship between comparable swings, not just
     two arbitrary endpoints."
+
+    *rsi* may be a precomputed 14-bar RSI series (fast_ta.atr_rsi) aligned
+    with *df*; otherwise the (cached) RSI of the bars is used.
     """
     try:
         if len(df) < window:
             return False
 
-        # Compute RSI series
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi_series = 100 - (100 / (1 + rs))
+        bars = _as_bars(df)
+        high = bars.high
+        if rsi is None:
+            rsi = bars.rsi
 
-        recent_price = df['high'].iloc[-window:].values
-        recent_rsi = rsi_series.iloc[-window:].values
+        recent_price = high[-window:]
+        recent_rsi = rsi[-window:]
 
         # Find swing highs: bar[i] > bar[i-1] AND bar[i] > bar[i+1]
         price_swings = []  # list of (index, price_high, rsi_value)
@@ -139,18 +232,15 @@ def compute_rsi_divergence(df: pd.DataFrame, window: int = 25) -> bool:
 def compute_atr(df: pd.DataFrame, period: int = 14) -> float:
     """Average True Range. Returns 1.0 as fallback on error."""
     try:
-        high = df['high']
-        low = df['low']
-        close = df['close']
-
-        prev_close = close.shift(1)
-        tr1 = high - low
-        tr2 = (high - prev_close).abs()
-        tr3 = (low - prev_close).abs()
-
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        return atr.iloc[-1]
+        if df.empty:
+            return 1.0
+        atr, _ = fast_ta.atr_rsi(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            period,
+        )
+        return atr
     except Exception:
         return 1.0
 
@@ -159,20 +249,21 @@ def compute_atr(df: pd.DataFrame, period: int = 14) -> float:
 # Volume
 # ─────────────────────────────────────────────────────────────────────────────
 
-def compute_volume_fade_ratio(candles: list, lookback: int = 15) -> float:
+def compute_volume_fade_ratio(volume: np.ndarray, lookback: int = 15) -> float:
     """
     Ratio of current volume (avg of last 2 candles) to prior average.
     < 0.65 = fading (exhaustion). > 1.0 = acceleration.
+    *volume* is the per-bar volume column as an array.
     """
-    if len(candles) < (lookback + 2):
+    n = len(volume)
+    if n < (lookback + 2):
         return 1.0
 
-    prior_vols = [c['volume'] for c in candles[-(lookback + 1):-1]]
-    avg_prior = sum(prior_vols) / len(prior_vols) if prior_vols else 0
+    avg_prior = float(volume[n - lookback - 1:n - 1].mean()) if lookback > 0 else 0
     if avg_prior == 0:
         return 1.0
 
-    current_avg = sum(c['volume'] for c in candles[-2:]) / 2
+    current_avg = float(volume[n - 2] + volume[n - 1]) / 2
     return round(current_avg / avg_prior, 3)
 
 
@@ -196,54 +287,54 @@ def compute_stretch_score(gain_pct: float, scanner_min: float) -> float:
 # Pattern Detection
 # ─────────────────────────────────────────────────────────────────────────────
 
-def detect_pattern(df: pd.DataFrame, vah: float = None) -> Tuple[str, float]:
+def detect_pattern(df: BarsLike, vah: float = None) -> Tuple[str, float]:
     """
     Multi-candle reversal pattern detection.
     Returns (pattern_name, volume_z_score).
     pattern_name is one of: VAH_REJECTION, BEARISH_ENGULFING, EVENING_STAR,
     SHOOTING_STAR, ABSORPTION_DOJI, MOMENTUM_BREAKDOWN, VOLUME_TRAP, NORMAL.
     """
-    if df.empty or len(df) < 3:
+    if len(df) < 3:
         return "NORMAL", 0.0
 
-    c1 = df.iloc[-3]  # 2 candles ago
-    c2 = df.iloc[-2]  # prev candle
-    c3 = df.iloc[-1]  # current candle
+    bars = _as_bars(df)
+    o, h, l, c, v = bars.open, bars.high, bars.low, bars.close, bars.volume
+    # -3: 2 candles ago, -2: prev candle, -1: current candle
 
     # Pattern 0: VAH_REJECTION (Look Above & Fail)
     if vah and vah > 0:
-        poked_above = df['high'].iloc[-3:].max() > (vah * 1.0005)
-        closed_back_in = c3['close'] < (vah * 0.9995)
+        poked_above = h[-3:].max() > (vah * 1.0005)
+        closed_back_in = c[-1] < (vah * 0.9995)
         if poked_above and closed_back_in:
             return "VAH_REJECTION", 0.0
 
-    def _stats(row):
-        body = abs(row['close'] - row['open'])
-        direction = 1 if row['close'] > row['open'] else -1
-        upper_wick = row['high'] - max(row['open'], row['close'])
-        total_range = row['high'] - row['low']
+    def _stats(i):
+        body = abs(c[i] - o[i])
+        direction = 1 if c[i] > o[i] else -1
+        upper_wick = h[i] - max(o[i], c[i])
+        total_range = h[i] - l[i]
         if total_range == 0:
             total_range = 0.05
         return body, direction, upper_wick, total_range
 
-    b1, d1, uw1, r1 = _stats(c1)
-    b2, d2, uw2, r2 = _stats(c2)
-    b3, d3, uw3, r3 = _stats(c3)
+    b1, d1, uw1, r1 = _stats(-3)
+    b2, d2, uw2, r2 = _stats(-2)
+    b3, d3, uw3, r3 = _stats(-1)
 
-    # Vol Z-Score
-    recent_vol = df['volume'].iloc[-20:-1]
+    # Vol Z-Score (sample std, as pandas; undefined below 2 bars)
+    recent_vol = v[-20:-1]
     avg_vol = recent_vol.mean()
-    std_vol = recent_vol.std()
-    current_vol = c3['volume']
+    std_vol = recent_vol.std(ddof=1) if len(recent_vol) > 1 else 0.0
+    current_vol = v[-1]
     z_score = (current_vol - avg_vol) / std_vol if std_vol > 0 else 0
 
     # Pattern 1: Bearish Engulfing
-    if d2 == 1 and d3 == -1 and b3 > b2 and c3['close'] < c2['open'] and z_score > 0:
+    if d2 == 1 and d3 == -1 and b3 > b2 and c[-1] < o[-2] and z_score > 0:
         return "BEARISH_ENGULFING", z_score
 
     # Pattern 2: Evening Star
     if d2 == 1 and b2 < (r2 * 0.3) and d3 == -1:
-        if c3['close'] < (c1['open'] + c1['close']) / 2:
+        if c[-1] < (o[-3] + c[-3]) / 2:
             return "EVENING_STAR", z_score
 
     # Pattern 3: Shooting Star
@@ -251,11 +342,11 @@ def detect_pattern(df: pd.DataFrame, vah: float = None) -> Tuple[str, float]:
         return "SHOOTING_STAR", z_score
 
     # Pattern 4: Absorption Doji
-    if z_score > 2.0 and b3 < (c3['close'] * 0.0005):
+    if z_score > 2.0 and b3 < (c[-1] * 0.0005):
         return "ABSORPTION_DOJI", z_score
 
     # Pattern 5: Momentum Breakdown
-    avg_body = df['high'].iloc[-20:-1].sub(df['low'].iloc[-20:-1]).abs().mean()
+    avg_body = np.abs(h[-20:-1] - l[-20:-1]).mean()
     if avg_body == 0:
         avg_body = 0.1
 
@@ -265,16 +356,16 @@ def detect_pattern(df: pd.DataFrame, vah: float = None) -> Tuple[str, float]:
         or (b3 > 1.5 * avg_body and z_score > 1.2)
         or (b3 > 3.0 * avg_body)
     )
-    closes_at_low = (c3['close'] - c3['low']) < (r3 * 0.35)
+    closes_at_low = (c[-1] - l[-1]) < (r3 * 0.35)
 
     if is_big_red and is_high_vol and closes_at_low:
         return "MOMENTUM_BREAKDOWN", z_score
 
     # Pattern 6: Volume Trap
-    prev_vol = c2['volume']
+    prev_vol = v[-2]
     prev_z = (prev_vol - avg_vol) / std_vol if std_vol > 0 else 0
 
-    if d2 == 1 and prev_z > 1.5 and d3 == -1 and c3['close'] < c2['low']:
+    if d2 == 1 and prev_z > 1.5 and d3 == -1 and c[-1] < l[-2]:
         return "VOLUME_TRAP", z_score
 
     return "NORMAL", z_score
@@ -284,16 +375,17 @@ def detect_pattern(df: pd.DataFrame, vah: float = None) -> Tuple[str, float]:
 # Structure Checks
 # ─────────────────────────────────────────────────────────────────────────────
 
-def is_narrowing_highs(df: pd.DataFrame, n: int = 3) -> bool:
+def is_narrowing_highs(df: BarsLike, n: int = 3) -> bool:
     """
     Returns True if the last *n* completed candles each have a lower high.
     Murphy: "staircase down" preceding institutional selling.
     """
     if len(df) < (n + 1):
         return False
-    highs = [df['high'].iloc[-(i + 2)] for i in range(n)]
-    # highs[0] = most recent completed, highs[-1] = oldest
-    return all(highs[i] < highs[i + 1] for i in range(len(highs) - 1))
+    # Completed candles only (drop the live bar), oldest → most recent
+    high = df.high if isinstance(df, EnrichedBars) else df['high'].to_numpy(dtype=np.float64)
+    highs = high[-(n + 1):-1]
+    return bool((np.diff(highs) < 0).all())
 
 
 
@@ -5,6 +5,7 @@ Based on Leung & Li: "Optimal Mean Reversion" and Momentum Physics.
 """
 import logging
 import datetime
+import numpy as np
 import pandas as pd
 import config
 
@@ -43,13 +44,14 @@ class HTFConfluence:
         try:
             response = self.fyers.history(data=data)
             if response.get('s') == 'ok' and response.get('candles'):
-                candles = response['candles']
-                df = pd.DataFrame(candles, columns=['t', 'o', 'h', 'l', 'c', 'v'])
+                # One typed float64 conversion instead of per-cell dtype inference
+                arr = np.asarray(response['candles'], dtype=np.float64)
                 # Phase 91: Guard against malformed responses
-                if 'c' not in df.columns or len(df) < 3:
+                if arr.ndim != 2 or arr.shape[1] != 6 or len(arr) < 3:
                     logger.warning(f"G9: HTF data malformed for {symbol} — skipping")
                     return None
-                df['t'] = pd.to_datetime(df['t'], unit='s')
+                df = pd.DataFrame(arr[:, 1:], columns=['o', 'h', 'l', 'c', 'v'])
+                df.insert(0, 't', pd.to_datetime(arr[:, 0].astype(np.int64), unit='s'))
                 return df
         except Exception as e:
             logger.error(f"HTF data fetch failed for {symbol}: {e}")
@@ -84,9 +86,10 @@ class HTFConfluence:
             if close_col not in df.columns:
                 return True, "G9 SKIP: No close column in DataFrame"
 
-            curr_c = df[close_col].iloc[-1]
-            prev_c = df[close_col].iloc[-2]
-            pprev_c = df[close_col].iloc[-3]
+            closes = df[close_col].to_numpy()
+            curr_c = closes[-1]
+            prev_c = closes[-2]
+            pprev_c = closes[-3]
             
             if prev_c == 0 or pprev_c == 0:
                 return True, "G9 SKIP: Zero price in candle data"
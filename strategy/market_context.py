@@ -9,6 +9,7 @@ from datetime import datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 from symbols import NIFTY_50, validate_symbol
 import config
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,9 @@ class MarketContext:
     
     # Phase 41.3.3: Centralized Symbol Handling
     NIFTY_SYMBOL = NIFTY_50
+
+    # G7 regime verdict is market-wide: evaluate once per TTL, not per symbol.
+    REGIME_CACHE_TTL_SEC = 30.0
     
     def __init__(self, fyers, morning_high=None, morning_low=None):
         self.fyers = fyers
@@ -50,6 +54,7 @@ class MarketContext:
         self.trend_duration_minutes = 0
         self._circuit_touched_today = set() # Phase 51: G3 Blacklist (Session-permanent)
         self._circuit_blacklist_date = datetime.now(IST).date()
+        self._regime_cache = None  # (allowed, reason, expires_at_monotonic)
 
         if self._morning_high:
             logger.info(f"✅ Market Context Initialized with Morning Range: {self._morning_low} - {self._morning_high}")
@@ -252,17 +257,17 @@ class MarketContext:
         if df is None or len(df) < 10: return 0.0
         
         # Get morning session volumes (all candles in df)
-        vols = df['volume']
+        vols = df['volume'].to_numpy(dtype=np.float64)
         if len(vols) < 2: return 0.0
         
         mean_v = vols.mean()
-        std_v = vols.std()
+        std_v = vols.std(ddof=1)
         
         if std_v == 0: return 0.0
         
-        current_v = vols.iloc[-1]
+        current_v = vols[-1]
         z_score = (current_v - mean_v) / std_v
-        return z_score
+        return float(z_score)
 
     def is_safe_trade_window(self) -> tuple[bool, str]:
         """
@@ -282,7 +287,18 @@ class MarketContext:
         if getattr(config, 'ENABLE_MARKET_REGIME_FILTER', True) is False:
             return True, "OK [G7]: Market Regime Filter Disabled"
 
-        # 3. REGIME DETECTION: Nifty Trend
+        # 3. REGIME DETECTION: Nifty Trend (TTL-cached, identical for every symbol)
+        now = _time.monotonic()
+        cached = self._regime_cache
+        if cached is not None and now < cached[2]:
+            return cached[0], cached[1]
+
+        allowed, reason = self._evaluate_regime()
+        self._regime_cache = (allowed, reason, now + self.REGIME_CACHE_TTL_SEC)
+        return allowed, reason
+
+    def _evaluate_regime(self) -> tuple[bool, str]:
+        """Uncached G7 regime check against the NIFTY morning range."""
         candles = self._get_index_data_cached(self.nifty_symbol)
         if not candles:
             # If we're actively rate-limited (backoff > 60s set), allow trades through
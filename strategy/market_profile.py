@@ -20,9 +20,9 @@ class ProfileAnalyzer:
         
         try:
             # 1. Segment price range into 20 horizontal bins
-            df = df.copy()
-            df['bin'] = pd.cut(df['close'], bins=bins)
-            v_profile = df.groupby('bin', observed=True)['volume'].sum()
+            # Group by the binned closes directly; no scratch column on df
+            price_bins = pd.cut(df['close'], bins=bins)
+            v_profile = df['volume'].groupby(price_bins, observed=True).sum()
             
             # 2. Identify Point of Control (POC)
             poc_bin = v_profile.idxmax()
@@ -66,9 +66,12 @@ class ProfileAnalyzer:
         if df is None or df.empty: return None
         
         try:
+            # Column arrays read once; reductions below run on NumPy directly
+            close = df['close'].to_numpy(dtype=np.float64)
+
             # 1. Determine Price Bins
-            min_p = df['low'].min()
-            max_p = df['high'].max()
+            min_p = df['low'].to_numpy(dtype=np.float64).min()
+            max_p = df['high'].to_numpy(dtype=np.float64).max()
             
             if price_step is None:
                 price_range = max_p - min_p
@@ -82,11 +85,13 @@ class ProfileAnalyzer:
             # 2. Build Profile
             if mode == 'VOLUME':
                 # Use np.histogram with weights for Volume Profile
-                counts, bin_edges = np.histogram(df['close'], bins=bins, weights=df['volume'])
+                counts, bin_edges = np.histogram(
+                    close, bins=bins, weights=df['volume'].to_numpy(dtype=np.float64)
+                )
                 label_prefix = "v" # vPOC, vVAH
             else:
                 # Standard TPO (Frequency)
-                counts, bin_edges = np.histogram(df['close'], bins=bins)
+                counts, bin_edges = np.histogram(close, bins=bins)
                 label_prefix = "" # POC, VAH
 
             # 3. Calculate Value Area (70%)
@@ -153,10 +158,11 @@ class ProfileAnalyzer:
             logger.error(f"TPO Calc Error: {e}")
             return None
 
-    def check_profile_rejection(self, df, ltp):
+    def check_profile_rejection(self, df, ltp, profile=None):
         """
         Signal: "Look Above and Fail"
         Price breaks VAH but closes back inside.
+        *profile* is this df's VOLUME profile when the caller already has it.
         """
         # We need Context (Profile of the DAY so far)
         # Assuming df contains today's data.
@@ -164,7 +170,8 @@ class ProfileAnalyzer:
         # Calculate Profile excluding the last few candles (Developing Struct)?
         # No, usually we trade against the Developing Structure of the day.
         
-        profile = self.calculate_market_profile(df, mode='VOLUME')
+        if profile is None:
+            profile = self.calculate_market_profile(df, mode='VOLUME')
         if not profile: return False, "Profile Error"
         
         vah = profile['vvah']
@@ -177,14 +184,12 @@ class ProfileAnalyzer:
         # Setup: One of the recent candles High > VAH
         # Trigger: Current Candle Close < VAH
         
-        recent = df.iloc[-3:]
-        
         # Did we probe above VAH?
-        poked_above = recent['high'].max() > vah
+        poked_above = df['high'].to_numpy()[-3:].max() > vah
         
         # Are we currently below VAH (and notably below, not just noise)?
         # Buffer: 0.05% below VAH
-        curr_close = df.iloc[-1]['close']
+        curr_close = df['close'].to_numpy()[-1]
         buffer = vah * 0.9995
         
         closed_back_in = curr_close < buffer
@@ -2,10 +2,10 @@
 # telegram_bot.py
 # Phase 42.3.1 — Complete Telegram UI
 import asyncio
+import concurrent.futures
 import json
 import logging
 import random
-import threading
 import time
 import traceback
 import uuid
@@ -63,7 +63,9 @@ class ShortCircuitBot:
         self.bot_token = config_settings.get('TELEGRAM_BOT_TOKEN')
         self.chat_id = str(config_settings.get('TELEGRAM_CHAT_ID'))
         self.app: Optional[Application] = None
-        self._ready_event = threading.Event()
+        # Resolved with the bot's loop once PTB is up, or with start()'s
+        # exception, so waiters can tell "still starting" from "failed".
+        self._ready: concurrent.futures.Future = concurrent.futures.Future()
         self._shutdown_event: Optional[asyncio.Event] = None
         self._alert_queue = asyncio.Queue()
         self._throttler_task: Optional[asyncio.Task] = None
@@ -316,10 +318,12 @@ class ShortCircuitBot:
         if not self.capital_manager:
             return "Capital: N/A\n"
         try:
-            real_margin = self.capital_manager._real_margin
+            real_margin = self.capital_manager.real_margin
             bp = self.capital_manager.buying_power
-            slot_status = self.capital_manager.get_slot_status()
-            slot_str = "🟢 FREE" if slot_status['slot_free'] else f"🔴 {slot_status['active_symbol']}"
+            slot_str = (
+                "🟢 FREE" if self.capital_manager.is_slot_free
+                else f"🔴 {self.capital_manager.active_symbol}"
+            )
             
             margin_str = f"₹{real_margin:.0f}" if real_margin > 0 else "N/A"
             bp_str = f"₹{bp:.0f}" if bp > 0 else "N/A"
@@ -537,10 +541,14 @@ class ShortCircuitBot:
                             'unrealised_pnl': pos.get('unrealised_pnl', 0.0),
                             'qty': pos.get('qty', 0)
                         })
-                realised_pnl = sum(t.get('realised_pnl', 0.0) for t in trades)
-                unrealised = sum(t.get('unrealised_pnl', 0.0) for t in trades)
-                # Count only non-zero quantities as open
-                open_positions = len([t for t in trades if t.get('qty', 0) != 0])
+                # One pass over the trade list for all three totals
+                realised_pnl = 0.0
+                for t in trades:
+                    realised_pnl += t.get('realised_pnl', 0.0)
+                    unrealised += t.get('unrealised_pnl', 0.0)
+                    # Count only non-zero quantities as open
+                    if t.get('qty', 0) != 0:
+                        open_positions += 1
                 today_pnl = realised_pnl
                 
             except Exception as e:
@@ -950,15 +958,22 @@ class ShortCircuitBot:
     # BOT LIFECYCLE
     # ════════════════════════════════════════════════════════════
     async def start(self):
-        self.app = Application.builder().token(self.bot_token).build()
-        self._register_handlers()
-        # Phase 44.4: Register global error handler (fixes PTB 'No error handlers' warning)
-        self.app.add_error_handler(self._error_handler)
-        await self.app.initialize()
-        await self.app.start()
+        if self._ready.done():
+            # Supervisor restart: waiters from now on see this attempt
+            self._ready = concurrent.futures.Future()
+        try:
+            self.app = Application.builder().token(self.bot_token).build()
+            self._register_handlers()
+            # Phase 44.4: Register global error handler (fixes PTB 'No error handlers' warning)
+            self.app.add_error_handler(self._error_handler)
+            await self.app.initialize()
+            await self.app.start()
+        except BaseException as e:
+            self._ready.set_exception(e)
+            raise
         # Capture the running loop for thread-safe calls
         self._loop = asyncio.get_running_loop()
-        self._ready_event.set()
+        self._ready.set_result(self._loop)
         await self._start_cleanup_task()
         await self.app.updater.start_polling(drop_pending_updates=True)
         
@@ -980,6 +995,26 @@ class ShortCircuitBot:
         # Phase 81: Alert Throttler
         self._throttler_task = asyncio.create_task(self._alert_throttler_loop())
         logger.info("Telegram Bot started & Throttler active")
+    async def wait_ready(self, timeout: float = 30.0) -> bool:
+        """
+        Wait until start() has brought PTB up. Returns False (and logs why)
+        if start() failed or did not finish within *timeout* seconds.
+        Only cancellation of the caller propagates; start()'s own errors,
+        including a cancelled start, are reported through the return value.
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self._ready)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"[TELEGRAM] Bot not ready after {timeout:.0f}s — still starting.")
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            logger.error("[TELEGRAM] Bot start was cancelled.")
+        except BaseException as e:
+            logger.error(f"[TELEGRAM] Bot failed to start: {e!r}")
+        return False
+
     async def run(self, shutdown_event: asyncio.Event):
         """
         Structured runtime entrypoint.